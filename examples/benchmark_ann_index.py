@@ -0,0 +1,63 @@
+"""
+Recall-vs-latency benchmark of IVFIndex against exact brute-force retrieval.
+
+    python examples/benchmark_ann_index.py --items 200000 --factors 64
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from recommender_universal.models.retrieval import IVFIndex
+from recommender_universal.utils.topk import top_k_indices
+
+
+def recall(approx: np.ndarray, exact: np.ndarray) -> float:
+    hits = sum(len(set(a) & set(e)) for a, e in zip(approx.tolist(), exact.tolist()))
+    return hits / exact.size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--factors", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--n-lists", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Clustered item vectors, as trained factors tend to be
+    rng = np.random.default_rng(args.seed)
+    centers = rng.normal(size=(256, args.factors))
+    items = centers[rng.integers(0, len(centers), args.items)]
+    items = (items + 0.5 * rng.normal(size=items.shape)).astype(np.float32)
+    queries = rng.normal(size=(args.queries, args.factors)).astype(np.float32)
+
+    start = time.perf_counter()
+    exact = np.vstack([top_k_indices(q[None, :] @ items.T, args.k) for q in queries])
+    exact_ms = (time.perf_counter() - start) * 1000 / args.queries
+    print(f"exact       recall=1.000  {exact_ms:8.3f} ms/query")
+
+    start = time.perf_counter()
+    index = IVFIndex(n_lists=args.n_lists, seed=args.seed).build(items)
+    build_s = time.perf_counter() - start
+    n_lists = len(index.centroids)
+    print(f"built IVF index with {n_lists} lists in {build_s:.2f}s")
+
+    nprobe = 1
+    while nprobe <= n_lists:
+        index.nprobe = nprobe
+        start = time.perf_counter()
+        approx = np.vstack([index.search(q[None, :], args.k) for q in queries])
+        ms = (time.perf_counter() - start) * 1000 / args.queries
+        print(
+            f"nprobe={nprobe:<4} recall={recall(approx, exact):.3f}  "
+            f"{ms:8.3f} ms/query  ({exact_ms / ms:5.1f}x)"
+        )
+        nprobe *= 2
+
+
+if __name__ == "__main__":
+    main()
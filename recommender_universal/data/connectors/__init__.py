@@ -1,13 +1,20 @@
 from .base import BaseConnector
-from typing import Any, Type
+from .cache import DiskCache
+from pathlib import Path
+from typing import Any, Type, Union
 import pandas as pd
 
 
-def load_data(uri: str, **kwargs: Any) -> pd.DataFrame:
+def load_data(
+    uri: str, disk_cache: Union[None, str, Path, DiskCache] = None, **kwargs: Any
+) -> pd.DataFrame:
     """
     Convenience function: picks the right connector,
     loads the data, and returns a DataFrame.
+
+    :param disk_cache: Directory or `DiskCache` to reuse results across
+                       calls and runs (see `BaseConnector`).
     """
     conn_cls: Type[BaseConnector] = BaseConnector.get_connector_for(uri)
-    connector = conn_cls()
+    connector = conn_cls(disk_cache=disk_cache)
     return connector.load(uri, **kwargs)
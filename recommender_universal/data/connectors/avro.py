@@ -1,7 +1,7 @@
-from fastavro import reader
+from fastavro import block_reader, reader
 import pandas as pd
 from .base import BaseConnector
-from typing import Any
+from typing import Any, Iterator, List
 
 
 class AvroConnector(BaseConnector):
@@ -13,5 +13,22 @@ class AvroConnector(BaseConnector):
         self._df = df
         return df
 
+    def _iter_chunks(
+        self, uri: str, chunksize: int, **kwargs: Any
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Decode the file one Avro block at a time, emitting a DataFrame
+        whenever `chunksize` records have accumulated.
+        """
+        records: List[Any] = []
+        with open(uri, "rb") as fo:
+            for block in block_reader(fo, **kwargs):
+                records.extend(block)
+                while len(records) >= chunksize:
+                    yield pd.DataFrame.from_records(records[:chunksize])
+                    records = records[chunksize:]
+        if records:
+            yield pd.DataFrame.from_records(records)
+
 
 BaseConnector.register_connector(".avro", AvroConnector)
@@ -1,24 +1,119 @@
 from abc import ABC, abstractmethod
+import os
 import pandas as pd
-from typing import Dict, Type, Any
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
+from .cache import DiskCache, MemoryCache, make_key
 
 # Registry of key → connector class
 # Keys might be file extensions ('.csv') or schemes ('sqlite://')
 _CONNECTOR_REGISTRY: Dict[str, Type["BaseConnector"]] = {}
 
+# Row filter in pyarrow's format: (column, op, value), e.g. ("rating", ">=", 3).
+# A list of filters is their conjunction.
+Filter = Tuple[str, str, Any]
+FILTER_OPS = ("=", "==", "!=", "<", "<=", ">", ">=", "in", "not in")
+
+# `load` / `iter_chunks` arguments that every connector understands
+PUSHDOWN_ARGS = ("columns", "dtypes", "filters")
+
+
+def validate_filters(filters: Sequence[Filter]) -> List[Filter]:
+    checked: List[Filter] = []
+    for f in filters:
+        if len(f) != 3 or f[1] not in FILTER_OPS:
+            raise ValueError(
+                f"Invalid filter {f!r}; expected (column, op, value) with op in "
+                f"{FILTER_OPS}"
+            )
+        checked.append((f[0], f[1], f[2]))
+    return checked
+
+
+def filter_mask(df: pd.DataFrame, filters: Sequence[Filter]) -> pd.Series:
+    """Boolean mask of the rows of `df` that satisfy every filter."""
+    mask = pd.Series(True, index=df.index)
+    for col, op, value in validate_filters(filters):
+        values = df[col]
+        if op in ("=", "=="):
+            mask &= values == value
+        elif op == "!=":
+            mask &= values != value
+        elif op == "<":
+            mask &= values < value
+        elif op == "<=":
+            mask &= values <= value
+        elif op == ">":
+            mask &= values > value
+        elif op == ">=":
+            mask &= values >= value
+        elif op == "in":
+            mask &= values.isin(value)
+        else:
+            mask &= ~values.isin(value)
+    return mask
+
+
+def apply_pushdown(
+    df: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    dtypes: Optional[Dict[str, Any]] = None,
+    filters: Optional[Sequence[Filter]] = None,
+) -> pd.DataFrame:
+    """
+    Filter rows, project columns and cast dtypes of an already loaded
+    frame: what connectors that cannot push these down to the source do
+    after reading.
+    """
+    if filters:
+        df = df[filter_mask(df, filters)]
+    if columns is not None:
+        df = df[list(columns)]
+    if dtypes:
+        df = df.astype({col: t for col, t in dtypes.items() if col in df.columns})
+    return df
+
 
 class BaseConnector(ABC):
     """
     Abstract base class for all data connectors.
     Subclasses implement `_read(uri, **kwargs)` to actually load data.
+
+    `load` and `iter_chunks` also accept `columns`, `dtypes` and `filters`
+    (see `apply_pushdown`). Connectors that set `supports_pushdown` receive
+    them in `_read` / `_iter_chunks` and apply them at the source; for the
+    others they are applied to each frame after it is read.
     """
 
-    def __init__(self, cache: bool = True):
+    supports_pushdown: bool = False
+
+    # Default in-memory cache budget per connector
+    DEFAULT_CACHE_BYTES = 1 << 30
+
+    def __init__(
+        self,
+        cache: bool = True,
+        disk_cache: Union[None, str, Path, DiskCache] = None,
+        cache_max_bytes: Optional[int] = DEFAULT_CACHE_BYTES,
+    ):
         """
-        :param cache: If True, subsequent loads return a cached DataFrame.
+        :param cache: If True, repeated loads of the same `uri` with the same
+                      arguments return the cached DataFrame.
+        :param disk_cache: A `DiskCache`, or a directory for one, that
+                           persists loaded frames across instances and runs.
+                           Frames loaded from it share its memory-mapped
+                           numeric columns read-only (see `DiskCache.get`);
+                           copy them before modifying in place.
+        :param cache_max_bytes: Budget of the in-memory cache, as measured by
+                                `memory_usage(deep=True)`; least recently used
+                                frames are dropped beyond it (None: unbounded).
         """
         self._cache = cache
-        self._cached_df: pd.DataFrame | None = None
+        self.memory_cache = MemoryCache(cache_max_bytes)
+        self._last_schema: Optional[Dict[str, str]] = None
+        if disk_cache is not None and not isinstance(disk_cache, DiskCache):
+            disk_cache = DiskCache(disk_cache)
+        self.disk_cache: Optional[DiskCache] = disk_cache
 
     @abstractmethod
     def _read(self, uri: str, **kwargs: Any) -> pd.DataFrame:
@@ -31,29 +126,130 @@ class BaseConnector(ABC):
         """
         Load data from `uri`. Honors cache unless `refresh=True`.
 
+        The in-memory cache is keyed by `uri` and `kwargs`, so different
+        tables, queries or projections are cached separately. It does not
+        notice changes to the source; pass `refresh=True` to re-read.
+
         :param uri: Data source identifier (file path, URL, DB URI).
-        :param refresh: If True, ignore cache and re-run `_read`.
-        :param kwargs: Passed through to `_read` (e.g. table_name, engine args).
+        :param refresh: If True, ignore both caches and re-run `_read`
+                        (the disk cache entry is rewritten).
+        :param kwargs: Passed through to `_read` (e.g. table_name, engine args),
+                       including `columns`, `dtypes` and `filters`.
         :return: Loaded DataFrame.
         """
-        if self._cache and self._cached_df is not None and not refresh:
-            return self._cached_df
+        memory_key = make_key(uri, kwargs) if self._cache else None
+        df = None
+        if memory_key is not None and not refresh:
+            df = self.memory_cache.get(memory_key)
 
-        df = self._read(uri, **kwargs)
-        if self._cache:
-            self._cached_df = df
+        if df is None:
+            key = self._disk_key(uri, kwargs)
+            if key is not None and not refresh:
+                assert self.disk_cache is not None
+                df = self.disk_cache.get(key)
+            if df is None:
+                df = self._read_pushdown(uri, kwargs)
+                if key is not None:
+                    assert self.disk_cache is not None
+                    self.disk_cache.put(key, df)
+            if memory_key is not None:
+                self.memory_cache.put(memory_key, df)
+
+        self._last_schema = {col: str(dtype) for col, dtype in df.dtypes.items()}
         return df
 
+    def cache_info(self) -> Dict[str, int]:
+        """
+        In-memory cache counters: hits, misses, evictions, entries and
+        bytes (`refresh` loads count as neither hit nor miss).
+        """
+        return self.memory_cache.stats
+
+    def clear_cache(self) -> None:
+        """Drop all in-memory cached frames (counters are kept)."""
+        self.memory_cache.clear()
+
+    def _read_pushdown(self, uri: str, kwargs: Dict[str, Any]) -> pd.DataFrame:
+        if self.supports_pushdown:
+            return self._read(uri, **kwargs)
+        pushdown, kwargs = self._split_pushdown(kwargs)
+        return apply_pushdown(self._read(uri, **kwargs), **pushdown)
+
+    def fingerprint(self, uri: str) -> Optional[Tuple[int, int]]:
+        """
+        Cheap identity of the source's current contents, used in disk
+        cache keys: (mtime in ns, size) for local files, None for sources
+        whose changes cannot be detected (entries then live until their
+        TTL or a `refresh`).
+        """
+        try:
+            stat = os.stat(uri)
+        except (OSError, ValueError):
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _disk_key(self, uri: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        if self.disk_cache is None:
+            return None
+        cls = type(self)
+        return make_key(
+            f"{cls.__module__}:{cls.__qualname__}",
+            uri,
+            kwargs,
+            self.fingerprint(uri),
+        )
+
+    @staticmethod
+    def _split_pushdown(
+        kwargs: Dict[str, Any],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        pushdown = {k: v for k, v in kwargs.items() if k in PUSHDOWN_ARGS}
+        rest = {k: v for k, v in kwargs.items() if k not in PUSHDOWN_ARGS}
+        return pushdown, rest
+
+    def iter_chunks(
+        self, uri: str, chunksize: int = 100_000, **kwargs: Any
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream data from `uri` as DataFrames of at most `chunksize` rows,
+        for sources that do not fit in memory. Chunks bypass the cache.
+
+        :param uri: Data source identifier (file path, URL, DB URI).
+        :param chunksize: Maximum rows per chunk.
+        :param kwargs: Passed through to the reader, as for `load`.
+        :return: Iterator over DataFrame chunks, in source order.
+        """
+        if chunksize < 1:
+            raise ValueError("chunksize must be a positive integer")
+        if self.supports_pushdown:
+            return self._iter_chunks(uri, chunksize, **kwargs)
+        pushdown, kwargs = self._split_pushdown(kwargs)
+        return (
+            apply_pushdown(chunk, **pushdown)
+            for chunk in self._iter_chunks(uri, chunksize, **kwargs)
+        )
+
+    def _iter_chunks(
+        self, uri: str, chunksize: int, **kwargs: Any
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Subclasses override this to read incrementally. The default reads
+        everything with `_read` and slices it, so it saves no memory.
+        """
+        df = self._read(uri, **kwargs)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start : start + chunksize]
+
     @property
     def schema(self) -> Dict[str, str]:
         """
-        After loading, inspect column types.
+        After loading, inspect column types of the most recent load.
 
         :return: Mapping column_name → dtype (as string).
         """
-        if self._cached_df is None:
+        if self._last_schema is None:
             raise RuntimeError("No data loaded yet; call `.load()` first.")
-        return {col: str(dtype) for col, dtype in self._cached_df.dtypes.items()}
+        return dict(self._last_schema)
 
     @classmethod
     def register_connector(cls, key: str, connector_cls: Type["BaseConnector"]) -> None:
@@ -0,0 +1,237 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from recommender_universal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Schema metadata key holding the entry's creation time (for the TTL)
+_CREATED_KEY = b"recommender_universal.cached_at"
+_SUFFIX = ".feather"
+# Prefix of the schema metadata keys holding `put(metadata=...)`
+_USER_PREFIX = "recommender_universal.meta."
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Stable hash of JSON-like `parts` (dict order and list vs tuple do not
+    matter); other values hash by `repr`.
+    """
+    blob = json.dumps(parts, sort_keys=True, default=repr)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class MemoryCache:
+    """
+    In-process LRU of DataFrames with a byte budget, measured with
+    `DataFrame.memory_usage(deep=True)`. Frames larger than the budget are
+    not cached. Counts hits, misses and evictions to help size the budget.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None) -> None:
+        """
+        :param max_bytes: Budget for all cached frames (default: unbounded).
+        """
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[pd.DataFrame, int]]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        self.discard(key)
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        self._entries[key] = (df, nbytes)
+        self.nbytes += nbytes
+        while self.max_bytes is not None and self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+            self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+        }
+
+
+class DiskCache:
+    """
+    Persistent cache of loaded DataFrames, stored as uncompressed Arrow
+    IPC (Feather) files so that hits are memory-mapped reads.
+
+    Entries are keyed by a hash of everything that determines the result
+    (see `make_key`), so a changed source fingerprint simply produces a
+    different key, and the stale entry ages out. The directory is capped
+    at `max_bytes` by evicting the least recently used entries; reads
+    refresh an entry's modification time, which serves as its LRU stamp.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        :param directory: Where entries are stored (created if missing).
+        :param max_bytes: Size cap of all entries together (default: none).
+        :param ttl: Seconds after which an entry expires (default: never).
+                    Useful for sources without a fingerprint, such as SQL.
+        """
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def _open(self, key: str) -> Optional[pa.Table]:
+        """The memory-mapped entry for `key`, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            table = feather.read_table(path, memory_map=True)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        created = float((table.schema.metadata or {}).get(_CREATED_KEY, b"0"))
+        if self.ttl is not None and time.time() - created > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+        return table
+
+    def get(self, key: str, writable: bool = False) -> Optional[pd.DataFrame]:
+        """
+        The cached frame for `key`, or None on a miss or expired entry.
+
+        Without `writable`, numeric and boolean columns without nulls are
+        read-only views of the memory-mapped file, so a hit costs no copy
+        and no heap memory for them. A copy is unavoidable for columns
+        that need converting, e.g. strings (to Python objects), integer or
+        boolean columns with nulls (to floats / objects) and dictionary
+        columns (to categoricals).
+
+        :param writable: Copy every column, so the frame can be modified in
+                         place.
+        """
+        table = self._open(key)
+        if table is None:
+            return None
+        if writable:
+            return table.to_pandas()
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def get_metadata(self, key: str) -> Optional[Dict[str, bytes]]:
+        """
+        The `metadata` stored with `key` by `put` (empty if none), or None
+        on a miss. Cheap: the frame itself is not read.
+        """
+        table = self._open(key)
+        if table is None:
+            return None
+        prefix = _USER_PREFIX.encode()
+        return {
+            k[len(prefix) :].decode(): v
+            for k, v in (table.schema.metadata or {}).items()
+            if k.startswith(prefix)
+        }
+
+    def put(
+        self, key: str, df: pd.DataFrame, metadata: Optional[Dict[str, bytes]] = None
+    ) -> bool:
+        """
+        Store `df` under `key`, then evict down to `max_bytes`.
+
+        :param metadata: Extra values kept with the entry (see `get_metadata`).
+
+        :return: False if the frame cannot be represented in Arrow (e.g.
+                 mixed-type object columns) and was not cached.
+        """
+        try:
+            table = pa.Table.from_pandas(df)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError) as exc:
+            logger.warning("Not caching frame for key %s: %s", key, exc)
+            return False
+        schema_metadata = dict(table.schema.metadata or {})
+        for name, value in (metadata or {}).items():
+            schema_metadata[f"{_USER_PREFIX}{name}".encode()] = value
+        schema_metadata[_CREATED_KEY] = repr(time.time()).encode()
+        table = table.replace_schema_metadata(schema_metadata)
+
+        # Write then rename, so readers never see a partial file
+        tmp = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            feather.write_feather(table, tmp, compression="uncompressed")
+            os.replace(tmp, self._path(key))
+        finally:
+            tmp.unlink(missing_ok=True)
+        self._evict()
+        return True
+
+    def _files(self) -> List[Path]:
+        return sorted(self.directory.glob(f"*{_SUFFIX}"))
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self._files())
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under `max_bytes`."""
+        if self.max_bytes is None:
+            return
+        files = [(p.stat(), p) for p in self._files()]
+        total = sum(stat.st_size for stat, _ in files)
+        for stat, path in sorted(files, key=lambda entry: entry[0].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+    def clear(self) -> None:
+        for path in self._files():
+            path.unlink(missing_ok=True)
@@ -1,6 +1,6 @@
 import pandas as pd
-from .base import BaseConnector
-from typing import Any
+from .base import BaseConnector, Filter, apply_pushdown
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
 
 
 class CSVConnector(BaseConnector):
@@ -9,15 +9,117 @@ class CSVConnector(BaseConnector):
     '.csv' extensions and the 'csv://' URI scheme.
     """
 
-    def _read(self, uri: str, **kwargs: Any) -> pd.DataFrame:
+    supports_pushdown = True
+
+    def _read(
+        self,
+        uri: str,
+        columns: Optional[Sequence[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
         """
         Load DataFrame from the given URI (local path or URL).
         `kwargs` are passed straight through to pandas.read_csv.
+
+        With `columns` or `dtypes`, only those columns are parsed, directly
+        into the given dtypes, by the multithreaded pyarrow engine (unless
+        `engine` is passed). CSV has no row index, so `filters` are applied
+        after parsing; filtered columns are cast to "category" only after
+        filtering, as range comparisons fail on unordered categoricals.
         """
+        read_dtypes, late_dtypes = self._split_dtypes(dtypes, filters)
+        kwargs = self._parse_args(columns, read_dtypes, filters, kwargs)
+        if columns is not None or dtypes:
+            kwargs.setdefault("engine", "pyarrow")
         df = pd.read_csv(uri, **kwargs)
+        df = apply_pushdown(
+            self._numeric_categories(df, read_dtypes),
+            columns,
+            late_dtypes,
+            filters=filters,
+        )
         self._df = df  # for schema introspection
         return df
 
+    def _iter_chunks(
+        self,
+        uri: str,
+        chunksize: int,
+        columns: Optional[Sequence[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        **kwargs: Any,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Each chunk gets "category" columns with only its own categories,
+        so concatenated chunks fall back to object columns; DataPipeline
+        therefore does not cast IDs to "category" when streaming.
+        """
+        read_dtypes, late_dtypes = self._split_dtypes(dtypes, filters)
+        kwargs = self._parse_args(columns, read_dtypes, filters, kwargs)
+        with pd.read_csv(uri, chunksize=chunksize, **kwargs) as reader:
+            for chunk in reader:
+                chunk = self._numeric_categories(chunk, read_dtypes)
+                yield apply_pushdown(chunk, columns, late_dtypes, filters=filters)
+
+    @staticmethod
+    def _split_dtypes(
+        dtypes: Optional[Dict[str, Any]], filters: Optional[Sequence[Filter]]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Dtypes to parse into, and the "category" dtypes of filtered
+        columns, which are cast after filtering instead.
+        """
+        if not dtypes or not filters:
+            return dtypes, None
+        filtered = {f[0] for f in filters}
+        late = {c: t for c, t in dtypes.items() if c in filtered and t == "category"}
+        read = {c: t for c, t in dtypes.items() if c not in late}
+        return read, late
+
+    @staticmethod
+    def _numeric_categories(
+        df: pd.DataFrame, dtypes: Optional[Dict[str, Any]]
+    ) -> pd.DataFrame:
+        """
+        CSV readers parse categories as strings; turn numeric ones back
+        into numbers, so e.g. integer IDs keep the type they would have
+        without a dtype hint.
+        """
+        for col, dtype in (dtypes or {}).items():
+            if dtype != "category" or col not in df.columns:
+                continue
+            categories = df[col].cat.categories
+            try:
+                numeric = pd.to_numeric(categories)
+            except (ValueError, TypeError):
+                continue
+            if numeric.is_unique:
+                df[col] = df[col].cat.rename_categories(numeric)
+        return df
+
+    @staticmethod
+    def _parse_args(
+        columns: Optional[Sequence[str]],
+        dtypes: Optional[Dict[str, Any]],
+        filters: Optional[Sequence[Filter]],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """read_csv arguments: `usecols` covers the filtered columns too."""
+        kwargs = dict(kwargs)
+        if columns is not None:
+            usecols = list(columns)
+            usecols += [f[0] for f in filters or () if f[0] not in usecols]
+            kwargs["usecols"] = usecols
+        if dtypes:
+            wanted = kwargs.get("usecols")
+            kwargs["dtype"] = {
+                col: t for col, t in dtypes.items() if wanted is None or col in wanted
+            }
+        return kwargs
+
 
 # Registering this connector under both file-extension and URI-scheme keys:
 BaseConnector.register_connector(".csv", CSVConnector)
@@ -1,6 +1,6 @@
 import pandas as pd
 from .base import BaseConnector
-from typing import Optional, Any
+from typing import Any, Iterator, Optional
 
 
 class JSONConnector(BaseConnector):
@@ -11,6 +11,19 @@ class JSONConnector(BaseConnector):
         self._df = df
         return df
 
+    def _iter_chunks(
+        self, uri: str, chunksize: int, orient: Optional[str] = None, **kwargs: Any
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Only JSON lines (`lines=True`) can be read incrementally; other
+        layouts are parsed whole and then sliced.
+        """
+        if not kwargs.get("lines"):
+            yield from super()._iter_chunks(uri, chunksize, orient=orient, **kwargs)
+            return
+        with pd.read_json(uri, orient=orient, chunksize=chunksize, **kwargs) as reader:
+            yield from reader
+
 
 BaseConnector.register_connector(".json", JSONConnector)
 BaseConnector.register_connector("http://", JSONConnector)
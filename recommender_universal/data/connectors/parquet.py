@@ -1,13 +1,67 @@
 import pandas as pd
-from .base import BaseConnector
-from typing import Any
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from .base import BaseConnector, Filter, apply_pushdown, validate_filters
+from typing import Any, Dict, Iterator, Optional, Sequence
 
 
 class ParquetConnector(BaseConnector):
-    def _read(self, uri: str, **kwargs: Any) -> pd.DataFrame:
-        df = pd.read_parquet(uri, **kwargs)
+    """
+    `columns` and `filters` are pushed down to pyarrow, which reads only
+    the selected column chunks and skips row groups whose statistics rule
+    the filters out.
+    """
+
+    supports_pushdown = True
+
+    def _read(
+        self,
+        uri: str,
+        columns: Optional[Sequence[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        df = pd.read_parquet(
+            uri,
+            columns=None if columns is None else list(columns),
+            filters=validate_filters(filters) if filters else None,
+            **kwargs,
+        )
+        df = apply_pushdown(df, dtypes=dtypes)
         self._df = df
         return df
 
+    def _iter_chunks(
+        self,
+        uri: str,
+        chunksize: int,
+        columns: Optional[Sequence[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        **kwargs: Any,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read record batches with `ParquetFile.iter_batches`, so only one
+        batch is decoded at a time. `kwargs` go to `pq.ParquetFile`. With
+        `filters`, batches come from a pyarrow dataset scan instead, which
+        prunes row groups; empty batches are skipped.
+        """
+        columns = None if columns is None else list(columns)
+        if filters:
+            expression = pq.filters_to_expression(validate_filters(filters))
+            batches = ds.dataset(uri, format="parquet").to_batches(
+                columns=columns, filter=expression, batch_size=chunksize
+            )
+            for batch in batches:
+                if batch.num_rows:
+                    yield apply_pushdown(batch.to_pandas(), dtypes=dtypes)
+            return
+        with pq.ParquetFile(uri, **kwargs) as parquet_file:
+            for batch in parquet_file.iter_batches(
+                batch_size=chunksize, columns=columns
+            ):
+                yield apply_pushdown(batch.to_pandas(), dtypes=dtypes)
+
 
 BaseConnector.register_connector(".parquet", ParquetConnector)
@@ -1,17 +1,9 @@
-import pandas as pd
-from sqlalchemy import create_engine
 from .base import BaseConnector
-from typing import Any, Optional
+from .sql import SQLConnector
 
 
-class PostgresConnector(BaseConnector):
-    def _read(
-        self, uri: str, query: Optional[str] = None, **kwargs: Any
-    ) -> pd.DataFrame:
-        engine = create_engine(uri)
-        df = pd.read_sql(query, engine, **kwargs)
-        self._df = df
-        return df
+class PostgresConnector(SQLConnector):
+    pass
 
 
 BaseConnector.register_connector("postgresql://", PostgresConnector)
@@ -0,0 +1,219 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from sqlalchemy import Engine, Select, column, create_engine, literal_column, select
+from sqlalchemy import make_url, table, text
+from .base import BaseConnector, Filter, validate_filters
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+# Engines shared by all SQL connectors in the process, keyed by URI and pool
+# settings, so repeated reads reuse pooled connections instead of opening a
+# new pool (and leaking it) per read.
+_ENGINES: Dict[Tuple[str, int, int, bool], Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(
+    uri: str,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_pre_ping: bool = True,
+) -> Engine:
+    """
+    The shared engine for `uri`, created on first use.
+
+    :param pool_size: Connections kept open in the pool.
+    :param max_overflow: Extra connections allowed beyond `pool_size` under
+                         load; they are closed when returned.
+    :param pool_pre_ping: Test connections on checkout and transparently
+                          replace ones the server has dropped.
+    """
+    key = (uri, pool_size, max_overflow, pool_pre_ping)
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            url = make_url(uri)
+            if url.get_backend_name() == "sqlite" and url.database in (
+                None,
+                "",
+                ":memory:",
+            ):
+                # In-memory SQLite uses a per-thread pool without size limits
+                engine = create_engine(uri, pool_pre_ping=pool_pre_ping)
+            else:
+                engine = create_engine(
+                    uri,
+                    pool_size=pool_size,
+                    max_overflow=max_overflow,
+                    pool_pre_ping=pool_pre_ping,
+                )
+            _ENGINES[key] = engine
+        return engine
+
+
+def dispose_engines() -> None:
+    """Close the pooled connections of all shared engines and forget them."""
+    with _ENGINES_LOCK:
+        engines = list(_ENGINES.values())
+        _ENGINES.clear()
+    for engine in engines:
+        engine.dispose()
+
+
+def build_select(
+    table_name: Optional[str] = None,
+    query: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Sequence[Filter]] = None,
+) -> Select:
+    """
+    SELECT only `columns` from a table, or from `query` as a subquery,
+    with `filters` as a WHERE clause. Identifiers are quoted and values
+    bound as parameters.
+    """
+    if query:
+        source: Any = text(query).columns().subquery("q")
+    elif table_name:
+        source = table(table_name)
+    else:
+        raise ValueError("Pass either table_name or query")
+    targets: List[Any] = (
+        [column(c) for c in columns] if columns else [literal_column("*")]
+    )
+    statement = select(*targets).select_from(source)
+    for col, op, value in validate_filters(filters or ()):
+        c: Any = column(col)
+        if op in ("=", "=="):
+            statement = statement.where(c == value)
+        elif op == "!=":
+            statement = statement.where(c != value)
+        elif op == "<":
+            statement = statement.where(c < value)
+        elif op == "<=":
+            statement = statement.where(c <= value)
+        elif op == ">":
+            statement = statement.where(c > value)
+        elif op == ">=":
+            statement = statement.where(c >= value)
+        elif op == "in":
+            statement = statement.where(c.in_(list(value)))
+        else:
+            statement = statement.where(c.not_in(list(value)))
+    return statement
+
+
+class SQLConnector(BaseConnector):
+    """
+    Shared implementation of the SQLAlchemy-backed connectors: reads a
+    whole table (`table_name`) or the result of `query`. With `columns`
+    or `filters`, a projected SELECT ... WHERE is generated so the
+    database does the work (see `build_select`).
+
+    Connections come from a process-wide engine per URI (see `get_engine`).
+    """
+
+    supports_pushdown = True
+
+    def __init__(
+        self,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_pre_ping: bool = True,
+        **kwargs: Any,
+    ):
+        """
+        :param pool_size: Connections kept open per URI (see `get_engine`).
+        :param max_overflow: Extra connections allowed under load.
+        :param pool_pre_ping: Check connections before use.
+        :param kwargs: Passed to `BaseConnector` (cache settings).
+        """
+        super().__init__(**kwargs)
+        if pool_size < 1:
+            raise ValueError("pool_size must be a positive integer")
+        if max_overflow < 0:
+            raise ValueError("max_overflow must be non-negative")
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_pre_ping = pool_pre_ping
+
+    def engine(self, uri: str) -> Engine:
+        return get_engine(uri, self.pool_size, self.max_overflow, self.pool_pre_ping)
+
+    def _read(
+        self,
+        uri: str,
+        table_name: Optional[str] = None,
+        query: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        engine = self.engine(uri)
+        if columns is not None or dtypes or filters:
+            statement = build_select(table_name, query, columns, filters)
+            df = pd.read_sql(statement, engine, dtype=dtypes, **kwargs)
+        elif query:
+            df = pd.read_sql(query, engine, **kwargs)
+        else:
+            df = pd.read_sql_table(table_name, engine, **kwargs)
+        self._df = df
+        return df
+
+    def read_many(
+        self,
+        uri: str,
+        queries: Sequence[Union[str, Mapping[str, Any]]],
+        max_workers: Optional[int] = None,
+    ) -> List[pd.DataFrame]:
+        """
+        Run several reads concurrently, each on its own pooled connection.
+        Like `iter_chunks`, this bypasses the caches.
+
+        :param uri: Database URI.
+        :param queries: SQL strings, or mappings of `load` arguments (e.g.
+                        {"table_name": "items", "columns": ["item_id"]}).
+        :param max_workers: Concurrent reads (default: `pool_size`).
+        :return: One DataFrame per query, in input order.
+        """
+        reads: List[Dict[str, Any]] = [
+            {"query": q} if isinstance(q, str) else dict(q) for q in queries
+        ]
+        workers = min(max_workers or self.pool_size, len(reads))
+        if workers <= 1:
+            return [self._read(uri, **kwargs) for kwargs in reads]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda kwargs: self._read(uri, **kwargs), reads))
+
+    def _iter_chunks(
+        self,
+        uri: str,
+        chunksize: int,
+        table_name: Optional[str] = None,
+        query: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        **kwargs: Any,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream rows through a server-side cursor (`stream_results`), so the
+        driver does not buffer the full result set before the first chunk.
+        """
+        with self.engine(uri).connect() as conn:
+            conn = conn.execution_options(stream_results=True)
+            if columns is not None or dtypes or filters:
+                chunks = pd.read_sql(
+                    build_select(table_name, query, columns, filters),
+                    conn,
+                    chunksize=chunksize,
+                    dtype=dtypes,
+                    **kwargs,
+                )
+            elif query:
+                chunks = pd.read_sql(query, conn, chunksize=chunksize, **kwargs)
+            else:
+                chunks = pd.read_sql_table(
+                    table_name, conn, chunksize=chunksize, **kwargs
+                )
+            yield from chunks
@@ -0,0 +1,273 @@
+"""
+Multi-process, row-wise DataFrame processing for `DataPipeline`.
+
+Frames never travel through pickle: the parent writes its input once as
+an uncompressed Arrow IPC file (in /dev/shm when available), each worker
+memory-maps the file and slices out its rows without copying, and writes
+its result back the same way. The parent reads the results in order and
+restores the input's index. Only the (small) function to apply, file
+paths and row ranges are pickled. `FrameMapper` applies several
+functions in turn with one pool, handing each worker's output file
+straight to the next function.
+"""
+
+import itertools
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
+from typing import Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from recommender_universal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+FrameFn = Callable[[pd.DataFrame], pd.DataFrame]
+
+# Below this many rows, process start-up and I/O outweigh the speed-up
+MIN_PARALLEL_ROWS = 100_000
+
+# Per-process state set by `_init_worker`
+_worker: Dict[str, Any] = {}
+
+
+def _scratch_dir() -> "tempfile.TemporaryDirectory[str]":
+    shm = Path("/dev/shm")
+    use_shm = shm.is_dir() and os.access(shm, os.W_OK)
+    return tempfile.TemporaryDirectory(dir=str(shm) if use_shm else None)
+
+
+def _write(df: pd.DataFrame, path: str) -> None:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    feather.write_feather(table, path, compression="uncompressed")
+
+
+def _read(path: str, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+    table = feather.read_table(path, memory_map=True)
+    if start or stop is not None:
+        table = table.slice(start, None if stop is None else stop - start)
+    return table.to_pandas()
+
+
+def _init_worker(fn: FrameFn) -> None:
+    _worker["fn"] = fn
+
+
+def _apply_fn_file(
+    fn: FrameFn, in_path: str, start: int, stop: Optional[int], out_path: str
+) -> None:
+    _write(fn(_read(in_path, start, stop)), out_path)
+
+
+def _apply_file(in_path: str, start: int, stop: Optional[int], out_path: str) -> None:
+    _apply_fn_file(_worker["fn"], in_path, start, stop, out_path)
+
+
+def _collect(out_path: str, index: pd.Index) -> pd.DataFrame:
+    df = _read(out_path)
+    if len(df) != len(index):
+        raise ValueError("Parallel transforms must not add or drop rows")
+    df.index = index
+    return df
+
+
+def _n_workers(n_jobs: Optional[int]) -> int:
+    if n_jobs is None:
+        return os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError("n_jobs must be a positive integer or None")
+    return n_jobs
+
+
+class FrameMapper:
+    """
+    Applies row-wise functions to frames like `map_frame`, one call after
+    another, with a single worker pool and scratch directory. A frame that
+    `map` returned and is passed back in unmodified is not written again:
+    each worker's output file becomes its next input. Use as a context
+    manager, or call `close`.
+    """
+
+    def __init__(
+        self, n_jobs: Optional[int] = None, min_rows: int = MIN_PARALLEL_ROWS
+    ) -> None:
+        """
+        :param n_jobs: Worker processes (default: all CPUs).
+        :param min_rows: Fewest rows worth sending to a worker; smaller
+                         inputs use fewer workers.
+        """
+        self.n_jobs = _n_workers(n_jobs)
+        self.min_rows = min_rows
+        self._tmp: Optional["tempfile.TemporaryDirectory[str]"] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._calls = 0
+        # The last result, with its files as (path, start, stop) slices of
+        # the next input and the rows of the frame each one holds
+        self._last: Optional[pd.DataFrame] = None
+        self._inputs: List[Tuple[str, int, Optional[int]]] = []
+        self._bounds: List[Tuple[int, int]] = []
+
+    def __enter__(self) -> "FrameMapper":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+        self._last = None
+
+    def _split(self, df: pd.DataFrame, workers: int, tmp: str) -> bool:
+        """Write `df` as the next input, or False if Arrow cannot hold it."""
+        in_path = os.path.join(tmp, f"input-{self._calls}.arrow")
+        try:
+            _write(df, in_path)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError) as exc:
+            logger.warning("Running transforms serially: %s", exc)
+            return False
+        step = -(-len(df) // workers)
+        self._bounds = [
+            (start, min(start + step, len(df))) for start in range(0, len(df), step)
+        ]
+        self._inputs = [(in_path, start, stop) for start, stop in self._bounds]
+        return True
+
+    def map(self, df: pd.DataFrame, fn: FrameFn) -> pd.DataFrame:
+        """
+        `fn(df)` for a row-wise `fn`, computed on row slices in parallel.
+        Runs in-process for one job, fewer than `min_rows` rows, or frames
+        Arrow cannot represent (e.g. mixed-type object columns).
+
+        :param fn: Picklable (module-level) function of a frame.
+        """
+        workers = min(self.n_jobs, len(df) // max(self.min_rows, 1))
+        if workers <= 1:
+            return fn(df)
+        if self._tmp is None:
+            self._tmp = _scratch_dir()
+        tmp = self._tmp.name
+        reuse = df is self._last and len(self._bounds) == workers
+        if not reuse and not self._split(df, workers, tmp):
+            return fn(df)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=workers)
+
+        out_paths = [
+            os.path.join(tmp, f"out-{self._calls}-{i}.arrow")
+            for i in range(len(self._inputs))
+        ]
+        self._calls += 1
+        list(
+            self._pool.map(
+                _apply_fn_file,
+                [fn] * len(out_paths),
+                [path for path, _, _ in self._inputs],
+                [start for _, start, _ in self._inputs],
+                [stop for _, _, stop in self._inputs],
+                out_paths,
+            )
+        )
+        out = pd.concat(
+            [
+                _collect(path, df.index[start:stop])
+                for path, (start, stop) in zip(out_paths, self._bounds)
+            ]
+        )
+        # Free the consumed inputs' scratch space (tmpfs is RAM)
+        for path in {path for path, _, _ in self._inputs}:
+            os.unlink(path)
+        self._last = out
+        self._inputs = [(path, 0, None) for path in out_paths]
+        return out
+
+
+def map_frame(
+    df: pd.DataFrame,
+    fn: FrameFn,
+    n_jobs: Optional[int] = None,
+    min_rows: int = MIN_PARALLEL_ROWS,
+) -> pd.DataFrame:
+    """
+    `fn(df)` for a row-wise `fn`, computed on row slices in parallel; see
+    `FrameMapper.map`.
+
+    :param n_jobs: Worker processes (default: all CPUs).
+    :param min_rows: Fewest rows worth sending to a worker; smaller
+                     inputs use fewer workers.
+    """
+    with FrameMapper(n_jobs, min_rows) as mapper:
+        return mapper.map(df, fn)
+
+
+def map_chunks(
+    chunks: Iterable[pd.DataFrame],
+    fn: FrameFn,
+    n_jobs: Optional[int] = None,
+    min_rows: int = MIN_PARALLEL_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    `fn` over a stream of chunks, with up to two chunks per worker in
+    flight, yielding results in input order. Streams whose first chunk
+    has fewer than `min_rows` rows run in-process; a stream of a single
+    chunk is handled by `map_frame`.
+    """
+    workers = _n_workers(n_jobs)
+    it = iter(chunks)
+    first = next(it, None)
+    if first is None:
+        return
+    second = next(it, None)
+    if second is None:
+        yield map_frame(first, fn, workers, min_rows)
+        return
+    if workers == 1 or len(first) < min_rows:
+        for chunk in itertools.chain([first, second], it):
+            yield fn(chunk)
+        return
+
+    with _scratch_dir() as tmp, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(fn,)
+    ) as pool:
+        pending: Deque[Callable[[], pd.DataFrame]] = deque()
+        for n, chunk in enumerate(itertools.chain([first, second], it)):
+            pending.append(_submit(pool, fn, chunk, tmp, n))
+            while len(pending) >= 2 * workers:
+                yield pending.popleft()()
+        while pending:
+            yield pending.popleft()()
+
+
+def _submit(
+    pool: ProcessPoolExecutor, fn: FrameFn, chunk: pd.DataFrame, tmp: str, n: int
+) -> Callable[[], pd.DataFrame]:
+    """Start processing one chunk; the returned callable waits for it."""
+    in_path = os.path.join(tmp, f"in-{n}.arrow")
+    out_path = os.path.join(tmp, f"out-{n}.arrow")
+    try:
+        _write(chunk, in_path)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError) as exc:
+        logger.warning("Transforming chunk %d serially: %s", n, exc)
+        result = fn(chunk)
+        return lambda: result
+    future = pool.submit(_apply_file, in_path, 0, None, out_path)
+
+    def finish() -> pd.DataFrame:
+        future.result()
+        df = _collect(out_path, chunk.index)
+        # Free the scratch space (tmpfs is RAM) as soon as a chunk is done
+        os.unlink(in_path)
+        os.unlink(out_path)
+        return df
+
+    return finish
@@ -1,9 +1,207 @@
-from typing import Optional, Sequence
+import hashlib
+import io
+import json
+import tracemalloc
+import uuid
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from typing import Set, Union
+import numpy as np
 import pandas as pd
-from .connectors.base import BaseConnector
+import pyarrow as pa
+import pyarrow.parquet as pq
+from recommender_universal.utils.artifacts import encode_state, restore_state
+from recommender_universal.utils.logging import get_logger
+from .connectors.base import BaseConnector, Filter
+from .connectors.cache import DiskCache, make_key
+from .parallel import MIN_PARALLEL_ROWS, FrameMapper, map_chunks
 from .schema import RatingSchema
 from .transforms.base import BaseTransform
 
+logger = get_logger(__name__)
+
+
+def plan_fused(transforms: Sequence[BaseTransform]) -> List[List[BaseTransform]]:
+    """
+    Split transforms into stages for fused execution: each run of
+    consecutive transforms with `fused_columns` forms one stage, and every
+    other transform is a stage of its own.
+    """
+    stages: List[List[BaseTransform]] = []
+    fusing = False
+    for transform in transforms:
+        fusable = transform.fused_columns() is not None
+        if fusable and fusing:
+            stages[-1].append(transform)
+        else:
+            stages.append([transform])
+        fusing = fusable
+    return stages
+
+
+def plan_fit_passes(
+    transforms: Sequence[BaseTransform],
+) -> List[List[BaseTransform]]:
+    """
+    Group transforms into streaming fit passes. A transform is fitted on
+    the output of all earlier ones, so it normally needs a pass of its own;
+    consecutive transforms with disjoint `fused_columns` do not see each
+    other's output and share a pass.
+    """
+    passes: List[List[BaseTransform]] = []
+    touched: Optional[Set[str]] = None  # columns of the current pass; None: unknown
+    for transform in transforms:
+        cols = transform.fused_columns()
+        if passes and touched is not None and cols is not None:
+            if touched.isdisjoint(cols):
+                passes[-1].append(transform)
+                touched.update(cols)
+                continue
+        passes.append([transform])
+        touched = None if cols is None else set(cols)
+    return passes
+
+
+def _assemble(df: pd.DataFrame, buffers: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """`df` with `buffers` swapped in, sharing all other columns' memory."""
+    if not buffers:
+        return df
+    return pd.DataFrame(
+        {col: buffers[col] if col in buffers else df[col] for col in df.columns},
+        index=df.index,
+        copy=False,
+    )
+
+
+def run_fused(
+    df: pd.DataFrame, transforms: Sequence[BaseTransform], fit: bool = True
+) -> pd.DataFrame:
+    """
+    Apply `transforms` like calling them in turn, but copy each column a
+    fused stage touches only once, into a float32 buffer that the stage's
+    transforms update in place. Other columns are shared with `df`, which
+    is never modified. Transforms without fused support run normally.
+
+    :param fit: Fit each transform on its input first, as `fit_transform`.
+    """
+    for stage in plan_fused(transforms):
+        if stage[0].fused_columns() is None:
+            (transform,) = stage
+            df = transform.fit_transform(df) if fit else transform.transform(df)
+            continue
+        buffers: Dict[str, np.ndarray] = {}
+        for transform in stage:
+            for col in transform.fused_columns() or ():
+                if col not in buffers:
+                    buffers[col] = np.array(df[col], dtype=np.float32)
+            if fit:
+                transform.fit(_assemble(df, buffers))
+            transform.transform_inplace(buffers)
+        df = _assemble(df, buffers)
+    return df
+
+
+def transform_all(
+    df: pd.DataFrame, transforms: Sequence[BaseTransform], fused: bool = False
+) -> pd.DataFrame:
+    """Apply fitted `transforms` in turn (with `run_fused` if `fused`)."""
+    if fused:
+        return run_fused(df, transforms, fit=False)
+    for transform in transforms:
+        df = transform.transform(df)
+    return df
+
+
+# Stage cache metadata entry holding the encoded states of a step's
+# transforms, and prefix of the entries holding their arrays as `.npy` bytes
+_STATE_KEY = "transform_state"
+_ARRAY_PREFIX = "transform_array."
+
+
+def _qualname(obj: Any) -> str:
+    cls = type(obj)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _transform_id(transform: BaseTransform, fit: bool) -> List[Any]:
+    """
+    What determines a transform's output besides its input: its class and
+    config, plus its fitted state unless it is about to be (re)fitted.
+    """
+    state = None
+    if not fit:
+        state = _state_digest(transform)
+    return [_qualname(transform), transform.config(), state]
+
+
+def _state_digest(transform: BaseTransform) -> str:
+    """
+    Hash of the transform's state in its cache encoding, so that a state
+    restored from the stage cache hashes like the original. States that
+    cannot be encoded get a random digest, i.e. are never reused.
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    try:
+        state = encode_state(transform, arrays)
+    except TypeError:
+        return uuid.uuid4().hex
+    digests = {
+        file: [
+            array.dtype.str,
+            list(array.shape),
+            hashlib.sha256(np.ascontiguousarray(array).data).hexdigest(),
+        ]
+        for file, array in arrays.items()
+    }
+    return make_key(state, digests)
+
+
+def _encode_states(step: List[BaseTransform]) -> Dict[str, bytes]:
+    """
+    Stage cache metadata holding the fitted states of `step`, in the
+    pickle-free artifact encoding; empty if a state cannot be encoded.
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    try:
+        states = [encode_state(t, arrays, prefix=f"{i}.") for i, t in enumerate(step)]
+    except TypeError as exc:
+        logger.warning("Not caching transform state: %s", exc)
+        return {}
+    metadata = {_STATE_KEY: json.dumps(states).encode()}
+    for file, array in arrays.items():
+        buffer = io.BytesIO()
+        np.save(buffer, array, allow_pickle=False)
+        metadata[_ARRAY_PREFIX + file] = buffer.getvalue()
+    return metadata
+
+
+def _restore_states(step: List[BaseTransform], metadata: Dict[str, bytes]) -> None:
+    """Set the fitted states stored by `_encode_states` on `step`."""
+
+    def read(file: str) -> np.ndarray:
+        return np.load(io.BytesIO(metadata[_ARRAY_PREFIX + file]), allow_pickle=False)
+
+    for transform, state in zip(step, json.loads(metadata[_STATE_KEY])):
+        restore_state(transform, state, read)
+
+
+def _traced_peak(fn: Callable[[], pd.DataFrame]) -> Tuple[pd.DataFrame, int]:
+    """Result of `fn` and the peak bytes it allocated on top of the baseline."""
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return result, max(peak, 0)
+
 
 class DataPipeline:
     def __init__(
@@ -12,19 +210,385 @@ class DataPipeline:
         schema: RatingSchema,
         uri: str,
         transforms: Optional[Sequence[BaseTransform]] = None,
+        project: bool = False,
+        dtypes: Optional[Dict[str, Any]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        n_jobs: Optional[int] = 1,
+        min_parallel_rows: int = MIN_PARALLEL_ROWS,
+        stage_cache: Union[None, str, Path, DiskCache] = None,
     ) -> None:
+        """
+        :param project: If True, the connector reads only the schema's
+                        required columns, parsed as `dtypes`.
+        :param dtypes: Column dtypes to read with when projecting
+                       (default: `schema.compact_dtypes()`, without the
+                       "category" IDs for chunked reads).
+        :param filters: Row filters pushed down to the connector, e.g.
+                        [("rating", ">=", 3)].
+        :param n_jobs: Worker processes for applying fitted transforms to row
+                       slices or chunks (None: all CPUs). Fitting stays in
+                       this process; transforms must be row-wise and
+                       picklable, and pipelines with a transform that is
+                       not `stateless()` run serially. See
+                       `recommender_universal.data.parallel`.
+        :param min_parallel_rows: Fewest rows worth sending to a worker;
+                                  smaller inputs are transformed serially.
+        :param stage_cache: A `DiskCache`, or a directory for one, in which
+                            `run` memoizes the output of every stage (see
+                            `run`). Set its `ttl` / `max_bytes` to evict
+                            stale entries by age or size. Fitted states
+                            are stored without pickle (see
+                            `recommender_universal.utils.artifacts`), but
+                            restoring them imports the transform classes
+                            the cache names, so only use a cache directory
+                            you control.
+        """
         self.connector = connector
         self.schema = schema
         self.uri = uri
         self.transforms = transforms or []
+        self.project = project
+        self.dtypes = dtypes
+        self.filters = filters
+        if n_jobs is not None and n_jobs < 1:
+            raise ValueError("n_jobs must be a positive integer or None")
+        self.n_jobs = n_jobs
+        self.min_parallel_rows = min_parallel_rows
+        if stage_cache is not None and not isinstance(stage_cache, DiskCache):
+            stage_cache = DiskCache(stage_cache)
+        self.stage_cache: Optional[DiskCache] = stage_cache
+        # Set by `run(measure_memory=True)`
+        self.memory_report: Optional[Dict[str, int]] = None
+
+    def _read_args(self, chunked: bool = False) -> Dict[str, Any]:
+        """
+        Projection and filters for the connector. Chunked reads keep the
+        default IDs out of "category": each chunk would get its own
+        categories, which do not concatenate.
+        """
+        args: Dict[str, Any] = {}
+        if self.project:
+            args["columns"] = self.schema.required_columns()
+            dtypes = (
+                self.schema.compact_dtypes() if self.dtypes is None else self.dtypes
+            )
+            if chunked and self.dtypes is None:
+                dtypes = {c: t for c, t in dtypes.items() if t != "category"}
+            args["dtypes"] = dtypes
+        if self.filters:
+            args["filters"] = list(self.filters)
+        return args
+
+    def _transformer(
+        self, transforms: Sequence[BaseTransform], fused: bool
+    ) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        return partial(transform_all, transforms=list(transforms), fused=fused)
+
+    def _apply(
+        self,
+        df: pd.DataFrame,
+        fit: bool,
+        fused: bool,
+        transforms: Optional[Sequence[BaseTransform]] = None,
+    ) -> pd.DataFrame:
+        """Apply `transforms` (default: all of them) to `df`."""
+        transforms = self.transforms if transforms is None else transforms
+        if self._parallel(transforms):
+            return self._apply_parallel(df, fit, fused, transforms)
+        return self._apply_serial(df, fit, fused, transforms)
+
+    def _parallel(self, transforms: Sequence[BaseTransform]) -> bool:
+        """
+        Whether to apply `transforms` in worker processes: only if asked
+        to, and none of them updates its state in `transform` (workers'
+        copies of that state would diverge and be lost).
+        """
+        if self.n_jobs == 1 or not transforms:
+            return False
+        stateful = [type(t).__name__ for t in transforms if not t.stateless()]
+        if stateful:
+            logger.warning(
+                "Transforming serially: %s update their state in transform",
+                ", ".join(stateful),
+            )
+            return False
+        return True
 
-    def run(self, validate: bool = True, fit: bool = True) -> pd.DataFrame:
-        df = self.connector.load(uri=self.uri)
+    def _apply_serial(
+        self,
+        df: pd.DataFrame,
+        fit: bool,
+        fused: bool,
+        transforms: Sequence[BaseTransform],
+    ) -> pd.DataFrame:
+        if fused:
+            return run_fused(df, transforms, fit=fit)
+        for transform in transforms:
+            df = transform.fit_transform(df) if fit else transform.transform(df)
+        return df
 
+    def _apply_parallel(
+        self,
+        df: pd.DataFrame,
+        fit: bool,
+        fused: bool,
+        transforms: Sequence[BaseTransform],
+    ) -> pd.DataFrame:
+        """
+        Fit in-process, one `plan_fit_passes` group at a time, and apply
+        each fitted group across worker processes. All groups share one
+        pool, and each group's output files feed the next group directly.
+        """
+        groups = plan_fit_passes(transforms) if fit else [list(transforms)]
+        with FrameMapper(self.n_jobs, self.min_parallel_rows) as mapper:
+            for group in groups:
+                if fit:
+                    for transform in group:
+                        transform.fit(df)
+                df = mapper.map(df, self._transformer(group, fused))
+        return df
+
+    def run(
+        self,
+        validate: bool = True,
+        fit: bool = True,
+        fused: bool = False,
+        measure_memory: bool = False,
+    ) -> pd.DataFrame:
+        """
+        :param fused: Run transforms with `run_fused`: transformed columns
+                      come back as float32 and the others share memory with
+                      the loaded (possibly connector-cached) frame.
+        :param measure_memory: Trace allocations during the transforms and
+                               store {"input_bytes", "peak_bytes",
+                               "output_bytes"} in `memory_report`;
+                               `peak_bytes` counts the input plus the peak of
+                               new allocations. Tracing slows the run down.
+
+        With a `stage_cache`, the loaded (and validated) frame and the output
+        of each transform step (each `plan_fused` stage when `fused`) are
+        stored, keyed by a hash chaining the source's `fingerprint`, read
+        arguments and every step's class, `config` and fitted state (or,
+        when fitting, the fact that it is refitted). A rerun loads the
+        longest cached prefix, restores the fitted state of its transforms,
+        and runs only the steps after it. Sources without a fingerprint
+        (SQL) are assumed unchanged until their entries expire.
+        """
+        if self.stage_cache is None:
+            df = self._load(validate)
+            steps = None
+        else:
+            df, steps = self._resume(validate, fit, fused)
+
+        if not measure_memory:
+            return self._run_steps(df, fit, fused, steps)
+
+        input_bytes = int(df.memory_usage(deep=True).sum())
+        out, extra = _traced_peak(lambda: self._run_steps(df, fit, fused, steps))
+        self.memory_report = {
+            "input_bytes": input_bytes,
+            "peak_bytes": input_bytes + extra,
+            "output_bytes": int(out.memory_usage(deep=True).sum()),
+        }
+        logger.info("Pipeline memory: %s", self.memory_report)
+        return out
+
+    def _load(self, validate: bool) -> pd.DataFrame:
+        df = self.connector.load(uri=self.uri, **self._read_args())
         if validate:
             self.schema.validate(df)
+        return df
 
-        for transform in self.transforms:
-            df = transform.fit_transform(df) if fit else transform.transform(df)
+    def _stage_keys(
+        self, validate: bool, fit: bool, fused: bool
+    ) -> Tuple[str, List[Tuple[List[BaseTransform], str]]]:
+        """Cache key of the loaded frame, and each step with its key."""
+        key = make_key(
+            "load",
+            _qualname(self.connector),
+            self.uri,
+            self._read_args(),
+            self.connector.fingerprint(self.uri),
+            vars(self.schema) if validate else None,
+        )
+        load_key = key
+        steps = plan_fused(self.transforms) if fused else [[t] for t in self.transforms]
+        keyed = []
+        for step in steps:
+            key = make_key(key, fit, fused, [_transform_id(t, fit) for t in step])
+            keyed.append((step, key))
+        return load_key, keyed
+
+    def _resume(
+        self, validate: bool, fit: bool, fused: bool
+    ) -> Tuple[pd.DataFrame, List[Tuple[List[BaseTransform], str]]]:
+        """
+        The output of the longest cached prefix of stages (fitted states
+        restored) and the steps still to run.
+        """
+        cache = self.stage_cache
+        assert cache is not None
+        load_key, steps = self._stage_keys(validate, fit, fused)
+        if cache.get_metadata(load_key) is None:
+            df = self._load(validate)
+            cache.put(load_key, df)
+            return df, steps
 
+        done = 0
+        states: List[Dict[str, bytes]] = []
+        for _, key in steps:
+            metadata = cache.get_metadata(key)
+            if metadata is None or _STATE_KEY not in metadata:
+                break
+            states.append(metadata)
+            done += 1
+
+        df = cache.get(steps[done - 1][1] if done else load_key)
+        if df is None:  # expired or evicted since the metadata was read
+            df = self._load(validate)
+            done = 0
+        for (step, _), metadata in zip(steps[:done], states):
+            _restore_states(step, metadata)
+        logger.info("Stage cache: reusing %d of %d transform steps", done, len(steps))
+        return df, steps[done:]
+
+    def _run_steps(
+        self,
+        df: pd.DataFrame,
+        fit: bool,
+        fused: bool,
+        steps: Optional[List[Tuple[List[BaseTransform], str]]],
+    ) -> pd.DataFrame:
+        """Apply all transforms, or the given steps, caching each output."""
+        if steps is None:
+            return self._apply(df, fit, fused)
+        assert self.stage_cache is not None
+        for step, key in steps:
+            df = self._apply(df, fit, fused, step)
+            self.stage_cache.put(key, df, metadata=_encode_states(step))
         return df
+
+    def iter_chunks(
+        self, chunksize: int = 100_000, validate: bool = True, fused: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream the source through the pipeline chunk by chunk. Transforms
+        are applied with `transform` only, so they must already be fitted
+        (e.g. by an earlier `run`).
+
+        :param chunksize: Maximum rows per chunk.
+        :param validate: Check each chunk against the schema.
+        :param fused: Apply transforms with `run_fused`, as in `run`.
+        :return: Iterator over transformed chunks.
+        """
+        chunks = self.connector.iter_chunks(
+            self.uri, chunksize=chunksize, **self._read_args(chunked=True)
+        )
+        if validate:
+            chunks = self._validated(chunks)
+        if self._parallel(self.transforms):
+            yield from map_chunks(
+                chunks,
+                self._transformer(self.transforms, fused),
+                self.n_jobs,
+                self.min_parallel_rows,
+            )
+            return
+        for df in chunks:
+            yield self._apply_serial(df, False, fused, self.transforms)
+
+    def _validated(self, chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        for df in chunks:
+            self.schema.validate(df)
+            yield df
+
+    def fit_streaming(
+        self, chunksize: int = 100_000, validate: bool = True
+    ) -> "DataPipeline":
+        """
+        Fit the transforms out of core: each pass over the source's chunks
+        (see `plan_fit_passes`) calls `fit` on the first chunk and
+        `partial_fit` on the rest, after applying the transforms fitted in
+        earlier passes. Peak memory is about one chunk.
+
+        :param chunksize: Maximum rows per chunk.
+        :param validate: Check each chunk against the schema (first pass).
+        :raises NotImplementedError: If a transform has no `partial_fit`.
+        """
+        for transform in self.transforms:
+            if type(transform).partial_fit is BaseTransform.partial_fit:
+                raise NotImplementedError(
+                    f"{type(transform).__name__} does not support incremental "
+                    "fitting"
+                )
+        fitted: List[BaseTransform] = []
+        for pass_no, group in enumerate(plan_fit_passes(self.transforms)):
+            chunks = self.connector.iter_chunks(
+                self.uri, chunksize=chunksize, **self._read_args(chunked=True)
+            )
+            first = True
+            for df in chunks:
+                if validate and pass_no == 0:
+                    self.schema.validate(df)
+                for transform in fitted:
+                    df = transform.transform(df)
+                for transform in group:
+                    if first:
+                        transform.fit(df)
+                    else:
+                        transform.partial_fit(df)
+                first = False
+            if first:
+                raise ValueError("No chunks to fit on")
+            fitted.extend(group)
+        return self
+
+    def run_streaming(
+        self,
+        chunksize: int = 100_000,
+        validate: bool = True,
+        fit: bool = True,
+        fused: bool = False,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Two-pass out-of-core counterpart of `run`: `fit_streaming` (if
+        `fit`), then transform the chunks as they are read.
+
+        :return: Iterator over transformed chunks.
+        """
+        if fit and self.transforms:
+            self.fit_streaming(chunksize, validate=validate)
+            validate = False
+        return self.iter_chunks(chunksize, validate=validate, fused=fused)
+
+    def run_to_parquet(
+        self,
+        path: Union[str, Path],
+        chunksize: int = 100_000,
+        validate: bool = True,
+        fit: bool = True,
+        fused: bool = False,
+    ) -> int:
+        """
+        `run_streaming`, writing the chunks to one Parquet file (a row
+        group per chunk) instead of returning them.
+
+        :return: Number of rows written; no file is created if there are none.
+        """
+        writer: Optional[pq.ParquetWriter] = None
+        rows = 0
+        try:
+            for df in self.run_streaming(chunksize, validate, fit, fused):
+                if writer is None:
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    writer = pq.ParquetWriter(str(path), table.schema)
+                else:
+                    table = pa.Table.from_pandas(
+                        df, schema=writer.schema, preserve_index=False
+                    )
+                writer.write_table(table)
+                rows += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
@@ -16,6 +16,16 @@ class RatingSchema:
             cols.append(self.timestamp)
         return cols
 
+    def compact_dtypes(
+        self, id_dtype: str = "category", rating_dtype: str = "float32"
+    ) -> dict[str, str]:
+        """
+        Memory-lean dtypes for the ID and rating columns, for connectors to
+        parse into directly. Use id_dtype="int32" for small integer IDs.
+        The timestamp column is left to the reader.
+        """
+        return {self.user: id_dtype, self.item: id_dtype, self.rating: rating_dtype}
+
     def validate(self, df: pd.DataFrame) -> None:
         missing = [col for col in self.required_columns() if col not in df.columns]
         if missing:
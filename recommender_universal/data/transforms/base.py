@@ -2,8 +2,11 @@ from abc import (
     ABC,
     abstractmethod,
 )  # ABC cannot be inherited unless all subclasses implement all abstract methods
+import inspect
+
+import numpy as np
 import pandas as pd
-from typing import TypeVar, Generic
+from typing import Any, Dict, Generic, Optional, Sequence, TypeVar
 
 T = TypeVar(
     "T", bound="BaseTransform"
@@ -30,3 +33,64 @@ class BaseTransform(ABC, Generic[T]):
 
     def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
         return self.fit(df).transform(df)
+
+    def config(self) -> Dict[str, Any]:
+        """
+        Constructor parameters, identifying the transform in pipeline stage
+        cache keys. Fitted state must not be included. Defaults to the
+        attributes named like the `__init__` parameters; override if the
+        constructor does not store its arguments under their own names.
+        """
+        config = {}
+        params = inspect.signature(type(self).__init__).parameters.values()
+        for param in params:
+            if param.name == "self" or param.kind in (
+                param.VAR_POSITIONAL,
+                param.VAR_KEYWORD,
+            ):
+                continue
+            if not hasattr(self, param.name):
+                raise NotImplementedError(
+                    f"{type(self).__name__} does not store its '{param.name}' "
+                    "argument; override config()"
+                )
+            config[param.name] = getattr(self, param.name)
+        return config
+
+    def partial_fit(self, df: pd.DataFrame) -> T:
+        """
+        Update the fitted state with another chunk of data, so that `fit` on
+        the first chunk followed by `partial_fit` on the rest matches `fit`
+        on all of them.
+
+        :param df: The next chunk.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support incremental fitting"
+        )
+
+    def stateless(self) -> bool:
+        """
+        Whether `transform` leaves the fitted state unchanged. Pipelines
+        run only such transforms in worker processes, whose copies of the
+        state are discarded.
+        """
+        return True
+
+    def fused_columns(self) -> Optional[Sequence[str]]:
+        """
+        Columns this transform reads and rewrites, if it can run fused
+        (see `transform_inplace`); None otherwise.
+        """
+        return None
+
+    def transform_inplace(self, columns: Dict[str, np.ndarray]) -> None:
+        """
+        Fused counterpart of `transform`: update the float32 buffers of
+        `fused_columns()` in place, without allocating whole columns.
+
+        :param columns: Column name -> float32 buffer, owned by the caller.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support fused execution"
+        )
@@ -0,0 +1,177 @@
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from recommender_universal.utils.artifacts import load_artifact, save_artifact
+from .base import BaseTransform
+
+HANDLE_UNKNOWN = ("error", "ignore", "append")
+
+
+class Vocabulary:
+    """
+    IDs in code order (code c is `values[c]`), with a hash index for
+    vectorized lookups. Appending keeps existing codes stable.
+    """
+
+    def __init__(self, values: Optional[Any] = None) -> None:
+        self.values: np.ndarray = (
+            np.empty(0, dtype=object) if values is None else np.asarray(values)
+        )
+        self._index: Optional[pd.Index] = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The hash index is rebuilt on first use
+        return {"values": self.values}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.values = state["values"]
+        self._index = None
+
+    @property
+    def index(self) -> pd.Index:
+        if self._index is None:
+            self._index = pd.Index(self.values)
+        return self._index
+
+    def lookup(self, ids: Any) -> np.ndarray:
+        """int32 codes of `ids`; -1 for IDs not in the vocabulary."""
+        return self.index.get_indexer(ids).astype(np.int32)
+
+    def extend(self, ids: Any) -> np.ndarray:
+        """
+        Codes of `ids`, first appending unseen ones in first-seen order.
+        Adding IDs rebuilds the hash index on the next lookup.
+        """
+        codes = self.lookup(ids)
+        unknown = codes < 0
+        if unknown.any():
+            missing = np.asarray(ids)[unknown]
+            new_codes, new_ids = pd.factorize(missing)
+            start = len(self.values)
+            if start + len(new_ids) > np.iinfo(np.int32).max:
+                raise OverflowError("Vocabulary exceeds the int32 code range")
+            new_ids = np.asarray(new_ids)
+            self.values = np.concatenate([self.values, new_ids]) if start else new_ids
+            self._index = None
+            codes[unknown] = np.where(new_codes >= 0, new_codes + start, -1)
+        return codes
+
+    def decode(self, codes: Any) -> np.ndarray:
+        return self.values[np.asarray(codes)]
+
+
+class IdEncoder(BaseTransform):
+    """
+    Replace the user and item ID columns with contiguous int32 codes,
+    assigned in first-seen order (the same order as `pd.factorize`).
+
+    Null IDs are rejected by every method, as they have no code.
+
+    Models that are told about the encoder (`FactorModel.use_encoder`) take
+    their ID rows straight from these codes. `save` / `load` persist the
+    vocabularies as pickle-free `.npy` arrays, the same format as models
+    saved with `use_npy=True`.
+    """
+
+    def __init__(
+        self,
+        user_col: str = "user_id",
+        item_col: str = "item_id",
+        handle_unknown: str = "error",
+    ) -> None:
+        """
+        :param handle_unknown: What `transform` does with IDs missing from
+                               the vocabulary: "error" raises, "ignore"
+                               encodes them as -1, and "append" adds them
+                               (as `partial_fit` does).
+        """
+        if handle_unknown not in HANDLE_UNKNOWN:
+            raise ValueError(
+                f"handle_unknown must be one of {HANDLE_UNKNOWN}, "
+                f"got '{handle_unknown}'"
+            )
+        self.user_col = user_col
+        self.item_col = item_col
+        self.handle_unknown = handle_unknown
+        self.users = Vocabulary()
+        self.items = Vocabulary()
+
+    def stateless(self) -> bool:
+        # "append" grows the vocabularies in `transform`
+        return self.handle_unknown != "append"
+
+    def _vocabularies(self) -> Dict[str, Vocabulary]:
+        return {self.user_col: self.users, self.item_col: self.items}
+
+    def _check_nulls(self, df: pd.DataFrame) -> None:
+        for col in (self.user_col, self.item_col):
+            if df[col].isna().any():
+                raise ValueError(f"Column '{col}' contains null IDs")
+
+    def fit(self, df: pd.DataFrame) -> "IdEncoder":
+        self.users = Vocabulary()
+        self.items = Vocabulary()
+        return self.partial_fit(df)
+
+    def partial_fit(self, df: pd.DataFrame) -> "IdEncoder":
+        """Append the chunk's unseen IDs to the vocabularies."""
+        self._check_nulls(df)
+        for col, vocab in self._vocabularies().items():
+            vocab.extend(pd.unique(df[col]))
+        return self
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fit and encode with a single hashing pass per column."""
+        self._check_nulls(df)
+        out = df.copy()
+        for col in (self.user_col, self.item_col):
+            codes, uniques = pd.factorize(df[col])
+            if len(uniques) > np.iinfo(np.int32).max:
+                raise OverflowError("Vocabulary exceeds the int32 code range")
+            out[col] = codes.astype(np.int32)
+            if col == self.user_col:
+                self.users = Vocabulary(uniques.to_numpy())
+            else:
+                self.items = Vocabulary(uniques.to_numpy())
+        return out
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        self._check_nulls(df)
+        out = df.copy()
+        for col, vocab in self._vocabularies().items():
+            if self.handle_unknown == "append":
+                codes = vocab.extend(df[col])
+            else:
+                codes = vocab.lookup(df[col])
+                if self.handle_unknown == "error" and (codes < 0).any():
+                    unknown = df[col][codes < 0].unique()[:5].tolist()
+                    raise ValueError(f"Unknown IDs in column '{col}': {unknown}")
+            out[col] = codes
+        return out
+
+    def inverse_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Map the code columns back to the original IDs."""
+        out = df.copy()
+        for col, vocab in self._vocabularies().items():
+            out[col] = vocab.decode(df[col].to_numpy())
+        return out
+
+    def save(self, directory: Union[str, Path]) -> None:
+        save_artifact(self, Path(directory))
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = False) -> "IdEncoder":
+        """
+        :param mmap: Memory-map the vocabularies read-only (appending then
+                     copies them).
+        """
+        encoder = load_artifact(Path(directory), mmap=mmap)
+        if not isinstance(encoder, cls):
+            raise TypeError(f"{directory} does not hold an {cls.__name__}")
+        return encoder
@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+from typing import Dict, Sequence
 from .base import BaseTransform
 
 
@@ -18,9 +20,27 @@ class MinMaxScaler(BaseTransform):
             self.maxs[col] = df[col].max()
         return self
 
+    def partial_fit(self, df: pd.DataFrame) -> "MinMaxScaler":
+        """Merge the chunk's mins and maxes into the fitted ones."""
+        for col in self.columns:
+            min_, max_ = df[col].min(), df[col].max()
+            self.mins[col] = np.fmin(self.mins.get(col, min_), min_)
+            self.maxs[col] = np.fmax(self.maxs.get(col, max_), max_)
+        return self
+
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         out = df.copy()
         for col in self.columns:
             min_, max_ = self.mins[col], self.maxs[col]
             out[col] = (df[col] - min_) / (max_ - min_ + 1e-8)  # Avoid division by zero
         return out
+
+    def fused_columns(self) -> Sequence[str]:
+        return self.columns
+
+    def transform_inplace(self, columns: Dict[str, np.ndarray]) -> None:
+        for col in self.columns:
+            buf = columns[col]
+            min_, max_ = self.mins[col], self.maxs[col]
+            np.subtract(buf, np.float32(min_), out=buf)
+            np.divide(buf, np.float32(max_ - min_ + 1e-8), out=buf)
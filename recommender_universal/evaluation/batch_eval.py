@@ -1,39 +1,392 @@
+import math
+import numpy as np
 import pandas as pd
-from typing import Any, Callable, Dict, List, Set, Union
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple, Union
 
-from .metrics import hit_rate_at_k, average_precision_at_k, ndcg_at_k  # noqa: F401
+from .metrics import (  # noqa: F401
+    batch_metrics_at_k,
+    hit_rate_at_k,
+    precision_at_k,
+    recall_at_k,
+    average_precision_at_k,
+    ndcg_at_k,
+)
+
+MetricFn = Callable[[List[Any], Set[Any], int], float]
+
+# Raw metrics that `batch_metrics_at_k` computes for whole chunks of users
+_KERNEL_NAMES: Dict[Callable[..., float], str] = {
+    hit_rate_at_k: "hit_rate",
+    precision_at_k: "precision",
+    recall_at_k: "recall",
+    average_precision_at_k: "map",
+    ndcg_at_k: "ndcg",
+}
+
+
+def _ground_truth(
+    df: pd.DataFrame, user_col: str, item_col: str
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Group the relevant items by user in one factorize pass, as CSR:
+    user u's items are items[indptr[u]:indptr[u + 1]]. Users are in
+    first-seen order, like `Series.unique`.
+    """
+    codes, users = pd.factorize(df[user_col], use_na_sentinel=False)
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=len(users))
+    indptr = np.concatenate([[0], np.cumsum(counts)])
+    items = df[item_col].to_numpy()[order]
+    return np.asarray(users), indptr, items
+
+
+def _recommend_all(
+    model: Any, users: np.ndarray, k: int, batch_size: int
+) -> List[List[Any]]:
+    """Top-k lists for `users`, via `recommend_batch` when the model has it."""
+    recommend_batch = getattr(model, "recommend_batch", None)
+    if recommend_batch is None:
+        return [model.recommend(user, k) for user in users]
+    recs: List[List[Any]] = []
+    for start in range(0, len(users), batch_size):
+        recs.extend(recommend_batch(users[start : start + batch_size].tolist(), k))
+    return recs
+
+
+def _code_matrix(recs: List[List[Any]], vocab: pd.Index, k: int) -> np.ndarray:
+    """Recommended items as (len(recs), k) codes in `vocab`, -1 padded."""
+    lengths = np.fromiter((min(len(r), k) for r in recs), np.int64, len(recs))
+    flat = [item for rec in recs for item in rec[:k]]
+    out = np.full((len(recs), k), -1, dtype=np.int64)
+    out[np.arange(k) < lengths[:, None]] = vocab.get_indexer(flat)
+    return out
+
+
+def _kernel_names(metrics: Mapping[str, MetricFn]) -> Optional[Dict[str, str]]:
+    """Kernel name of every metric, or None if any needs the per-user path."""
+    names = {name: _KERNEL_NAMES.get(fn) for name, fn in metrics.items()}
+    if not all(names.values()):
+        return None
+    return {name: str(kernel_name) for name, kernel_name in names.items()}
+
+
+def _relevance(
+    items: np.ndarray, metrics: Mapping[str, MetricFn]
+) -> Tuple[Any, Optional[pd.Index]]:
+    """
+    The relevant items in the form `_score_chunk` reads: integer codes plus
+    their vocabulary for the kernel, otherwise a plain list of IDs.
+    """
+    if _kernel_names(metrics) is None:
+        return items.tolist(), None
+    codes, vocab = pd.factorize(items, use_na_sentinel=False)
+    return codes, pd.Index(vocab)
+
+
+def _score_chunk(
+    recs: List[List[Any]],
+    indptr: np.ndarray,
+    items: Any,
+    vocab: Optional[pd.Index],
+    k: int,
+    metrics: Mapping[str, MetricFn],
+) -> Dict[str, np.ndarray]:
+    """
+    Per-user scores for one chunk of users, whose relevant items are
+    items[indptr[u]:indptr[u + 1]] (item codes in `vocab`, or raw IDs if
+    `vocab` is None; see `_relevance`).
+    """
+    kernel = _kernel_names(metrics)
+    if vocab is not None and kernel is not None:
+        start = indptr[0]
+        results = batch_metrics_at_k(
+            _code_matrix(recs, vocab, k),
+            indptr - start,
+            items[start : indptr[-1]],
+            k,
+            metrics=sorted(set(kernel.values())),
+        )
+        return {name: results[kernel[name]] for name in metrics}
+
+    scores = {name: np.empty(len(recs), dtype=np.float64) for name in metrics}
+    for u, rec in enumerate(recs):
+        relevant = set(items[indptr[u] : indptr[u + 1]])
+        for name, metric_fn in metrics.items():
+            scores[name][u] = metric_fn(rec, relevant, k)
+    return scores
+
+
+def sample_users(
+    df: pd.DataFrame, user_col: str, fraction: float, seed: int = 0
+) -> pd.DataFrame:
+    """
+    Keep all rows of a deterministic `fraction` of the users. A user is
+    kept iff the hash of its ID falls below the fraction, so the sample
+    does not depend on row order or on which other users are present, and
+    a larger fraction keeps a superset of users.
+
+    :param fraction: Share of users to keep, in (0, 1].
+    :param seed: Selects a different, equally deterministic sample.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError("fraction must be in (0, 1]")
+    if seed < 0:
+        raise ValueError("seed must be non-negative")
+    codes, users = pd.factorize(df[user_col], use_na_sentinel=False)
+    # hash_key only affects string IDs, so mix the seed in by rehashing
+    hashes = pd.util.hash_array(pd.util.hash_array(np.asarray(users)) ^ np.uint64(seed))
+    # Compare the top 53 bits so the threshold is exact in float64
+    keep_user = (hashes >> np.uint64(11)) < fraction * 2.0**53
+    return df[keep_user[codes]]
+
+
+def _sampled_rankings(
+    model: Any,
+    users: np.ndarray,
+    indptr: np.ndarray,
+    items: np.ndarray,
+    k: int,
+    n_negatives: int,
+    catalog: np.ndarray,
+    rng: np.random.Generator,
+) -> List[List[Any]]:
+    """
+    Top-k of each user's relevant items ranked against `n_negatives` items
+    drawn without replacement from `catalog` (excluding relevant ones),
+    by `model.score`. Negatives come first among the candidates, so ties
+    count against the relevant items; items scored -inf are dropped.
+    """
+    recs: List[List[Any]] = []
+    for u, user in enumerate(users):
+        relevant = list(dict.fromkeys(items[indptr[u] : indptr[u + 1]].tolist()))
+        exclude = set(relevant)
+        n_draw = min(n_negatives + len(relevant), len(catalog))
+        drawn = catalog[rng.choice(len(catalog), n_draw, replace=False)].tolist()
+        negatives = [item for item in drawn if item not in exclude][:n_negatives]
+        candidates = negatives + relevant
+        scores = np.asarray(model.score(user, candidates), dtype=np.float64)
+        order = np.argsort(-scores, kind="stable")[:k]
+        recs.append([candidates[i] for i in order if scores[i] > -np.inf])
+    return recs
+
+
+def per_user_scores(
+    df: pd.DataFrame,
+    model: Any,
+    k: int,
+    metrics: Mapping[str, MetricFn],
+    user_col: str,
+    item_col: str,
+    batch_size: int = 10_000,
+    sample_fraction: Optional[float] = None,
+    n_negatives: Optional[int] = None,
+    seed: int = 0,
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Score every user of `df` on every metric, requesting each user's
+    recommendations once. If all metrics are raw metrics from
+    `evaluation.metrics`, each chunk of users is scored at once by
+    `batch_metrics_at_k`; any other metric_fn is called per user.
+
+    :param metrics: Metric name -> metric_fn(recommended, relevant, k).
+    :param batch_size: Users per `recommend_batch` call.
+    :param sample_fraction: If set, only score a deterministic hash-based
+                            sample of this share of users (`sample_users`).
+    :param n_negatives: If set, instead of full top-k retrieval rank each
+                        user's relevant items among this many sampled
+                        negatives from the model's catalog (`item_ids`,
+                        else the items of `df`), using `model.score`.
+    :param seed: Seed for the user sample and negative sampling.
+    :return: The users, and per metric an array of their scores.
+    """
+    if sample_fraction is not None:
+        df = sample_users(df, user_col, sample_fraction, seed)
+    users, indptr, items = _ground_truth(df, user_col, item_col)
+    relevant, vocab = _relevance(items, metrics)
+    rng = np.random.default_rng(seed)
+    catalog: np.ndarray = np.empty(0, dtype=object)
+    if n_negatives is not None:
+        if n_negatives < 1:
+            raise ValueError("n_negatives must be a positive integer")
+        model_items = getattr(model, "item_ids", None)
+        catalog = np.asarray(
+            pd.unique(df[item_col]) if model_items is None else model_items
+        )
+
+    scores = {name: np.empty(len(users), dtype=np.float64) for name in metrics}
+    for start in range(0, len(users), batch_size):
+        stop = min(start + batch_size, len(users))
+        if n_negatives is None:
+            recs = _recommend_all(model, users[start:stop], k, batch_size)
+        else:
+            recs = _sampled_rankings(
+                model,
+                users[start:stop],
+                indptr[start : stop + 1],
+                items,
+                k,
+                n_negatives,
+                catalog,
+                rng,
+            )
+        chunk = _score_chunk(
+            recs, indptr[start : stop + 1], relevant, vocab, k, metrics
+        )
+        for name, values in chunk.items():
+            scores[name][start:stop] = values
+    return users, scores
+
+
+def bootstrap_ci(
+    values: np.ndarray,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> Tuple[float, float]:
+    """
+    Percentile bootstrap confidence interval of the mean of per-user
+    scores, resampling users with replacement.
+
+    :return: (lower, upper) bounds.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be in (0, 1)")
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return 0.0, 0.0
+    rng = np.random.default_rng(seed)
+    means = np.empty(n_resamples, dtype=np.float64)
+    # Bound the index matrix to about 10M entries
+    step = max(1, 10_000_000 // len(values))
+    for start in range(0, n_resamples, step):
+        stop = min(start + step, n_resamples)
+        idx = rng.integers(0, len(values), (stop - start, len(values)))
+        means[start:stop] = values[idx].mean(axis=1)
+    alpha = 1 - confidence
+    lower, upper = np.quantile(means, [alpha / 2, 1 - alpha / 2])
+    return float(lower), float(upper)
+
+
+def evaluate_metrics(
+    df: pd.DataFrame,
+    model: Any,
+    k: int,
+    metrics: Mapping[str, MetricFn],
+    user_col: str,
+    item_col: str,
+    batch_size: int = 10_000,
+    sample_fraction: Optional[float] = None,
+    n_negatives: Optional[int] = None,
+    seed: int = 0,
+) -> Dict[str, float]:
+    """
+    Average several metrics over all users in df in a single pass. Means
+    are exactly rounded (`math.fsum`), so they do not depend on user order
+    or on how `parallel_evaluate` shards the users.
+
+    :param metrics: Metric name -> metric_fn, e.g.
+                    {"hit_rate": hit_rate_at_k, "ndcg": ndcg_at_k}.
+    :param batch_size: Users per `recommend_batch` call.
+    :param sample_fraction: Trade exactness for speed: evaluate a
+                            hash-based sample of users (see
+                            `per_user_scores`).
+    :param n_negatives: Rank against sampled negatives instead of the
+                        full catalog (see `per_user_scores`).
+    :param seed: Seed for both kinds of sampling.
+    :return: dict mapping each metric name → its mean over users
+    """
+    users, scores = per_user_scores(
+        df,
+        model,
+        k,
+        metrics,
+        user_col,
+        item_col,
+        batch_size,
+        sample_fraction=sample_fraction,
+        n_negatives=n_negatives,
+        seed=seed,
+    )
+    return {
+        name: math.fsum(values) / len(users) if len(users) else 0.0
+        for name, values in scores.items()
+    }
+
+
+def evaluate_with_ci(
+    df: pd.DataFrame,
+    model: Any,
+    k: int,
+    metrics: Mapping[str, MetricFn],
+    user_col: str,
+    item_col: str,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    sample_fraction: Optional[float] = None,
+    n_negatives: Optional[int] = None,
+    seed: int = 0,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Metric means with bootstrap confidence intervals. Recommendations are
+    computed once; the intervals only resample the per-user scores.
+
+    :param n_resamples: Bootstrap resamples per metric.
+    :param confidence: Coverage of the interval, e.g. 0.95.
+    :param sample_fraction: See `evaluate_metrics`.
+    :param n_negatives: See `evaluate_metrics`.
+    :param seed: Seed for sampling and resampling.
+    :return: dict mapping each metric name → {"mean", "lower", "upper"}
+    """
+    users, scores = per_user_scores(
+        df,
+        model,
+        k,
+        metrics,
+        user_col,
+        item_col,
+        sample_fraction=sample_fraction,
+        n_negatives=n_negatives,
+        seed=seed,
+    )
+    results: Dict[str, Dict[str, float]] = {}
+    for name, values in scores.items():
+        lower, upper = bootstrap_ci(values, n_resamples, confidence, seed)
+        mean = math.fsum(values) / len(users) if len(users) else 0.0
+        results[name] = {"mean": mean, "lower": lower, "upper": upper}
+    return results
 
 
 def evaluate_batch(
     df: pd.DataFrame,
     model: Any,
     k: int,
-    metric_fn: Callable[[List[Any], Set[Any], int], float],
+    metric_fn: MetricFn,
     user_col: str,
     item_col: str,
 ) -> float:
     """Average metric_fn over all users in df."""
-    users = df[user_col].unique()
-    scores: List[float] = []
-    for user in users:
-        relevant = set(df[df[user_col] == user][item_col])
-        recs = model.recommend(user, k)
-        scores.append(metric_fn(recs, relevant, k))
-    return float(sum(scores) / len(scores)) if scores else 0.0
+    return evaluate_metrics(df, model, k, {"score": metric_fn}, user_col, item_col)[
+        "score"
+    ]
 
 
 def stratified_evaluation(
     df: pd.DataFrame,
     model: Any,
     k: int,
-    metric_fn: Callable[[List[Any], Set[Any], int], float],
+    metric_fn: MetricFn,
     user_col: str,
     item_col: str,
     group_col: Union[str, pd.Grouper],
+    batch_size: int = 10_000,
 ) -> Dict[Any, float]:
     """
     Compute the chosen metric_fn for each subgroup of the DataFrame.
 
+    Recommendations are computed once per distinct user, however many
+    groups the user appears in; each (group, user) pair is then scored
+    against the user's items within that group.
+
     :param df: full test interactions
     :param model: recommender with .recommend(user, k)
     :param k: cutoff for recommendations
@@ -43,14 +396,57 @@ def stratified_evaluation(
     :param group_col: either
         - a column name in df to group by, or
         - a `pd.Grouper` (e.g. pd.Grouper(key="timestamp", freq="M")) for time periods
+    :param batch_size: Users per `recommend_batch` call.
     :return: dict mapping each group value → its batch metric score
     """
-    results: Dict[Any, float] = {}
-    # Use pandas grouping
-    grouped = (
-        df.groupby(group_col) if isinstance(group_col, str) else df.groupby(group_col)
+    # Row positions of every group, grouping a small frame the same way
+    key = group_col if isinstance(group_col, str) else group_col.key
+    frame = pd.DataFrame({"__position__": np.arange(len(df))}, index=df.index)
+    if key is not None:
+        frame[key] = df[key].to_numpy()
+    keys: List[Any] = []
+    group_codes = np.full(len(df), -1, dtype=np.int64)
+    for code, (group_value, positions) in enumerate(
+        frame.groupby(group_col)["__position__"]
+    ):
+        keys.append(group_value)
+        group_codes[positions.to_numpy()] = code
+
+    # One entry per distinct (group, user) pair, with that pair's items
+    kept = np.flatnonzero(group_codes >= 0)
+    user_codes, users = pd.factorize(
+        df[user_col].to_numpy()[kept], use_na_sentinel=False
     )
-    for group_value, group_df in grouped:
-        score = evaluate_batch(group_df, model, k, metric_fn, user_col, item_col)
-        results[group_value] = score
+    pair_codes, pairs = pd.factorize(group_codes[kept] * len(users) + user_codes)
+    pair_group, pair_user = np.divmod(pairs, max(len(users), 1))
+    order = np.argsort(pair_codes, kind="stable")
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(pair_codes))])
+    items = df[item_col].to_numpy()[kept][order]
+
+    # Each distinct user is recommended for once, whatever its groups
+    metrics = {"score": metric_fn}
+    recs = _recommend_all(model, np.asarray(users), k, batch_size)
+    relevant, vocab = _relevance(items, metrics)
+    scores = np.empty(len(pairs), dtype=np.float64)
+    for start in range(0, len(pairs), batch_size):
+        stop = min(start + batch_size, len(pairs))
+        scores[start:stop] = _score_chunk(
+            [recs[u] for u in pair_user[start:stop]],
+            indptr[start : stop + 1],
+            relevant,
+            vocab,
+            k,
+            metrics,
+        )["score"]
+
+    by_group = np.argsort(pair_group, kind="stable")
+    bounds = np.concatenate(
+        [[0], np.cumsum(np.bincount(pair_group, minlength=len(keys)))]
+    )
+    results: Dict[Any, float] = {}
+    for code, group_value in enumerate(keys):
+        group_scores = scores[by_group[bounds[code] : bounds[code + 1]]]
+        results[group_value] = (
+            math.fsum(group_scores) / len(group_scores) if len(group_scores) else 0.0
+        )
     return results
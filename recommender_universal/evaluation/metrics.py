@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd  # noqa: F401
-from typing import List, Set, Callable, Protocol  # noqa: F401
+from functools import lru_cache
+from typing import Dict, List, Sequence, Set, Callable, Protocol, Tuple  # noqa: F401
 import math
 
 
@@ -71,3 +73,140 @@ def ndcg_at_k(recommended: list, relevant: set, k: int) -> float:
 
     ideal_dcg = sum(1 / math.log2(i + 2) for i in range(min(len(relevant), k)))
     return dcg / ideal_dcg if ideal_dcg > 0 else 0.0
+
+
+# ----- Vectorized metrics -----
+#
+# `recommended` is an (n_users, k) matrix of item codes, padded with -1, and
+# user u's relevant item codes are indices[indptr[u]:indptr[u + 1]]. Each
+# metric is derived from one boolean hit matrix and matches the raw
+# function above exactly: running sums are accumulated left to right, and
+# discounts come from the same `math.log2`.
+
+BATCH_METRICS = ("hit_rate", "precision", "recall", "map", "ndcg")
+
+
+@lru_cache(maxsize=None)
+def _discounts(k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rank discounts 1 / log2(i + 2) for i < k, and ideal DCGs, where
+    ideal[m] is the DCG of m relevant items at the top. Read-only.
+    """
+    discount = np.array([1 / math.log2(i + 2) for i in range(k)], dtype=np.float64)
+    ideal = np.concatenate([[0.0], np.cumsum(discount)])
+    discount.flags.writeable = False
+    ideal.flags.writeable = False
+    return discount, ideal
+
+
+def _running_total(values: np.ndarray) -> np.ndarray:
+    """Left-to-right row sums (np.sum may sum pairwise)."""
+    if values.shape[1] == 0:
+        return np.zeros(len(values), dtype=np.float64)
+    return np.cumsum(values, axis=1)[:, -1]
+
+
+def hit_matrix(
+    recommended: np.ndarray, indptr: np.ndarray, indices: np.ndarray
+) -> np.ndarray:
+    """Boolean matrix: is recommended[u, j] relevant to user u."""
+    recommended = np.asarray(recommended, dtype=np.int64)
+    n_users = len(recommended)
+    width = int(max(indices.max(initial=-1), recommended.max(initial=-1))) + 1
+    owners = np.repeat(np.arange(n_users, dtype=np.int64), np.diff(indptr))
+    relevant = np.sort(owners * width + indices)
+    if len(relevant) == 0:
+        return np.zeros(recommended.shape, dtype=bool)
+    keys = np.arange(n_users, dtype=np.int64)[:, None] * width + recommended
+    pos = np.minimum(np.searchsorted(relevant, keys), len(relevant) - 1)
+    return (recommended >= 0) & (relevant[pos] == keys)
+
+
+def _first_occurrences(recommended: np.ndarray) -> np.ndarray:
+    """Mask of the first position of each distinct item in every row."""
+    order = np.argsort(recommended, axis=1, kind="stable")
+    ranked = np.take_along_axis(recommended, order, axis=1)
+    first_sorted = np.ones(recommended.shape, dtype=bool)
+    first_sorted[:, 1:] = ranked[:, 1:] != ranked[:, :-1]
+    first = np.empty_like(first_sorted)
+    np.put_along_axis(first, order, first_sorted, axis=1)
+    return first
+
+
+def batch_metrics_at_k(
+    recommended: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    k: int,
+    metrics: Sequence[str] = BATCH_METRICS,
+) -> Dict[str, np.ndarray]:
+    """
+    Per-user metrics for a whole matrix of recommendations at once.
+
+    :param recommended: (n_users, >= k or fewer) item codes, -1 padded.
+    :param indptr: CSR row pointers of the relevant items (n_users + 1).
+    :param indices: Relevant item codes; duplicates within a row are
+                    counted once, like the set given to the raw metrics.
+    :param k: Cutoff.
+    :param metrics: Subset of `BATCH_METRICS` to compute.
+    :return: dict mapping each metric name → array of per-user scores
+    """
+    unknown = set(metrics) - set(BATCH_METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics {sorted(unknown)}; use {BATCH_METRICS}")
+
+    recommended = np.asarray(recommended, dtype=np.int64)[:, : max(k, 0)]
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    n_users, width = recommended.shape
+
+    # Distinct relevant items per user
+    owners = np.repeat(np.arange(n_users, dtype=np.int64), np.diff(indptr))
+    span = int(indices.max(initial=-1)) + 1
+    pairs = np.unique(owners * span + indices)
+    n_relevant = np.bincount(pairs // max(span, 1), minlength=n_users)
+
+    hits = hit_matrix(recommended, indptr, indices)
+    n_hits = hits.sum(axis=1)
+    results: Dict[str, np.ndarray] = {}
+
+    if "hit_rate" in metrics:
+        results["hit_rate"] = (n_hits > 0).astype(np.float64)
+
+    if "precision" in metrics or "recall" in metrics:
+        distinct_hits = (hits & _first_occurrences(recommended)).sum(axis=1)
+        if "precision" in metrics:
+            results["precision"] = (
+                distinct_hits / k if k > 0 else np.zeros(n_users, dtype=np.float64)
+            )
+        if "recall" in metrics:
+            results["recall"] = np.divide(
+                distinct_hits,
+                n_relevant,
+                out=np.zeros(n_users, dtype=np.float64),
+                where=n_relevant > 0,
+            )
+
+    if "map" in metrics:
+        ranks = np.arange(1, width + 1)
+        precisions = np.where(hits, np.cumsum(hits, axis=1) / ranks, 0.0)
+        denominator = np.minimum(n_relevant, k)
+        results["map"] = np.divide(
+            _running_total(precisions),
+            denominator,
+            out=np.zeros(n_users, dtype=np.float64),
+            where=denominator > 0,
+        )
+
+    if "ndcg" in metrics:
+        discount, ideal = _discounts(max(k, 0))
+        dcg = _running_total(np.where(hits, discount[:width], 0.0))
+        ideal_dcg = ideal[np.minimum(n_relevant, max(k, 0))]
+        results["ndcg"] = np.divide(
+            dcg,
+            ideal_dcg,
+            out=np.zeros(n_users, dtype=np.float64),
+            where=ideal_dcg > 0,
+        )
+
+    return results
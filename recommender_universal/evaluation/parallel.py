@@ -0,0 +1,189 @@
+"""
+Multi-process evaluation.
+
+The model is written once to a temporary directory, as a pickle-free
+array artifact when possible (otherwise with joblib), and every worker
+process loads it once with its arrays memory-mapped. Workers therefore
+share the factor matrices through the OS page cache instead of receiving
+a pickled copy of the model with each task. Only the test users and
+their relevant items are sent per shard.
+"""
+
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from recommender_universal.evaluation.batch_eval import (
+    MetricFn,
+    _ground_truth,
+    _recommend_all,
+    _relevance,
+    _score_chunk,
+)
+from recommender_universal.utils.artifacts import load_artifact, save_artifact
+
+# Per-process state set by `_init_worker`
+_worker: Dict[str, Any] = {}
+
+
+def exact_partials(values: Sequence[float]) -> List[float]:
+    """
+    Non-overlapping floats whose exact sum is the exact sum of `values`,
+    so that `math.fsum` over the partials of several shards equals
+    `math.fsum` over all their values, however they were split.
+    """
+    partials: List[float] = []
+    while True:
+        residual = math.fsum([*values, *(-p for p in partials)])
+        if residual == 0.0:
+            return partials
+        partials.append(residual)
+
+
+def _export_model(model: Any, directory: Path) -> Tuple[str, str]:
+    """Write `model` where workers can memory-map it; return (format, path)."""
+    artifact_dir = directory / "model"
+    try:
+        save_artifact(model, artifact_dir)
+        return "npy", str(artifact_dir)
+    except TypeError:
+        shutil.rmtree(artifact_dir, ignore_errors=True)
+    path = directory / "model.joblib"
+    joblib.dump(model, path)
+    return "joblib", str(path)
+
+
+def _init_worker(
+    model_format: str,
+    model_path: str,
+    vocab: Optional[pd.Index],
+    metrics: Mapping[str, MetricFn],
+    batch_size: int,
+) -> None:
+    if model_format == "npy":
+        model = load_artifact(Path(model_path), mmap=True)
+    else:
+        model = joblib.load(model_path, mmap_mode="r")
+    _worker.update(model=model, vocab=vocab, metrics=metrics, batch_size=batch_size)
+
+
+def _evaluate_shard(
+    users: np.ndarray, indptr: np.ndarray, relevant: Any, ks: Sequence[int]
+) -> Dict[int, Dict[str, List[float]]]:
+    """
+    Exact partial sums of every metric at every cutoff over one shard.
+    Recommendations are requested once, at the largest cutoff, and each
+    smaller cutoff scores their prefix.
+    """
+    batch_size = _worker["batch_size"]
+    scores: Dict[int, Dict[str, List[np.ndarray]]] = {
+        k: {name: [] for name in _worker["metrics"]} for k in ks
+    }
+    for start in range(0, len(users), batch_size):
+        stop = min(start + batch_size, len(users))
+        recs = _recommend_all(_worker["model"], users[start:stop], max(ks), batch_size)
+        for k in ks:
+            chunk = _score_chunk(
+                recs,
+                indptr[start : stop + 1],
+                relevant,
+                _worker["vocab"],
+                k,
+                _worker["metrics"],
+            )
+            for name, values in chunk.items():
+                scores[k][name].append(values)
+    return {
+        k: {
+            name: exact_partials(np.concatenate(parts).tolist()) if parts else []
+            for name, parts in by_name.items()
+        }
+        for k, by_name in scores.items()
+    }
+
+
+def parallel_evaluate(
+    df: pd.DataFrame,
+    model: Any,
+    ks: Sequence[int],
+    metrics: Mapping[str, MetricFn],
+    user_col: str = "user_id",
+    item_col: str = "item_id",
+    n_jobs: Optional[int] = None,
+    shard_size: Optional[int] = None,
+    batch_size: int = 10_000,
+) -> Dict[int, Dict[str, float]]:
+    """
+    Average several metrics at several cutoffs over all users in df,
+    sharding the users across worker processes.
+
+    Results equal `evaluate_metrics` at each cutoff for any `n_jobs`,
+    provided the model's top-k lists are prefixes of its longer lists
+    (true for score-ranked models): per-shard sums are reduced exactly.
+
+    :param ks: Cutoffs to evaluate.
+    :param metrics: Metric name -> metric_fn; must be picklable
+                    (module-level functions).
+    :param n_jobs: Worker processes (default: all CPUs); 1 runs in-process
+                   without exporting the model.
+    :param shard_size: Users per task (default: about 4 shards per worker).
+    :param batch_size: Users per `recommend_batch` call within a shard.
+    :return: dict mapping each k → {metric name → mean over users}
+    """
+    ks = sorted(set(ks))
+    if not ks or ks[0] < 1:
+        raise ValueError("ks must be a non-empty list of positive cutoffs")
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    elif n_jobs < 1:
+        raise ValueError("n_jobs must be a positive integer or None")
+
+    users, indptr, items = _ground_truth(df, user_col, item_col)
+    relevant, vocab = _relevance(items, metrics)
+    if shard_size is None:
+        shard_size = max(1, -(-len(users) // (4 * n_jobs)))
+
+    def shard(start: int) -> Tuple[np.ndarray, np.ndarray, Any, Sequence[int]]:
+        stop = min(start + shard_size, len(users))
+        lo, hi = indptr[start], indptr[stop]
+        return users[start:stop], indptr[start : stop + 1] - lo, relevant[lo:hi], ks
+
+    shards = [shard(start) for start in range(0, len(users), shard_size)]
+    totals: Dict[int, Dict[str, List[float]]] = {
+        k: {name: [] for name in metrics} for k in ks
+    }
+
+    if n_jobs == 1 or len(shards) <= 1:
+        _worker.update(model=model, vocab=vocab, metrics=metrics, batch_size=batch_size)
+        try:
+            results = [_evaluate_shard(*args) for args in shards]
+        finally:
+            _worker.clear()
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            with ProcessPoolExecutor(
+                max_workers=min(n_jobs, len(shards)),
+                initializer=_init_worker,
+                initargs=(*_export_model(model, Path(tmp)), vocab, metrics, batch_size),
+            ) as pool:
+                results = list(pool.map(_evaluate_shard, *zip(*shards)))
+
+    for result in results:
+        for k, by_name in result.items():
+            for name, partials in by_name.items():
+                totals[k][name].extend(partials)
+    return {
+        k: {
+            name: math.fsum(partials) / len(users) if len(users) else 0.0
+            for name, partials in by_name.items()
+        }
+        for k, by_name in totals.items()
+    }
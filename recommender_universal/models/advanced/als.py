@@ -0,0 +1,250 @@
+import os
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.linalg import cho_factor, cho_solve
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Sequence
+from recommender_universal.models.advanced.factor_model import FactorModel
+from recommender_universal.models.registry import register
+from recommender_universal.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SOLVERS = ("cg", "cholesky")
+
+
+@register("als")
+class AlternatingLeastSquares(FactorModel):
+    """
+    Implicit-feedback ALS (Hu, Koren & Volinsky, 2008).
+
+    Every interaction with a positive rating r becomes a preference of 1
+    with confidence c = 1 + alpha * r. Each half-step fixes one side and
+    solves, for every row x of the other side,
+
+        (Y^T C Y + regularization * I) x = Y^T C p
+
+    using Y^T C Y = Y^T Y + Y^T (C - I) Y, so only the observed entries
+    of a row contribute beyond the shared Gram matrix.
+    """
+
+    def __init__(
+        self,
+        user_col: str = "user_id",
+        item_col: str = "item_id",
+        rating_col: str = "rating",
+        factors: int = 10,
+        regularization: float = 0.01,
+        alpha: float = 40.0,
+        iterations: int = 15,
+        solver: str = "cg",
+        cg_steps: int = 3,
+        block_size: int = 4096,
+        n_threads: Optional[int] = None,
+        random_state: Optional[int] = None,
+        verbose: bool = False,
+    ) -> None:
+        """
+        :param regularization: L2 penalty on the factors.
+        :param alpha: Confidence scaling applied to the ratings.
+        :param iterations: Number of full (user + item) sweeps.
+        :param solver: "cg" for a few warm-started conjugate-gradient steps
+                       per row (O(nnz * factors) per half-step), or
+                       "cholesky" for an exact per-row solve.
+        :param cg_steps: Conjugate-gradient steps per row and half-step.
+        :param block_size: Rows solved together by one worker.
+        :param n_threads: Worker threads (default: number of CPUs).
+        :param random_state: Seed for the factor initialisation.
+        :param verbose: If True, log every `recommend` call.
+        """
+        if solver not in SOLVERS:
+            raise ValueError(f"solver must be one of {SOLVERS}, got '{solver}'")
+
+        super().__init__(user_col, item_col, rating_col, factors, verbose)
+        self.regularization = regularization
+        self.alpha = alpha
+        self.iterations = iterations
+        self.solver = solver
+        self.cg_steps = cg_steps
+        self.block_size = block_size
+        self.n_threads = n_threads
+        self.random_state = random_state
+
+    def fit(self, df: pd.DataFrame) -> "AlternatingLeastSquares":
+        user_idx, item_idx, ratings = self._encode(df)
+        num_users = len(self.user_map)
+        num_items = len(self.item_map)
+
+        # Confidence matrix, built once; duplicate pairs are summed.
+        positive = ratings > 0
+        confidence = sp.csr_matrix(
+            (
+                1.0 + self.alpha * ratings[positive],
+                (user_idx[positive], item_idx[positive]),
+            ),
+            shape=(num_users, num_items),
+            dtype=np.float32,
+        )
+        confidence.sum_duplicates()
+        confidence_t = confidence.T.tocsr()
+
+        rng = np.random.default_rng(self.random_state)
+        scale = np.float32(0.01)
+        self.user_factors = (
+            rng.standard_normal((num_users, self.factors), dtype=np.float32) * scale
+        )
+        self.item_factors = (
+            rng.standard_normal((num_items, self.factors), dtype=np.float32) * scale
+        )
+
+        logger.info(
+            "Training ALS (%s) for %d iterations on %d users x %d items, nnz=%d",
+            self.solver,
+            self.iterations,
+            num_users,
+            num_items,
+            confidence.nnz,
+        )
+
+        workers = self.n_threads or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for _ in range(self.iterations):
+                self._half_step(pool, confidence, self.user_factors, self.item_factors)
+                self._half_step(
+                    pool, confidence_t, self.item_factors, self.user_factors
+                )
+
+        return self
+
+    def fold_in(
+        self,
+        user_id: Any,
+        item_ids: Sequence[Any],
+        ratings: Optional[Sequence[float]] = None,
+        regularization: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Give a user a factor vector from their interactions without
+        retraining, by the same solve as a user half-step of `fit`: with
+        confidences c = 1 + alpha * r on the interacted items (positive
+        ratings, duplicates summed) and preference 0 everywhere else,
+
+            (Y^T Y + Y_u^T (C_u - I) Y_u + regularization * I) x = Y_u^T C_u p_u
+
+        New users are added to the model (and their history stored);
+        existing users have their vector replaced.
+
+        :param user_id: ID of the (usually new) user.
+        :param item_ids: Items the user interacted with; unknown ones are
+                         ignored.
+        :param ratings: Rating per item (default: 1.0 each).
+        :param regularization: L2 penalty (default: `self.regularization`).
+        :return: The user's factor vector.
+        """
+        if regularization is None:
+            regularization = self.regularization
+        return super().fold_in(user_id, item_ids, ratings, regularization)
+
+    def _fold_in_vector(
+        self, rows: np.ndarray, targets: np.ndarray, regularization: float
+    ) -> np.ndarray:
+        assert self.item_factors is not None
+        y = self.item_factors.astype(np.float64)
+        positive = targets > 0
+        cols, inverse = np.unique(rows[positive], return_inverse=True)
+        conf = np.bincount(
+            inverse, weights=1.0 + self.alpha * targets[positive], minlength=len(cols)
+        )
+        y_obs = y[cols]
+        a = (
+            y.T @ y
+            + (y_obs.T * (conf - 1.0)) @ y_obs
+            + regularization * np.eye(self.factors)
+        )
+        return np.linalg.solve(a, y_obs.T @ conf)
+
+    def _half_step(
+        self,
+        pool: ThreadPoolExecutor,
+        confidence: sp.csr_matrix,
+        x: np.ndarray,
+        y: np.ndarray,
+    ) -> None:
+        """Update every row of `x` in place, holding `y` fixed."""
+        gram = y.T @ y
+        blocks = range(0, x.shape[0], self.block_size)
+        solve = self._solve_cg if self.solver == "cg" else self._solve_cholesky
+        futures = [
+            pool.submit(solve, confidence, x, y, gram, start) for start in blocks
+        ]
+        for future in futures:
+            future.result()
+
+    def _solve_cg(
+        self,
+        confidence: sp.csr_matrix,
+        x: np.ndarray,
+        y: np.ndarray,
+        gram: np.ndarray,
+        start: int,
+    ) -> None:
+        """
+        Run `cg_steps` of conjugate gradient for a block of rows at once,
+        warm-started from the current factors. Each step costs one GEMM
+        against the Gram matrix plus O(nnz * factors) for the observed
+        entries of the block.
+        """
+        stop = min(start + self.block_size, x.shape[0])
+        block = confidence[start:stop]
+        rows = np.repeat(np.arange(stop - start), np.diff(block.indptr))
+        y_obs = y[block.indices]
+        reg = np.float32(self.regularization)
+
+        def apply(v: np.ndarray) -> np.ndarray:
+            # (Y^T Y + Y^T (C - I) Y + reg * I) v for every row v
+            weights = (block.data - 1.0) * np.einsum("ij,ij->i", v[rows], y_obs)
+            sparse_part = sp.csr_matrix(
+                (weights, block.indices, block.indptr), shape=block.shape
+            )
+            return v @ gram + sparse_part @ y + reg * v
+
+        xb = x[start:stop]  # view: updates land in x directly
+        # Y^T C p, with p = 1 on observed entries
+        residual = block @ y - apply(xb)
+        direction = residual.copy()
+        rs_old = np.einsum("ij,ij->i", residual, residual)
+
+        for _ in range(self.cg_steps):
+            ad = apply(direction)
+            denom = np.einsum("ij,ij->i", direction, ad)
+            step = np.divide(rs_old, denom, out=np.zeros_like(rs_old), where=denom > 0)
+            xb += step[:, None] * direction
+            residual -= step[:, None] * ad
+            rs_new = np.einsum("ij,ij->i", residual, residual)
+            beta = np.divide(
+                rs_new, rs_old, out=np.zeros_like(rs_new), where=rs_old > 0
+            )
+            direction = residual + beta[:, None] * direction
+            rs_old = rs_new
+
+    def _solve_cholesky(
+        self,
+        confidence: sp.csr_matrix,
+        x: np.ndarray,
+        y: np.ndarray,
+        gram: np.ndarray,
+        start: int,
+    ) -> None:
+        """Exact closed-form solve of each row's regularized system."""
+        stop = min(start + self.block_size, x.shape[0])
+        base = gram + self.regularization * np.eye(self.factors, dtype=gram.dtype)
+        indptr, indices, data = confidence.indptr, confidence.indices, confidence.data
+
+        for row in range(start, stop):
+            cols = indices[indptr[row] : indptr[row + 1]]
+            conf = data[indptr[row] : indptr[row + 1]]
+            y_obs = y[cols]
+            a = base + (y_obs.T * (conf - 1.0)) @ y_obs
+            b = y_obs.T @ conf
+            x[row] = cho_solve(cho_factor(a), b)
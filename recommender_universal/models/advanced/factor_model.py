@@ -0,0 +1,425 @@
+import numpy as np
+import pandas as pd
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+from recommender_universal.models.base import BaseRecommender
+from recommender_universal.models.retrieval import BaseIndex, IVFIndex
+from recommender_universal.utils.topk import top_k_indices
+from recommender_universal.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from recommender_universal.data.transforms.encoding import IdEncoder
+
+logger = get_logger(__name__)
+
+
+class FactorModel(BaseRecommender):
+    """
+    Shared state and retrieval for latent-factor models, which score
+    a user-item pair as the dot product of their factor vectors.
+
+    Subclasses implement `fit` and fill `user_factors` / `item_factors`
+    (rows indexed through `user_map` / `item_map`). `item_ids` is the
+    reverse of `item_map` as a dense array (row index -> raw item ID).
+
+    After fitting, `build_index` attaches an approximate retrieval index
+    that `recommend` / `recommend_batch` use unless `exact=True`.
+
+    Fitting also records which items each user interacted with as a CSR
+    structure: user row u saw `seen_indices[seen_indptr[u]:seen_indptr[u+1]]`.
+
+    With `use_encoder`, training data comes pre-encoded by an `IdEncoder`
+    and the encoder's codes are the factor rows.
+    """
+
+    def __init__(
+        self,
+        user_col: str = "user_id",
+        item_col: str = "item_id",
+        rating_col: str = "rating",
+        factors: int = 10,
+        verbose: bool = False,
+    ) -> None:
+        """
+        :param verbose: If True, log every `recommend` call.
+        """
+        self.user_col = user_col
+        self.item_col = item_col
+        self.rating_col = rating_col
+        self.factors = factors
+        self.verbose = verbose
+
+        self.user_map: Dict[Any, int] = {}
+        self.item_map: Dict[Any, int] = {}
+        self.item_ids: np.ndarray = np.empty(0, dtype=object)
+        self.user_factors: Optional[np.ndarray] = None
+        self.item_factors: Optional[np.ndarray] = None
+        self.index: Optional[BaseIndex] = None
+        self.seen_indptr: Optional[np.ndarray] = None
+        self.seen_indices: Optional[np.ndarray] = None
+        self.encoder: Optional["IdEncoder"] = None
+
+    def use_encoder(self, encoder: "IdEncoder") -> "FactorModel":
+        """
+        Train on frames already encoded by `encoder` (its `transform`
+        output): the user and item columns hold its int32 codes, which are
+        used as factor rows directly instead of factorizing the columns.
+        The ID maps are filled from the encoder's vocabularies, and ID
+        lookups in `recommend_batch` / `score` use their hash indexes. The
+        encoder is saved with the model.
+
+        :return: self
+        """
+        self.encoder = encoder
+        return self
+
+    def _encoded_columns(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        assert self.encoder is not None
+        user_idx = df[self.user_col].to_numpy(dtype=np.int32)
+        item_idx = df[self.item_col].to_numpy(dtype=np.int32)
+        if (user_idx < 0).any() or (item_idx < 0).any():
+            raise ValueError("Encoded training data contains unknown IDs (-1)")
+        return user_idx, item_idx
+
+    @staticmethod
+    def _sync_ids(mapping: Dict[Any, int], ids: np.ndarray) -> None:
+        """Append `ids[len(mapping):]` to `mapping` as rows len(mapping)...."""
+        start = len(mapping)
+        mapping.update(zip(ids[start:].tolist(), range(start, len(ids))))
+
+    def _encode(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the id maps and interaction history, and turn the
+        interaction columns into arrays. Drops any previously built index.
+
+        :return: (user indices int32, item indices int32, ratings float32)
+        """
+        if self.encoder is not None:
+            user_idx, item_idx = self._encoded_columns(df)
+            self.user_map, self.item_map = {}, {}
+            self._sync_ids(self.user_map, self.encoder.users.values)
+            self._sync_ids(self.item_map, self.encoder.items.values)
+            self.item_ids = np.array(self.encoder.items.values)
+            self.index = None
+            self._build_history(user_idx, item_idx)
+            return user_idx, item_idx, df[self.rating_col].to_numpy(dtype=np.float32)
+
+        user_codes, users = pd.factorize(df[self.user_col])
+        item_codes, items = pd.factorize(df[self.item_col])
+
+        self.user_map = {u: i for i, u in enumerate(users)}
+        self.item_map = {i: j for j, i in enumerate(items)}
+        self.item_ids = items.to_numpy()
+        self.index = None
+
+        user_idx = user_codes.astype(np.int32)
+        item_idx = item_codes.astype(np.int32)
+        self._build_history(user_idx, item_idx)
+
+        return user_idx, item_idx, df[self.rating_col].to_numpy(dtype=np.float32)
+
+    @staticmethod
+    def _extend_ids(mapping: Dict[Any, int], values: pd.Series) -> np.ndarray:
+        """
+        Rows of `values` in `mapping`, appending unseen IDs to it in
+        first-seen order. Only the distinct values are hashed in Python.
+        """
+        codes, uniques = pd.factorize(values)
+        rows = np.fromiter(
+            (mapping.get(u, -1) for u in uniques), dtype=np.int64, count=len(uniques)
+        )
+        new = np.flatnonzero(rows < 0)
+        rows[new] = np.arange(len(mapping), len(mapping) + len(new))
+        mapping.update(zip(uniques[new].tolist(), rows[new].tolist()))
+        return rows[codes].astype(np.int32)
+
+    def _encode_incremental(
+        self, df: pd.DataFrame, init_scale: float = 0.1
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Like `_encode`, but keeps the existing ID rows and factors. Unseen
+        users and items are appended to the maps and get new factor rows
+        drawn from N(0, init_scale); their interactions are merged into the
+        history. Existing factors are copied first if they are read-only
+        (e.g. memory-mapped).
+        """
+        assert self.user_factors is not None and self.item_factors is not None
+        n_items = len(self.item_map)
+        if self.encoder is not None:
+            # IDs the encoder appended since the last fit get the next rows
+            user_idx, item_idx = self._encoded_columns(df)
+            self._sync_ids(self.user_map, self.encoder.users.values)
+            self._sync_ids(self.item_map, self.encoder.items.values)
+        else:
+            user_idx = self._extend_ids(self.user_map, df[self.user_col])
+            item_idx = self._extend_ids(self.item_map, df[self.item_col])
+
+        new_items = list(self.item_map)[n_items:]
+        if new_items:
+            self.item_ids = np.concatenate(
+                [self.item_ids, pd.Index(new_items).to_numpy()]
+            )
+        self.user_factors = self._grow(
+            self.user_factors, len(self.user_map), init_scale
+        )
+        self.item_factors = self._grow(
+            self.item_factors, len(self.item_map), init_scale
+        )
+        self._build_history(user_idx, item_idx, merge=True)
+
+        return user_idx, item_idx, df[self.rating_col].to_numpy(dtype=np.float32)
+
+    @staticmethod
+    def _writable(array: np.ndarray) -> np.ndarray:
+        return array if array.flags.writeable else np.array(array)
+
+    def _grow(self, factors: np.ndarray, n_rows: int, init_scale: float) -> np.ndarray:
+        """Append randomly initialised rows up to `n_rows`; ensure writable."""
+        extra = n_rows - len(factors)
+        if extra > 0:
+            new_rows = np.random.normal(0, init_scale, (extra, self.factors))
+            return np.vstack([factors, new_rows.astype(factors.dtype)])
+        return self._writable(factors)
+
+    def _build_history(
+        self, user_idx: np.ndarray, item_idx: np.ndarray, merge: bool = False
+    ) -> None:
+        """
+        Store the distinct (user, item) pairs as int32 CSR arrays.
+
+        :param merge: Keep the pairs already stored (IDs must not have been
+                      renumbered since).
+        """
+        n_users, n_items = len(self.user_map), len(self.item_map)
+        pairs = user_idx.astype(np.int64) * n_items + item_idx
+        if merge and self.seen_indptr is not None and self.seen_indices is not None:
+            old_users = np.repeat(
+                np.arange(len(self.seen_indptr) - 1), np.diff(self.seen_indptr)
+            )
+            old_pairs = old_users * n_items + self.seen_indices
+            pairs = np.concatenate([old_pairs, pairs])
+        pairs = np.unique(pairs)
+        counts = np.bincount(pairs // n_items, minlength=n_users)
+        self.seen_indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+        self.seen_indices = (pairs % n_items).astype(np.int32)
+
+    def _seen(self, user_rows: np.ndarray) -> List[np.ndarray]:
+        """Item rows each of the given user rows has interacted with."""
+        if self.seen_indptr is None or self.seen_indices is None:
+            raise RuntimeError(
+                "No interaction history stored; refit the model to use exclude_seen"
+            )
+        indptr, indices = self.seen_indptr, self.seen_indices
+        return [indices[indptr[u] : indptr[u + 1]] for u in user_rows]
+
+    def fold_in(
+        self,
+        user_id: Any,
+        item_ids: Sequence[Any],
+        ratings: Optional[Sequence[float]] = None,
+        regularization: float = 0.1,
+    ) -> np.ndarray:
+        """
+        Give a user a factor vector from their interactions without
+        retraining: with the item factors Q of the interacted items fixed,
+        solve the ridge regression p = (Q^T Q + regularization * I)^-1 Q^T r.
+        New users are added to the model (and their history stored);
+        existing users have their vector replaced.
+
+        :param user_id: ID of the (usually new) user.
+        :param item_ids: Items the user interacted with; unknown ones are
+                         ignored.
+        :param ratings: Rating per item (default: 1.0 each, for implicit data).
+        :param regularization: L2 penalty of the ridge solve.
+        :return: The user's factor vector.
+        """
+        if self.user_factors is None or self.item_factors is None:
+            raise RuntimeError("Model must be fitted before folding in users")
+        values = np.ones(len(item_ids)) if ratings is None else np.asarray(ratings)
+        known = [
+            (self.item_map[item], value)
+            for item, value in zip(item_ids, values)
+            if item in self.item_map
+        ]
+        if not known:
+            raise ValueError("None of the given items are known to the model")
+        rows = np.array([row for row, _ in known])
+        targets = np.array([value for _, value in known], dtype=np.float64)
+        if user_id not in self.user_map and self.encoder is not None:
+            self._encoder_add_user(user_id)
+        vector = self._fold_in_vector(rows, targets, regularization)
+
+        if user_id not in self.user_map:
+            self.user_map[user_id] = len(self.user_map)
+        u_idx = self.user_map[user_id]
+        self.user_factors = self._grow(self.user_factors, len(self.user_map), 0.0)
+        self.user_factors[u_idx] = vector
+        self._build_history(np.full(len(rows), u_idx), rows, merge=True)
+        return vector
+
+    def _encoder_add_user(self, user_id: Any) -> None:
+        """
+        Append a folded-in user to the encoder too, so that its code stays
+        equal to its factor row.
+        """
+        assert self.encoder is not None
+        users = self.encoder.users
+        code = int(users.lookup([user_id])[0])
+        if code < 0:
+            code = len(users)
+        if code != len(self.user_map):
+            raise ValueError(
+                f"The encoder holds users the model was not trained on, so "
+                f"user {user_id!r} cannot get row {len(self.user_map)}; "
+                "partial_fit them before folding in new users"
+            )
+        users.extend([user_id])
+
+    def _fold_in_vector(
+        self, rows: np.ndarray, targets: np.ndarray, regularization: float
+    ) -> np.ndarray:
+        """Ridge solve of the user vector against the given item rows."""
+        assert self.item_factors is not None
+        q = self.item_factors[rows].astype(np.float64)
+        a = q.T @ q + regularization * np.eye(self.factors)
+        return np.linalg.solve(a, q.T @ targets)
+
+    def _build_item_ids(self) -> None:
+        """Rebuild the index -> item ID array from `item_map`."""
+        self.item_ids = np.empty(len(self.item_map), dtype=object)
+        self.item_ids[list(self.item_map.values())] = list(self.item_map.keys())
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Models pickled before `item_ids` / `verbose` existed
+        self.__dict__.update(state)
+        self.__dict__.setdefault("verbose", False)
+        self.__dict__.setdefault("index", None)
+        self.__dict__.setdefault("seen_indptr", None)
+        self.__dict__.setdefault("seen_indices", None)
+        self.__dict__.setdefault("encoder", None)
+        if "item_ids" not in state:
+            self._build_item_ids()
+
+    def build_index(self, index: Optional[BaseIndex] = None) -> "FactorModel":
+        """
+        Build an approximate retrieval index over the item factors.
+        It is saved with the model and must be rebuilt after refitting.
+
+        :param index: Unbuilt index to use (default: `IVFIndex()`).
+        :return: self
+        """
+        if self.item_factors is None:
+            raise RuntimeError("Model must be fitted before building an index")
+        self.index = (index or IVFIndex()).build(self.item_factors)
+        return self
+
+    def _top_items(
+        self, user_rows: np.ndarray, k: int, exact: bool, exclude_seen: bool
+    ) -> np.ndarray:
+        """
+        Item row indices of the top-k items for each user row, best first,
+        from the index when one is built and `exact` is False, otherwise by
+        brute-force scoring. With `exclude_seen`, each user's history is
+        masked out of the scores before top-k selection. Rows may be padded
+        with -1.
+        """
+        assert self.user_factors is not None and self.item_factors is not None
+        queries = self.user_factors[user_rows]
+        seen = self._seen(user_rows) if exclude_seen else None
+        if self.index is not None and not exact:
+            return self.index.search(queries, k, exclude=seen)
+
+        scores = queries @ self.item_factors.T
+        if seen is None:
+            return top_k_indices(scores, k)
+        rows = np.repeat(np.arange(len(seen)), [len(s) for s in seen])
+        scores[rows, np.concatenate(seen)] = -np.inf
+        top = top_k_indices(scores, k)
+        top[np.take_along_axis(scores, top, axis=1) == -np.inf] = -1
+        return top
+
+    def recommend(
+        self,
+        user_id: int,
+        k: int = 5,
+        exact: bool = False,
+        exclude_seen: bool = False,
+    ) -> List[Any]:
+        """
+        :param exact: If True, score every item even when an index is built.
+        :param exclude_seen: If True, never return items the user interacted
+                             with during fit.
+        """
+        if user_id not in self.user_map:
+            return []
+
+        u_idx = self.user_map[user_id]
+
+        if self.verbose:
+            logger.info("Generating recommendations for user_id=%s", user_id)
+
+        top_indices = self._top_items(np.array([u_idx]), k, exact, exclude_seen)[0]
+        return self.item_ids[top_indices[top_indices >= 0]].tolist()
+
+    def _rows(
+        self, mapping: Dict[Any, int], ids: Sequence[Any], users: bool
+    ) -> np.ndarray:
+        """Rows of the given IDs, -1 for unknown ones."""
+        if self.encoder is not None:
+            vocab = self.encoder.users if users else self.encoder.items
+            rows = vocab.lookup(list(ids)).astype(np.int64)
+            # The encoder may know IDs added after the model was fitted
+            rows[rows >= len(mapping)] = -1
+            return rows
+        return np.fromiter(
+            (mapping.get(i, -1) for i in ids), dtype=np.int64, count=len(ids)
+        )
+
+    def score(self, user_id: Any, item_ids: Sequence[Any]) -> np.ndarray:
+        """
+        Predicted preference (dot product of factors) of the user for each
+        item; -inf for unknown users and items.
+        """
+        scores = np.full(len(item_ids), -np.inf)
+        if user_id not in self.user_map:
+            return scores
+        assert self.user_factors is not None and self.item_factors is not None
+        rows = self._rows(self.item_map, item_ids, users=False)
+        known = rows >= 0
+        user_vector = self.user_factors[self.user_map[user_id]]
+        scores[known] = self.item_factors[rows[known]] @ user_vector
+        return scores
+
+    def recommend_batch(
+        self,
+        user_ids: Sequence[Any],
+        k: int = 5,
+        chunk_size: int = 1024,
+        exact: bool = False,
+        exclude_seen: bool = False,
+    ) -> List[List[Any]]:
+        """
+        Score users `chunk_size` at a time with one matrix product per chunk
+        and pick each row's top-k with `argpartition`. Peak memory is
+        O(chunk_size * n_items) regardless of how many users are passed.
+        Unknown users get an empty list.
+
+        :param user_ids: IDs of the users to recommend items for.
+        :param k: Number of items to recommend per user.
+        :param chunk_size: Users scored per matrix product.
+        :param exact: If True, score every item even when an index is built.
+        :param exclude_seen: If True, never return items a user interacted
+                             with during fit.
+        :return: One list of recommended item IDs per user, in input order.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        rows = self._rows(self.user_map, user_ids, users=True)
+        known = np.flatnonzero(rows >= 0)
+
+        results: List[List[Any]] = [[] for _ in range(len(rows))]
+        for start in range(0, len(known), chunk_size):
+            positions = known[start : start + chunk_size]
+            top = self._top_items(rows[positions], k, exact, exclude_seen)
+            for pos, indices in zip(positions, top):
+                results[pos] = self.item_ids[indices[indices >= 0]].tolist()
+        return results
@@ -1,15 +1,20 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional, List
-from recommender_universal.models.base import BaseRecommender
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from recommender_universal.models.advanced.factor_model import FactorModel
 from recommender_universal.models.registry import register
 from recommender_universal.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from recommender_universal.data.transforms.encoding import IdEncoder
+
 logger = get_logger(__name__)
 
+ENGINES = ("vectorized", "reference")
+
 
 @register("mf")
-class MatrixFactorization(BaseRecommender):
+class MatrixFactorization(FactorModel):
     def __init__(
         self,
         user_col: str = "user_id",
@@ -18,39 +23,120 @@ class MatrixFactorization(BaseRecommender):
         factors: int = 10,
         lr: float = 0.01,
         epochs: int = 10,
+        batch_size: int = 1024,
+        shuffle_seed: Optional[int] = None,
+        engine: str = "vectorized",
+        verbose: bool = False,
+        warm_start: bool = False,
     ) -> None:
-        self.user_col = user_col
-        self.item_col = item_col
-        self.rating_col = rating_col
-        self.factors = factors
+        """
+        :param batch_size: Number of interactions per mini-batch update
+                           (vectorized engine only).
+        :param shuffle_seed: Seed for the per-epoch shuffle of interactions
+                             (vectorized engine only).
+        :param engine: "vectorized" for shuffled mini-batch SGD over index
+                       arrays, or "reference" for the original per-row loop.
+        :param verbose: If True, log every `recommend` call.
+        :param warm_start: If True, refitting a fitted model keeps its ID maps
+                           and factors (extending them for new users and
+                           items) instead of starting from random factors.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {ENGINES}, got '{engine}'")
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        super().__init__(user_col, item_col, rating_col, factors, verbose)
         self.lr = lr
         self.epochs = epochs
-
-        self.user_map: Dict[int, int] = {}
-        self.item_map: Dict[str, int] = {}
-        self.user_factors: Optional[np.ndarray] = None
-        self.item_factors: Optional[np.ndarray] = None
+        self.batch_size = batch_size
+        self.shuffle_seed = shuffle_seed
+        self.engine = engine
+        self.warm_start = warm_start
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Models pickled before the training options existed refit with
+        # the constructor defaults
+        super().__setstate__(state)
+        self.__dict__.setdefault("batch_size", 1024)
+        self.__dict__.setdefault("shuffle_seed", None)
+        self.__dict__.setdefault("engine", "vectorized")
+        self.__dict__.setdefault("warm_start", False)
+
+    def use_encoder(self, encoder: "IdEncoder") -> "MatrixFactorization":
+        if self.engine == "reference":
+            raise NotImplementedError(
+                "The reference engine does not support encoded input"
+            )
+        super().use_encoder(encoder)
+        return self
 
     def fit(self, df: pd.DataFrame) -> "MatrixFactorization":
-        users = df[self.user_col].unique()
-        items = df[self.item_col].unique()
+        if self.warm_start and self.user_factors is not None:
+            return self.partial_fit(df)
 
-        self.user_map = {u: i for i, u in enumerate(users)}
-        self.item_map = {i: j for j, i in enumerate(items)}
+        user_idx, item_idx, ratings = self._encode(df)
 
-        num_users = len(users)
-        num_items = len(items)
+        num_users = len(self.user_map)
+        num_items = len(self.item_map)
 
         self.user_factors = np.random.normal(0, 0.1, (num_users, self.factors))
         self.item_factors = np.random.normal(0, 0.1, (num_items, self.factors))
 
         logger.info(
-            "Training MatrixFactorization for %d epochs on %d rows",
+            "Training MatrixFactorization (%s) for %d epochs on %d rows",
+            self.engine,
             self.epochs,
             len(df),
         )
 
-        for _ in range(self.epochs):
+        if self.engine == "reference":
+            self._fit_reference(df, self.epochs)
+        else:
+            self.user_factors = self.user_factors.astype(np.float32)
+            self.item_factors = self.item_factors.astype(np.float32)
+            self._fit_vectorized(user_idx, item_idx, ratings, self.epochs)
+
+        return self
+
+    def partial_fit(
+        self, df: pd.DataFrame, epochs: Optional[int] = None
+    ) -> "MatrixFactorization":
+        """
+        Continue training on new or changed interactions only. Unseen users
+        and items are added to the ID maps with freshly initialised factor
+        rows; everything else starts from the current factors. A built
+        retrieval index is rebuilt afterwards. On an unfitted model this is
+        the same as `fit`.
+
+        :param df: New or changed interactions.
+        :param epochs: Passes over `df` (default: `self.epochs`).
+        :return: MatrixFactorization instance
+        """
+        if self.user_factors is None:
+            return self.fit(df)
+        epochs = self.epochs if epochs is None else epochs
+        user_idx, item_idx, ratings = self._encode_incremental(df)
+
+        logger.info(
+            "Updating MatrixFactorization (%s) for %d epochs on %d rows",
+            self.engine,
+            epochs,
+            len(df),
+        )
+
+        if self.engine == "reference":
+            self._fit_reference(df, epochs)
+        else:
+            self._fit_vectorized(user_idx, item_idx, ratings, epochs)
+
+        if self.index is not None:
+            self.build_index(self.index)
+        return self
+
+    def _fit_reference(self, df: pd.DataFrame, epochs: int) -> None:
+        """Original per-row SGD, kept to check the vectorized engine against."""
+        for _ in range(epochs):
             for _, row in df.iterrows():
                 u_id = self.user_map[row[self.user_col]]
                 i_id = self.item_map[row[self.item_col]]
@@ -64,19 +150,34 @@ class MatrixFactorization(BaseRecommender):
                 self.user_factors[u_id] += self.lr * err * self.item_factors[i_id]
                 self.item_factors[i_id] += self.lr * err * self.user_factors[u_id]
 
-        return self
-
-    def recommend(self, user_id: int, k: int = 5) -> List[str]:
-        if user_id not in self.user_map:
-            return []
-
-        u_idx = self.user_map[user_id]
+    def _fit_vectorized(
+        self,
+        user_idx: np.ndarray,
+        item_idx: np.ndarray,
+        ratings: np.ndarray,
+        epochs: int,
+    ) -> None:
+        """
+        Shuffled mini-batch SGD. Each batch computes all errors from the
+        current factors and applies the updates with scatter-adds, so users
+        or items that repeat within a batch accumulate their gradients.
+        """
         assert self.user_factors is not None and self.item_factors is not None
-
-        logger.info("Generating recommendations for user_id=%s", user_id)
-
-        scores = np.dot(self.user_factors[u_idx], self.item_factors.T)
-        top_indices = np.argsort(scores)[::-1][:k]
-
-        reverse_item_map = {v: k for k, v in self.item_map.items()}
-        return [reverse_item_map[i] for i in top_indices]
+        rng = np.random.default_rng(self.shuffle_seed)
+        lr = np.float32(self.lr)
+        n = len(ratings)
+
+        for _ in range(epochs):
+            order = rng.permutation(n)
+            for start in range(0, n, self.batch_size):
+                batch = order[start : start + self.batch_size]
+                u = user_idx[batch]
+                i = item_idx[batch]
+
+                p = self.user_factors[u]
+                q = self.item_factors[i]
+                err = ratings[batch] - np.einsum("ij,ij->i", p, q)
+                step = (lr * err)[:, None]
+
+                np.add.at(self.user_factors, u, step * q)
+                np.add.at(self.item_factors, i, step * p)
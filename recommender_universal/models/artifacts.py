@@ -0,0 +1,12 @@
+"""
+Pickle-free model artifacts; see `recommender_universal.utils.artifacts`.
+"""
+
+from recommender_universal.utils.artifacts import (  # noqa: F401
+    ARRAYS_DIR,
+    FORMAT_VERSION,
+    MANIFEST,
+    is_artifact,
+    load_artifact,
+    save_artifact,
+)
@@ -1,13 +1,21 @@
+import numpy as np
 import pandas as pd
 import joblib
 import dill
 import json
 import os  # noqa: F401
+import shutil
 from datetime import datetime, timezone
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, List, Dict, Any, Optional
+from typing import Generic, TypeVar, List, Dict, Any, Iterable, Optional, Sequence
 from pathlib import Path  # noqa: F401
 
+from recommender_universal.utils.artifacts import (
+    is_artifact,
+    load_artifact,
+    save_artifact,
+)
+
 T = TypeVar("T")
 
 
@@ -27,6 +35,66 @@ class BaseRecommender(ABC, Generic[T]):
         """
         pass
 
+    def partial_fit(self, df: pd.DataFrame) -> "BaseRecommender":
+        """
+        Update a fitted model with new interactions instead of refitting.
+
+        :param df: New interactions only.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support incremental updates"
+        )
+
+    def fit_chunks(self, chunks: Iterable[pd.DataFrame]) -> "BaseRecommender":
+        """
+        Train on a stream of DataFrames (e.g. `BaseConnector.iter_chunks`)
+        without materializing it: `fit` on the first chunk, `partial_fit`
+        on each later one.
+
+        :param chunks: Interaction chunks, in order.
+        :raises NotImplementedError: If the model has no `partial_fit`.
+        """
+        if type(self).partial_fit is BaseRecommender.partial_fit:
+            raise NotImplementedError(
+                f"{type(self).__name__} does not support incremental updates"
+            )
+        fitted = False
+        for chunk in chunks:
+            if fitted:
+                self.partial_fit(chunk)
+            else:
+                self.fit(chunk)
+                fitted = True
+        if not fitted:
+            raise ValueError("No chunks to fit on")
+        return self
+
+    def score(self, user_id: Any, item_ids: Sequence[Any]) -> np.ndarray:
+        """
+        Score given items for a user; higher means more relevant. Items (or
+        users) the model cannot score get -inf.
+
+        :param user_id: ID of the user.
+        :param item_ids: IDs of the items to score.
+        :return: One float score per item, in input order.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support scoring arbitrary items"
+        )
+
+    def recommend_batch(self, user_ids: Sequence[Any], k: int = 5) -> List[List[T]]:
+        """
+        Recommend k items for each of several users.
+
+        The default calls `recommend` once per user; models that can score
+        many users at once should override it.
+
+        :param user_ids: IDs of the users to recommend items for.
+        :param k: Number of items to recommend per user.
+        :return: One list of recommended item IDs per user, in input order.
+        """
+        return [self.recommend(user_id, k) for user_id in user_ids]
+
     def evaluate(self, test_df: pd.DataFrame) -> float:
         raise NotImplementedError("Evaluation not implemented")
 
@@ -37,12 +105,16 @@ class BaseRecommender(ABC, Generic[T]):
         config: Optional[Dict[str, Any]] = None,
         use_joblib: bool = True,
         use_dill: bool = False,
+        use_npy: bool = False,
     ) -> None:
         """
         Save model with versioning and metadata.
         :param base_dir: str, base directory to save the model.
         :param model_name: str, name under which to save (e.g. "mf")
         :param config: dict, dict of constructor params.
+        :param use_npy: bool, write a pickle-free artifact instead: NumPy
+                        arrays as raw .npy files (ID maps as arrays of their
+                        keys) plus a JSON manifest, loadable with `mmap=True`.
         """
         root = Path(base_dir) / model_name
         root.mkdir(parents=True, exist_ok=True)
@@ -58,7 +130,13 @@ class BaseRecommender(ABC, Generic[T]):
 
         # Save model binary
         model_path = version_dir / ("model.dill" if use_dill else "model.joblib")
-        if use_dill:
+        if use_npy:
+            try:
+                save_artifact(self, version_dir)
+            except Exception:
+                shutil.rmtree(version_dir)
+                raise
+        elif use_dill:
             with open(model_path, "wb") as f:
                 dill.dump(self, f)
         else:
@@ -69,6 +147,7 @@ class BaseRecommender(ABC, Generic[T]):
             "model_name": model_name,
             "version": next_version,
             "timestamp": datetime.now(timezone.utc).isoformat(),
+            "format": "npy" if use_npy else ("dill" if use_dill else "joblib"),
             "config": config,
         }
         with open(version_dir / "config.json", "w") as f:
@@ -83,6 +162,7 @@ class BaseRecommender(ABC, Generic[T]):
         model_name: str,
         version: Optional[int] = None,
         use_dill: bool = False,
+        mmap: bool = False,
     ) -> "BaseRecommender":
         """
         Load a model instance by name and version. If version=None, load latest.
@@ -91,6 +171,10 @@ class BaseRecommender(ABC, Generic[T]):
         :param version: int, specific version to load, or None for latest.
         :param use_dill: bool, whether to use dill for loading
                          (default False, otherwise joblib).
+        :param mmap: bool, memory-map the model's NumPy arrays read-only
+                     instead of reading them into memory (npy and joblib
+                     formats). With the npy format, processes loading the
+                     same version share the arrays' pages.
         :return: An instance of the model class.
         :raises FileNotFoundError: If the model or version does not exist.
         """
@@ -114,11 +198,14 @@ class BaseRecommender(ABC, Generic[T]):
                     f"Version v{version} not found for '{model_name}'"
                 )
 
+        if is_artifact(version_dir):
+            return load_artifact(version_dir, mmap=mmap)
+
         model_path = version_dir / ("model.dill" if use_dill else "model.joblib")
         if use_dill:
             with open(model_path, "rb") as f:
                 instance = dill.load(f)
         else:
-            instance = joblib.load(model_path)
+            instance = joblib.load(model_path, mmap_mode="r" if mmap else None)
 
         return instance
@@ -1,15 +1,151 @@
+from collections import deque
+import numpy as np
 import pandas as pd
-from collections import Counter
+from typing import Any, Deque, Dict, Optional, Sequence, Tuple, Union
 from recommender_universal.models.base import BaseRecommender
 from recommender_universal.models.registry import register
 
 
+def _to_seconds(values: pd.Series) -> np.ndarray:
+    """Timestamps as float seconds; numeric columns are taken as-is."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        epoch = pd.Timestamp(0, tz=values.dt.tz)
+        return ((values - epoch) / pd.Timedelta(seconds=1)).to_numpy(dtype=np.float64)
+    return values.to_numpy(dtype=np.float64)
+
+
+# Rebase decayed scores once the newest event is this many half-lives past
+# the reference time, before the forward-decay weights can overflow.
+_REBASE_HALF_LIVES = 64.0
+
+
 @register("top_popular")
 class TopPopularRecommender(BaseRecommender):
 
-    def __init__(self, item_column: str = "item_id") -> None:
+    def __init__(
+        self,
+        item_column: str = "item_id",
+        time_column: Optional[str] = None,
+        half_life: Optional[Union[str, float, pd.Timedelta]] = None,
+        segment_column: Optional[str] = None,
+        top_n: Optional[int] = None,
+        window: Optional[int] = None,
+    ) -> None:
+        """
+        :param item_column: Column holding item IDs.
+        :param time_column: Timestamp column used for time decay.
+        :param half_life: If set, an interaction's weight halves every
+                          `half_life` before the newest timestamp. A string
+                          or Timedelta (e.g. "6h") for datetime columns, or a
+                          number in the column's own units.
+        :param segment_column: If set, also rank items within each value of
+                               this column (e.g. per country).
+        :param top_n: Length of the maintained ranking, and so the most
+                      items `recommend` returns (default: all items, which
+                      `partial_fit` re-ranks in full on every chunk).
+                      Setting it lets `partial_fit` re-rank only the current
+                      leaders plus the items a chunk touched.
+        :param window: If set, only the last `window` batches (the `fit`
+                       frame and each `partial_fit` chunk) count; older
+                       batches are subtracted as they expire.
+        """
+        if half_life is not None and time_column is None:
+            raise ValueError("half_life requires time_column")
+        if top_n is not None and top_n < 1:
+            raise ValueError("top_n must be a positive integer")
+        if window is not None and window < 1:
+            raise ValueError("window must be a positive integer")
+
         self.item_column = item_column
+        self.time_column = time_column
+        self.half_life = half_life
+        self.segment_column = segment_column
+        self.top_n = top_n
+        self.window = window
+
         self.top_items: list[int] = []
+        self.item_ids: np.ndarray = np.empty(0, dtype=object)
+        self.item_scores: np.ndarray = np.empty(0, dtype=np.float64)
+        # Item rows of top_items, and the reverse of item_ids (built lazily)
+        self.ranked_items: np.ndarray = np.empty(0, dtype=np.int64)
+        self.item_map: Dict[Any, int] = {}
+        # Decay weights are 2^((t - reference_time) / half_life)
+        self.reference_time: Optional[float] = None
+        # (item rows, score contributions) of each batch still in the window
+        self._buckets: Optional[Deque[Tuple[np.ndarray, np.ndarray]]] = None
+        # Upper bound on the score of any item left out of the ranking
+        self._outside_best: Optional[float] = None
+        # Segment s ranks item rows segment_items[segment_offsets[s]:...[s + 1]]
+        self.segment_map: Dict[Any, int] = {}
+        self.segment_offsets: np.ndarray = np.zeros(1, dtype=np.int64)
+        self.segment_items: np.ndarray = np.empty(0, dtype=np.int32)
+
+    def _half_life_units(self) -> float:
+        if isinstance(self.half_life, (str, pd.Timedelta)):
+            return pd.Timedelta(self.half_life).total_seconds()
+        assert self.half_life is not None
+        return float(self.half_life)
+
+    def _weights(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Per-row forward-decay weights relative to `reference_time`. Scores
+        built this way never need rescaling as time passes, except for an
+        occasional rebase that keeps the weights in floating-point range.
+        """
+        if self.half_life is None:
+            return None
+        assert self.time_column is not None
+        times = _to_seconds(df[self.time_column])
+        if len(times) == 0:
+            return times
+        half_life = self._half_life_units()
+        newest = float(times.max())
+        if (
+            self.reference_time is None
+            or newest - self.reference_time > _REBASE_HALF_LIVES * half_life
+        ):
+            self._rebase(newest)
+        assert self.reference_time is not None
+        return np.exp2((times - self.reference_time) / half_life)
+
+    def _rebase(self, reference_time: float) -> None:
+        """Move the decay reference point, rescaling all stored scores."""
+        if self.reference_time is not None:
+            factor = np.exp2(
+                (self.reference_time - reference_time) / self._half_life_units()
+            )
+            self.item_scores *= factor
+            if self._outside_best is not None:
+                self._outside_best *= float(factor)
+            for _, amounts in self._buckets or ():
+                amounts *= factor
+        self.reference_time = reference_time
+
+    def _rank(self, candidates: np.ndarray) -> Optional[float]:
+        """
+        Rank candidate item rows by score, ties in first-seen order, and
+        keep the best `top_n`. Only the candidates at or above the cut-off
+        score are sorted.
+
+        :return: The best score among the candidates left out, if any.
+        """
+        scores = self.item_scores[candidates]
+        n = len(candidates) if self.top_n is None else min(self.top_n, len(candidates))
+        if 0 < n < len(candidates):
+            cutoff = -np.partition(-scores, n - 1)[n - 1]
+            keep = scores >= cutoff
+            below = scores[~keep]
+            candidates, scores = candidates[keep], scores[keep]
+        else:
+            below = scores[:0]
+        order = np.lexsort((candidates, -scores))
+        self.ranked_items = candidates[order[:n]].astype(np.int64)
+        self.top_items = self.item_ids[self.ranked_items].tolist()
+        left_out = np.concatenate([below, scores[order[n:]]])
+        return float(left_out.max()) if len(left_out) else None
+
+    def _rank_all(self) -> None:
+        self._outside_best = self._rank(np.arange(len(self.item_ids)))
 
     def fit(self, df: pd.DataFrame) -> "TopPopularRecommender":
         """
@@ -18,10 +154,171 @@ class TopPopularRecommender(BaseRecommender):
         :param df: user-item interaction matrix
         :return: TopPopularRecommender instance
         """
+        self.reference_time = None
+        self.item_map = {}
+        self._buckets = None if self.window is None else deque()
+
+        codes, items = pd.factorize(df[self.item_column])
+        weights = self._weights(df)
+        valid = codes >= 0
+
+        self.item_ids = items.to_numpy()
+        self.item_scores = np.bincount(
+            codes[valid],
+            weights=None if weights is None else weights[valid],
+            minlength=len(items),
+        ).astype(np.float64)
+        if self._buckets is not None:
+            rows = np.arange(len(items))
+            self._buckets.append((rows, self.item_scores.copy()))
+        self._rank_all()
 
-        counter = Counter(df[self.item_column])
-        self.top_items = [item for item, _ in counter.most_common()]
+        if self.segment_column is not None:
+            self._fit_segments(df, codes, weights)
         return self
 
-    def recommend(self, user_id: int, k: int = 5) -> list[int]:
+    def _fit_segments(
+        self, df: pd.DataFrame, codes: np.ndarray, weights: Optional[np.ndarray]
+    ) -> None:
+        """Grouped bincount over (segment, item) pairs, sorted per segment."""
+        assert self.segment_column is not None
+        seg_codes, segments = pd.factorize(df[self.segment_column])
+        valid = (codes >= 0) & (seg_codes >= 0)
+        n_items = len(self.item_ids)
+
+        pairs = seg_codes[valid].astype(np.int64) * n_items + codes[valid]
+        inverse, unique_pairs = pd.factorize(pairs)
+        pair_scores = np.bincount(
+            inverse, weights=None if weights is None else weights[valid]
+        )
+        seg_of, item_of = np.divmod(unique_pairs, n_items)
+
+        order = np.lexsort((item_of, -pair_scores, seg_of))
+        counts = np.bincount(seg_of, minlength=len(segments))
+        self.segment_map = {s: i for i, s in enumerate(segments)}
+        self.segment_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.segment_items = item_of[order].astype(np.int32)
+
+    def _sync_item_map(self) -> None:
+        """Rebuild `item_map` if `fit` replaced the item vocabulary."""
+        if len(self.item_map) != len(self.item_ids):
+            self.item_map = {item: row for row, item in enumerate(self.item_ids)}
+
+    def _rows_for(self, items: pd.Index) -> np.ndarray:
+        """Item rows for the given IDs, appending unseen IDs to the vocabulary."""
+        self._sync_item_map()
+        rows = np.fromiter(
+            (self.item_map.get(item, -1) for item in items),
+            dtype=np.int64,
+            count=len(items),
+        )
+        new = np.flatnonzero(rows < 0)
+        if len(new):
+            start = len(self.item_ids)
+            rows[new] = np.arange(start, start + len(new))
+            new_ids = items[new].to_numpy()
+            self.item_map.update(zip(new_ids.tolist(), rows[new].tolist()))
+            self.item_ids = np.concatenate([self.item_ids, new_ids])
+            self.item_scores = np.concatenate(
+                [self.item_scores, np.zeros(len(new), dtype=np.float64)]
+            )
+        return rows
+
+    def partial_fit(self, df: pd.DataFrame) -> "TopPopularRecommender":
+        """
+        Merge a chunk of new interactions into the current counts.
+
+        Cost is O(chunk) plus the re-rank: with `top_n` set, only the
+        current leaders and the chunk's items are re-ranked, because no
+        other item's score rose. When a batch leaves the window, leaders'
+        scores may drop; all items are re-ranked (with a partial sort) only
+        if the ranking's last score no longer beats the best score left
+        out of it.
+
+        :param df: New interactions only.
+        :return: TopPopularRecommender instance
+        """
+        if self.segment_column is not None:
+            raise NotImplementedError("partial_fit does not support segment_column")
+
+        codes, items = pd.factorize(df[self.item_column])
+        weights = self._weights(df)
+        valid = codes >= 0
+        amounts = np.bincount(
+            codes[valid],
+            weights=None if weights is None else weights[valid],
+            minlength=len(items),
+        ).astype(np.float64)
+
+        rows = self._rows_for(items)
+        self.item_scores[rows] += amounts
+        touched = rows
+
+        expired = False
+        if self.window is not None:
+            if self._buckets is None:
+                self._buckets = deque()
+            self._buckets.append((rows, amounts))
+            while len(self._buckets) > self.window:
+                old_rows, old_amounts = self._buckets.popleft()
+                self.item_scores[old_rows] -= old_amounts
+                expired = True
+
+        if self.top_n is None:
+            self._rank_all()
+            return self
+        candidates = np.union1d(self.ranked_items, touched)
+        left_out = self._rank(candidates)
+        if left_out is not None and (
+            self._outside_best is None or left_out > self._outside_best
+        ):
+            self._outside_best = left_out
+        # Ties go by item row, so an equal score left out may belong first
+        if (
+            expired
+            and self._outside_best is not None
+            and self.item_scores[self.ranked_items[-1]] <= self._outside_best
+        ):
+            self._rank_all()
+        return self
+
+    def _segment_top(self, segment: Any, k: int) -> Optional[list[int]]:
+        index = self.segment_map.get(segment)
+        if index is None:
+            return None
+        start = self.segment_offsets[index]
+        stop = min(start + k, self.segment_offsets[index + 1])
+        return self.item_ids[self.segment_items[start:stop]].tolist()
+
+    def recommend(
+        self, user_id: int, k: int = 5, segment: Optional[Any] = None
+    ) -> list[int]:
+        """
+        :param segment: Segment value to rank within; unknown segments fall
+                        back to the global ranking.
+        """
+        if segment is not None:
+            ranked = self._segment_top(segment, k)
+            if ranked is not None:
+                return ranked
         return self.top_items[:k]
+
+    def score(self, user_id: Any, item_ids: Sequence[Any]) -> np.ndarray:
+        """Popularity score of each item (the same for every user)."""
+        self._sync_item_map()
+        scores = np.full(len(item_ids), -np.inf)
+        for pos, item in enumerate(item_ids):
+            row = self.item_map.get(item)
+            if row is not None:
+                scores[pos] = self.item_scores[row]
+        return scores
+
+    def recommend_batch(
+        self, user_ids: Sequence[Any], k: int = 5, segment: Optional[Any] = None
+    ) -> list[list[int]]:
+        """
+        Every user gets the same list, so the top-k slice is taken once and
+        shared by all rows; copy a row before mutating it.
+        """
+        head = self.recommend(0, k, segment=segment)
+        return [head] * len(user_ids)
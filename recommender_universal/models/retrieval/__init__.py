@@ -0,0 +1,4 @@
+from .base import BaseIndex
+from .ivf import IVFIndex
+
+__all__ = ["BaseIndex", "IVFIndex"]
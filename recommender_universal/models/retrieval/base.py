@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+import numpy as np
+from typing import Optional, Sequence
+
+
+class BaseIndex(ABC):
+    """
+    Abstract base class for maximum-inner-product retrieval indexes
+    built over a factor model's item vectors.
+    """
+
+    @abstractmethod
+    def build(self, item_factors: np.ndarray) -> "BaseIndex":
+        """
+        Index the item vectors.
+
+        :param item_factors: Array of shape (n_items, factors).
+        :return: The built index.
+        """
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        exclude: Optional[Sequence[np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Find the items with the highest inner product for each query.
+
+        :param queries: Array of shape (n_queries, factors).
+        :param k: Number of items to return per query.
+        :param exclude: Optional per-query arrays of item row indices that
+                        must not be returned.
+        :return: int array of shape (n_queries, k) with item row indices,
+                 best first, padded with -1 when fewer than k were found.
+        """
+        pass
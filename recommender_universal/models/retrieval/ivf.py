@@ -0,0 +1,115 @@
+import numpy as np
+from typing import Optional, Sequence
+from recommender_universal.models.retrieval.base import BaseIndex
+from recommender_universal.utils.topk import top_k_indices
+
+
+class IVFIndex(BaseIndex):
+    """
+    Inverted-file index: items are partitioned into `n_lists` k-means
+    cells, and a query only scores the items of the `nprobe` cells whose
+    centroids have the highest inner product with it. Search cost drops
+    from O(n_items * factors) to roughly O(nprobe / n_lists) of that.
+    """
+
+    def __init__(
+        self,
+        n_lists: Optional[int] = None,
+        nprobe: int = 8,
+        kmeans_iters: int = 10,
+        max_train_points: int = 256,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        :param n_lists: Number of cells (default: sqrt(n_items)).
+        :param nprobe: Cells scanned per query; higher trades speed for recall.
+        :param kmeans_iters: Lloyd iterations used to train the centroids.
+        :param max_train_points: Training sample per cell for k-means.
+        :param seed: Seed for sampling and centroid initialisation.
+        """
+        if nprobe < 1:
+            raise ValueError("nprobe must be a positive integer")
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.kmeans_iters = kmeans_iters
+        self.max_train_points = max_train_points
+        self.seed = seed
+
+        self.centroids: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        # Cell c holds list_items[list_offsets[c]:list_offsets[c + 1]]
+        self.list_offsets: np.ndarray = np.zeros(1, dtype=np.int64)
+        self.list_items: np.ndarray = np.empty(0, dtype=np.int32)
+        self.list_vectors: np.ndarray = np.empty((0, 0), dtype=np.float32)
+
+    def build(self, item_factors: np.ndarray) -> "IVFIndex":
+        vectors = np.ascontiguousarray(item_factors, dtype=np.float32)
+        n_items = len(vectors)
+        if n_items == 0:
+            raise ValueError("Cannot build an index over zero items")
+        n_lists = min(self.n_lists or max(1, int(np.sqrt(n_items))), n_items)
+
+        rng = np.random.default_rng(self.seed)
+        n_train = min(n_items, n_lists * self.max_train_points)
+        sample = vectors[rng.choice(n_items, n_train, replace=False)]
+        self.centroids = self._kmeans(sample, n_lists, rng)
+
+        assignment = self._assign(vectors, self.centroids)
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=n_lists)
+        self.list_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.list_items = order.astype(np.int32)
+        self.list_vectors = vectors[order]
+        return self
+
+    def _kmeans(
+        self, points: np.ndarray, n_clusters: int, rng: np.random.Generator
+    ) -> np.ndarray:
+        """Lloyd's algorithm; empty clusters keep their previous centroid."""
+        centroids = points[rng.choice(len(points), n_clusters, replace=False)].copy()
+        for _ in range(self.kmeans_iters):
+            assignment = self._assign(points, centroids)
+            counts = np.bincount(assignment, minlength=n_clusters)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, points)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+        return centroids
+
+    @staticmethod
+    def _assign(
+        points: np.ndarray, centroids: np.ndarray, chunk_size: int = 65536
+    ) -> np.ndarray:
+        """Nearest centroid (L2) of every point, computed in chunks."""
+        sq_norms = np.einsum("ij,ij->i", centroids, centroids)
+        out = np.empty(len(points), dtype=np.int64)
+        for start in range(0, len(points), chunk_size):
+            block = points[start : start + chunk_size]
+            # argmin |x - c|^2 == argmax 2 x.c - |c|^2
+            out[start : start + chunk_size] = np.argmax(
+                2 * block @ centroids.T - sq_norms, axis=1
+            )
+        return out
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        exclude: Optional[Sequence[np.ndarray]] = None,
+    ) -> np.ndarray:
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = max(k, 0)
+        results = np.full((len(queries), k), -1, dtype=np.int64)
+        if k == 0:
+            return results
+
+        probes = top_k_indices(queries @ self.centroids.T, self.nprobe)
+        starts, stops = self.list_offsets[:-1], self.list_offsets[1:]
+        for row, (query, cells) in enumerate(zip(queries, probes)):
+            candidates = np.concatenate([np.arange(starts[c], stops[c]) for c in cells])
+            scores = self.list_vectors[candidates] @ query
+            if exclude is not None:
+                scores[np.isin(self.list_items[candidates], exclude[row])] = -np.inf
+            best = top_k_indices(scores[None, :], k)[0]
+            best = best[scores[best] > -np.inf]
+            results[row, : len(best)] = self.list_items[candidates[best]]
+        return results
@@ -0,0 +1,279 @@
+"""
+Pickle-free artifacts of models and other fitted objects.
+
+An object's attributes are split into NumPy arrays, written as raw `.npy`
+files under `arrays/`, and everything else, described in `manifest.json`.
+Loading with `mmap=True` memory-maps the arrays read-only, so processes
+that load the same artifact share its pages.
+
+Supported attribute values:
+- NumPy arrays (object arrays only if they convert losslessly to a
+  fixed-width dtype, e.g. string or integer IDs)
+- ID maps: dicts whose values are exactly 0..n-1 in insertion order,
+  stored as the array of their keys and loaded as an `IdMap`
+- JSON values: None, bool, int, float, str (NumPy scalars included) and
+  lists / dicts of them
+- plain (non-callable) objects whose `__dict__` (or `__getstate__`
+  dict, if the class defines one) is made of the above, stored
+  recursively
+
+`encode_state` / `restore_state` expose the same encoding for other
+stores, such as the pipeline's stage cache.
+"""
+
+import importlib
+import json
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+ARRAYS_DIR = "arrays"
+FORMAT_VERSION = 1
+
+# Returns the array stored under a manifest file name
+ArrayReader = Callable[[str], np.ndarray]
+
+
+class IdMap(MutableMapping):
+    """
+    ID -> row mapping over an array of keys, key i mapping to row i, as
+    loaded from an ID map entry. The dict is built on the first lookup,
+    so loading (memory-mapped or not) stays O(1) and `len` never builds
+    it. Pickles and copies as a plain dict.
+    """
+
+    def __init__(self, keys: np.ndarray) -> None:
+        self.keys_array = keys
+        self._dict: Optional[Dict[Any, int]] = None
+
+    @property
+    def built(self) -> bool:
+        return self._dict is not None
+
+    def _map(self) -> Dict[Any, int]:
+        if self._dict is None:
+            keys = self.keys_array
+            self._dict = dict(zip(keys.tolist(), range(len(keys))))
+        return self._dict
+
+    def __getitem__(self, key: Any) -> int:
+        return self._map()[key]
+
+    def __setitem__(self, key: Any, value: int) -> None:
+        self._map()[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self._map()[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._map())
+
+    def __len__(self) -> int:
+        return len(self.keys_array) if self._dict is None else len(self._dict)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._map()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._map().get(key, default)
+
+    def __reduce__(self) -> Any:
+        return dict, (self._map(),)
+
+    def __repr__(self) -> str:
+        return f"IdMap({len(self)} keys)"
+
+
+def _class_path(obj: Any) -> str:
+    cls = type(obj)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _import_class(path: str) -> Any:
+    module_name, qualname = path.split(":")
+    target: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target
+
+
+def _to_fixed_width(values: Any, name: str) -> np.ndarray:
+    """Convert IDs to a non-object array, refusing lossy conversions."""
+    as_list = values.tolist() if isinstance(values, np.ndarray) else list(values)
+    array = np.asarray(as_list)
+    if array.dtype == object or array.tolist() != as_list:
+        raise TypeError(
+            f"Attribute '{name}' holds values that cannot be stored as a "
+            "fixed-width NumPy array; save this model with joblib instead"
+        )
+    return array
+
+
+def _state(obj: Any) -> Dict[str, Any]:
+    """The attributes to store: `__getstate__` if overridden, else `__dict__`."""
+    getstate = getattr(type(obj), "__getstate__", None)
+    if getstate is not None and getstate is not getattr(object, "__getstate__", None):
+        return obj.__getstate__()
+    return vars(obj)
+
+
+def _is_id_map(value: Any) -> bool:
+    return len(value) > 0 and all(
+        isinstance(v, (int, np.integer)) and v == i
+        for i, v in enumerate(value.values())
+    )
+
+
+def _is_json(value: Any) -> bool:
+    """True if `value` survives a JSON round trip unchanged."""
+    if value is None or isinstance(value, (bool, int, str)):
+        return True
+    if isinstance(value, float):
+        return bool(np.isfinite(value))
+    if isinstance(value, list):
+        return all(_is_json(v) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_json(v) for k, v in value.items())
+    return False
+
+
+def _to_python(value: Any) -> Any:
+    """`value` with NumPy scalars, also inside lists and dicts, made native."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, list):
+        return [_to_python(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_python(v) for k, v in value.items()}
+    return value
+
+
+def _encode(value: Any, name: str, arrays: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """Manifest entry for `value`; arrays are collected into `arrays`."""
+    if isinstance(value, np.generic):
+        value = value.item()
+
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            value = _to_fixed_width(value, name)
+        file = f"{ARRAYS_DIR}/{name}.npy"
+        arrays[file] = np.ascontiguousarray(value)
+        return {"kind": "array", "file": file}
+
+    if isinstance(value, IdMap) and not value.built:
+        file = f"{ARRAYS_DIR}/{name}.npy"
+        arrays[file] = value.keys_array
+        return {"kind": "id_map", "file": file}
+
+    if isinstance(value, (dict, IdMap)) and _is_id_map(value):
+        file = f"{ARRAYS_DIR}/{name}.npy"
+        arrays[file] = _to_fixed_width(value.keys(), name)
+        return {"kind": "id_map", "file": file}
+
+    plain = _to_python(value)
+    if _is_json(plain):
+        return {"kind": "value", "value": plain}
+
+    if hasattr(value, "__dict__") and not callable(value):
+        return {
+            "kind": "object",
+            "class": _class_path(value),
+            "state": encode_state(value, arrays, prefix=f"{name}."),
+        }
+
+    raise TypeError(
+        f"Attribute '{name}' of type {type(value).__name__} cannot be stored "
+        "in an array artifact; save this model with joblib instead"
+    )
+
+
+def _decode(entry: Dict[str, Any], read: ArrayReader) -> Any:
+    kind = entry["kind"]
+    if kind == "value":
+        return entry["value"]
+    if kind == "array":
+        return read(entry["file"])
+    if kind == "id_map":
+        return IdMap(read(entry["file"]))
+    if kind == "object":
+        cls = _import_class(entry["class"])
+        obj = cls.__new__(cls)
+        restore_state(obj, entry["state"], read)
+        return obj
+    raise ValueError(f"Unknown artifact entry kind '{kind}'")
+
+
+def encode_state(
+    obj: Any, arrays: Dict[str, np.ndarray], prefix: str = ""
+) -> Dict[str, Any]:
+    """
+    JSON-serializable description of `obj`'s attributes. The arrays it
+    refers to are added to `arrays`, keyed by their file name.
+
+    :raises TypeError: If an attribute cannot be stored without pickling.
+    """
+    return {
+        name: _encode(value, f"{prefix}{name}", arrays)
+        for name, value in _state(obj).items()
+    }
+
+
+def restore_state(obj: Any, state: Dict[str, Any], read: ArrayReader) -> None:
+    """
+    Set the attributes described by `encode_state` on `obj`.
+
+    :param read: Returns the array stored under a file name.
+    """
+    attrs = {name: _decode(entry, read) for name, entry in state.items()}
+    if hasattr(obj, "__setstate__"):
+        obj.__setstate__(attrs)
+    else:
+        obj.__dict__.update(attrs)
+
+
+def save_artifact(obj: Any, directory: Path) -> None:
+    """
+    Write `obj` as a manifest plus `.npy` arrays into `directory`.
+
+    :raises TypeError: If an attribute cannot be stored without pickling.
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    manifest = {
+        "format": FORMAT_VERSION,
+        "class": _class_path(obj),
+        "state": encode_state(obj, arrays),
+    }
+    (directory / ARRAYS_DIR).mkdir(parents=True, exist_ok=True)
+    for file, array in arrays.items():
+        np.save(directory / file, array, allow_pickle=False)
+    with open(directory / MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def load_artifact(directory: Path, mmap: bool = False) -> Any:
+    """
+    Rebuild the object saved by `save_artifact`.
+
+    :param mmap: If True, memory-map the arrays read-only.
+    """
+    with open(directory / MANIFEST) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format {manifest.get('format')}")
+
+    def read(file: str) -> np.ndarray:
+        return np.load(
+            directory / file, mmap_mode="r" if mmap else None, allow_pickle=False
+        )
+
+    return _decode(
+        {"kind": "object", "class": manifest["class"], "state": manifest["state"]},
+        read,
+    )
+
+
+def is_artifact(directory: Path) -> bool:
+    return (directory / MANIFEST).exists()
@@ -0,0 +1,24 @@
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Column indices of the k highest scores in each row, best first.
+
+    Uses `argpartition` so only the k winners per row are sorted.
+
+    :param scores: 2-D array of shape (n_rows, n_items).
+    :param k: Number of indices to return per row (clipped to n_items).
+    :return: int array of shape (n_rows, min(k, n_items)).
+    """
+    n_items = scores.shape[1]
+    k = max(0, min(k, n_items))
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.intp)
+    if k < n_items:
+        candidates = np.argpartition(scores, n_items - k, axis=1)[:, -k:]
+    else:
+        candidates = np.broadcast_to(np.arange(n_items), scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
@@ -0,0 +1,110 @@
+import sqlite3
+
+import fastavro
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from recommender_universal.data.connectors.avro import AvroConnector
+from recommender_universal.data.connectors.base import BaseConnector
+from recommender_universal.data.connectors.csv import CSVConnector
+from recommender_universal.data.connectors.json import JSONConnector
+from recommender_universal.data.connectors.parquet import ParquetConnector
+from recommender_universal.data.connectors.sqlite import SQLiteConnector
+
+
+@pytest.fixture
+def ratings():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 50, 1000),
+            "item_id": rng.integers(0, 20, 1000),
+            "rating": rng.integers(1, 6, 1000),
+        }
+    )
+
+
+def _assert_chunks(chunks, expected, chunksize):
+    chunks = list(chunks)
+    assert len(chunks) == -(-len(expected) // chunksize)
+    assert all(len(chunk) <= chunksize for chunk in chunks)
+    combined = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(combined, expected, check_dtype=False)
+
+
+def test_csv_chunks(tmp_path, ratings):
+    path = tmp_path / "ratings.csv"
+    ratings.to_csv(path, index=False)
+    _assert_chunks(CSVConnector().iter_chunks(str(path), chunksize=300), ratings, 300)
+
+
+def test_json_lines_chunks(tmp_path, ratings):
+    path = tmp_path / "ratings.json"
+    ratings.to_json(path, orient="records", lines=True)
+    chunks = JSONConnector().iter_chunks(
+        str(path), chunksize=256, orient="records", lines=True
+    )
+    _assert_chunks(chunks, ratings, 256)
+
+
+def test_json_document_falls_back_to_slicing(tmp_path, ratings):
+    path = tmp_path / "ratings.json"
+    ratings.to_json(path, orient="records")
+    chunks = JSONConnector().iter_chunks(str(path), chunksize=400, orient="records")
+    _assert_chunks(chunks, ratings, 400)
+
+
+def test_parquet_chunks(tmp_path, ratings):
+    path = tmp_path / "ratings.parquet"
+    pq.write_table(pa.Table.from_pandas(ratings), path, row_group_size=100)
+    _assert_chunks(
+        ParquetConnector().iter_chunks(str(path), chunksize=250), ratings, 250
+    )
+    (first,) = list(
+        ParquetConnector().iter_chunks(str(path), chunksize=5000, columns=["rating"])
+    )
+    assert list(first.columns) == ["rating"]
+
+
+def test_avro_chunks(tmp_path, ratings):
+    path = tmp_path / "ratings.avro"
+    schema = {
+        "name": "Rating",
+        "type": "record",
+        "fields": [{"name": c, "type": "long"} for c in ratings.columns],
+    }
+    with open(path, "wb") as fo:
+        # Small blocks so chunks span several of them
+        fastavro.writer(fo, schema, ratings.to_dict("records"), sync_interval=512)
+    _assert_chunks(AvroConnector().iter_chunks(str(path), chunksize=128), ratings, 128)
+
+
+def test_sqlite_chunks(tmp_path, ratings):
+    db_path = tmp_path / "ratings.db"
+    with sqlite3.connect(db_path) as conn:
+        ratings.to_sql("ratings", conn, index=False)
+    uri = f"sqlite:///{db_path}"
+    connector = SQLiteConnector()
+    _assert_chunks(
+        connector.iter_chunks(uri, chunksize=333, table_name="ratings"), ratings, 333
+    )
+    _assert_chunks(
+        connector.iter_chunks(
+            uri, chunksize=333, query="SELECT * FROM ratings ORDER BY rowid"
+        ),
+        ratings,
+        333,
+    )
+
+
+def test_default_chunks_slice_full_read(ratings):
+    class InMemory(BaseConnector):
+        def _read(self, uri, **kwargs):
+            return ratings
+
+    _assert_chunks(InMemory().iter_chunks("memory", chunksize=400), ratings, 400)
+    with pytest.raises(ValueError):
+        InMemory().iter_chunks("memory", chunksize=0)
@@ -0,0 +1,132 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from recommender_universal.data.connectors import load_data
+from recommender_universal.data.connectors import cache as cache_module
+from recommender_universal.data.connectors.cache import DiskCache
+from recommender_universal.data.connectors.csv import CSVConnector
+from recommender_universal.data.connectors.sqlite import SQLiteConnector
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "ratings.csv"
+    pd.DataFrame({"user_id": [1, 2, 3], "rating": [5.0, 4.0, 3.0]}).to_csv(
+        path, index=False
+    )
+    return str(path)
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    calls = []
+    original = CSVConnector._read
+
+    def counting(self, uri, **kwargs):
+        calls.append(uri)
+        return original(self, uri, **kwargs)
+
+    monkeypatch.setattr(CSVConnector, "_read", counting)
+    return calls
+
+
+def test_hits_across_connectors(tmp_path, csv_path, reads):
+    cache_dir = tmp_path / "cache"
+    first = load_data(csv_path, disk_cache=cache_dir)
+    second = load_data(csv_path, disk_cache=cache_dir)
+    pd.testing.assert_frame_equal(first, second)
+    assert len(reads) == 1
+
+    # Different read arguments are a different entry
+    projected = load_data(csv_path, disk_cache=cache_dir, columns=["rating"])
+    assert list(projected.columns) == ["rating"]
+    assert len(reads) == 2
+
+
+def test_source_change_invalidates(tmp_path, csv_path, reads):
+    cache = DiskCache(tmp_path / "cache")
+    CSVConnector(disk_cache=cache).load(csv_path)
+    pd.DataFrame({"user_id": [9], "rating": [1.0]}).to_csv(csv_path, index=False)
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    df = CSVConnector(disk_cache=cache).load(csv_path)
+    assert df["user_id"].tolist() == [9]
+    assert len(reads) == 2
+
+
+def test_refresh_rewrites_entry(tmp_path, csv_path, reads):
+    cache = DiskCache(tmp_path / "cache")
+    CSVConnector(disk_cache=cache).load(csv_path)
+    CSVConnector(disk_cache=cache).load(csv_path, refresh=True)
+    CSVConnector(disk_cache=cache).load(csv_path)
+    assert len(reads) == 2
+
+
+def test_ttl_expires_entries(tmp_path, monkeypatch):
+    db_path = tmp_path / "ratings.db"
+    with sqlite3.connect(db_path) as conn:
+        pd.DataFrame({"x": [1, 2]}).to_sql("t", conn, index=False)
+    cache = DiskCache(tmp_path / "cache", ttl=60)
+    uri = f"sqlite:///{db_path}"
+    query = "SELECT x FROM t"
+    assert SQLiteConnector(disk_cache=cache).load(uri, query=query)["x"].sum() == 3
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO t VALUES (3)")
+    # No fingerprint for SQL: the stale entry is served until it expires
+    assert SQLiteConnector(disk_cache=cache).load(uri, query=query)["x"].sum() == 3
+    now = cache_module.time.time()
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 61)
+    assert SQLiteConnector(disk_cache=cache).load(uri, query=query)["x"].sum() == 6
+
+
+def test_lru_eviction(tmp_path):
+    frame = pd.DataFrame({"x": np.arange(10_000, dtype=np.int64)})
+    cache = DiskCache(tmp_path / "cache")
+    cache.put("a", frame)
+    entry_size = cache.size_bytes
+    cache.max_bytes = int(2.5 * entry_size)
+
+    cache.put("b", frame)
+    os.utime(cache._path("a"), ns=(0, 1))  # make "a" the oldest...
+    os.utime(cache._path("b"), ns=(0, 2))
+    assert cache.get("a") is not None  # ...then use it again
+    cache.put("c", frame)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.size_bytes <= cache.max_bytes
+
+
+def test_get_maps_numeric_columns_without_copying(tmp_path):
+    frame = pd.DataFrame(
+        {
+            "x": np.arange(1000, dtype=np.int64),
+            "y": np.linspace(0, 1, 1000),
+            "name": ["a", "b"] * 500,
+        }
+    )
+    cache = DiskCache(tmp_path / "cache")
+    cache.put("a", frame)
+
+    out = cache.get("a")
+    pd.testing.assert_frame_equal(out, frame)
+    assert not out["x"].to_numpy().flags.writeable
+    assert not out["y"].to_numpy().flags.writeable
+
+    writable = cache.get("a", writable=True)
+    writable.loc[0, "x"] = 7
+    assert writable["x"].iloc[0] == 7
+
+
+def test_unrepresentable_frames_are_not_cached(tmp_path):
+    cache = DiskCache(tmp_path / "cache")
+    assert not cache.put("mixed", pd.DataFrame({"x": [1, "a", 2.5]}))
+    assert cache.get("mixed") is None
+    with pytest.raises(ValueError):
+        DiskCache(tmp_path / "cache", ttl=0)
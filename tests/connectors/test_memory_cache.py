@@ -0,0 +1,104 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from recommender_universal.data.connectors.cache import MemoryCache, make_key
+from recommender_universal.data.connectors.csv import CSVConnector
+from recommender_universal.data.connectors.sqlite import SQLiteConnector
+
+
+def _write_csv(path, n):
+    pd.DataFrame({"user_id": range(n), "rating": [1.0] * n}).to_csv(path, index=False)
+    return str(path)
+
+
+def test_keyed_by_uri(tmp_path):
+    a = _write_csv(tmp_path / "a.csv", 3)
+    b = _write_csv(tmp_path / "b.csv", 5)
+    conn = CSVConnector()
+
+    assert len(conn.load(a)) == 3
+    assert len(conn.load(b)) == 5
+    assert len(conn.load(a)) == 3
+    assert conn.cache_info()["hits"] == 1
+    assert conn.cache_info()["misses"] == 2
+
+
+def test_keyed_by_kwargs(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'db.sqlite'}"
+    with sqlite3.connect(tmp_path / "db.sqlite") as con:
+        con.execute("CREATE TABLE users (id INTEGER)")
+        con.execute("CREATE TABLE items (id INTEGER)")
+        con.executemany("INSERT INTO users VALUES (?)", [(1,), (2,)])
+        con.executemany("INSERT INTO items VALUES (?)", [(1,), (2,), (3,)])
+    conn = SQLiteConnector()
+
+    assert len(conn.load(uri, table_name="users")) == 2
+    assert len(conn.load(uri, table_name="items")) == 3
+    assert len(conn.load(uri, table_name="users")) == 2
+    assert conn.cache_info()["entries"] == 2
+
+
+def test_key_ignores_argument_order():
+    assert make_key("u", {"a": 1, "b": (2, 3)}) == make_key("u", {"b": [2, 3], "a": 1})
+    assert make_key("u", {"a": 1}) != make_key("u", {"a": 2})
+
+
+def test_evicts_least_recently_used():
+    frames = {k: pd.DataFrame({"x": range(100)}) for k in "abc"}
+    size = int(frames["a"].memory_usage(deep=True).sum())
+    cache = MemoryCache(max_bytes=2 * size)
+
+    cache.put("a", frames["a"])
+    cache.put("b", frames["b"])
+    assert cache.get("a") is frames["a"]
+    cache.put("c", frames["c"])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is frames["a"]
+    assert cache.stats == {
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "entries": 2,
+        "bytes": 2 * size,
+    }
+
+
+def test_oversized_frame_not_cached(tmp_path):
+    uri = _write_csv(tmp_path / "a.csv", 1000)
+    conn = CSVConnector(cache_max_bytes=100)
+
+    conn.load(uri)
+    conn.load(uri)
+
+    assert conn.cache_info()["entries"] == 0
+    assert conn.cache_info()["misses"] == 2
+    assert "rating" in conn.schema
+
+
+def test_refresh_and_clear(tmp_path):
+    uri = _write_csv(tmp_path / "a.csv", 3)
+    conn = CSVConnector()
+    conn.load(uri)
+    _write_csv(tmp_path / "a.csv", 4)
+
+    assert len(conn.load(uri)) == 3
+    assert len(conn.load(uri, refresh=True)) == 4
+    conn.clear_cache()
+    assert conn.cache_info()["bytes"] == 0
+    assert len(conn.load(uri)) == 4
+
+
+def test_disabled_cache_counts_nothing(tmp_path):
+    uri = _write_csv(tmp_path / "a.csv", 3)
+    conn = CSVConnector(cache=False)
+    conn.load(uri)
+    conn.load(uri)
+    assert conn.cache_info()["hits"] == conn.cache_info()["misses"] == 0
+
+
+def test_negative_budget_rejected():
+    with pytest.raises(ValueError):
+        MemoryCache(max_bytes=-1)
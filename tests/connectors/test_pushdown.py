@@ -0,0 +1,123 @@
+import sqlite3
+
+import fastavro
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from recommender_universal.data.connectors.avro import AvroConnector
+from recommender_universal.data.connectors.base import filter_mask
+from recommender_universal.data.connectors.csv import CSVConnector
+from recommender_universal.data.connectors.json import JSONConnector
+from recommender_universal.data.connectors.parquet import ParquetConnector
+from recommender_universal.data.connectors.sql import build_select
+from recommender_universal.data.connectors.sqlite import SQLiteConnector
+
+COLUMNS = ["user_id", "item_id", "rating"]
+DTYPES = {"user_id": "int32", "item_id": "category", "rating": "float32"}
+FILTERS = [("rating", ">=", 3), ("item_id", "not in", ["c"]), ("country", "==", "US")]
+
+
+@pytest.fixture
+def events():
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 50, n),
+            "item_id": rng.choice(list("abcdef"), n),
+            "rating": rng.integers(1, 6, n),
+            "country": rng.choice(["US", "UK"], n),
+            "payload": ["x" * 20] * n,
+        }
+    )
+
+
+def _expected(events):
+    rows = events[
+        (events["rating"] >= 3)
+        & (events["item_id"] != "c")
+        & (events["country"] == "US")
+    ]
+    return rows[COLUMNS].astype(DTYPES).reset_index(drop=True)
+
+
+def _write(kind, events, tmp_path):
+    if kind == "csv":
+        path = tmp_path / "events.csv"
+        events.to_csv(path, index=False)
+        return CSVConnector(), str(path), {}
+    if kind == "parquet":
+        path = tmp_path / "events.parquet"
+        pq.write_table(pa.Table.from_pandas(events), path, row_group_size=64)
+        return ParquetConnector(), str(path), {}
+    if kind == "sqlite":
+        path = tmp_path / "events.db"
+        with sqlite3.connect(path) as conn:
+            events.to_sql("events", conn, index=False)
+        return SQLiteConnector(), f"sqlite:///{path}", {"table_name": "events"}
+    if kind == "json":
+        path = tmp_path / "events.json"
+        events.to_json(path, orient="records", lines=True)
+        return JSONConnector(), str(path), {"orient": "records", "lines": True}
+    path = tmp_path / "events.avro"
+    schema = {
+        "name": "Event",
+        "type": "record",
+        "fields": [
+            {"name": c, "type": "long" if c in ("user_id", "rating") else "string"}
+            for c in events.columns
+        ],
+    }
+    with open(path, "wb") as fo:
+        fastavro.writer(fo, schema, events.to_dict("records"))
+    return AvroConnector(), str(path), {}
+
+
+KINDS = ["csv", "parquet", "sqlite", "json", "avro"]
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_load_pushdown(kind, events, tmp_path):
+    connector, uri, kwargs = _write(kind, events, tmp_path)
+    df = connector.load(uri, columns=COLUMNS, dtypes=DTYPES, filters=FILTERS, **kwargs)
+    pd.testing.assert_frame_equal(
+        df.reset_index(drop=True), _expected(events), check_categorical=False
+    )
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_chunk_pushdown(kind, events, tmp_path):
+    connector, uri, kwargs = _write(kind, events, tmp_path)
+    chunks = list(
+        connector.iter_chunks(
+            uri,
+            chunksize=100,
+            columns=COLUMNS,
+            dtypes=DTYPES,
+            filters=FILTERS,
+            **kwargs,
+        )
+    )
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    combined = pd.concat(chunks, ignore_index=True).astype({"item_id": "category"})
+    pd.testing.assert_frame_equal(combined, _expected(events), check_categorical=False)
+
+
+def test_sql_select_projects_and_binds():
+    statement = build_select(
+        query="SELECT * FROM events", columns=["user id"], filters=[("x", "in", [1])]
+    )
+    sql = str(statement.compile(compile_kwargs={"literal_binds": True}))
+    assert sql.split() == (
+        'SELECT "user id" FROM (SELECT * FROM events) AS q WHERE x IN (1)'.split()
+    )
+    with pytest.raises(ValueError):
+        build_select()
+
+
+def test_invalid_filter_rejected(events):
+    with pytest.raises(ValueError):
+        filter_mask(events, [("rating", "~", 3)])
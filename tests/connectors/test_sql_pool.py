@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+
+from recommender_universal.data.connectors import sql as sql_module
+from recommender_universal.data.connectors.sql import dispose_engines, get_engine
+from recommender_universal.data.connectors.sqlite import SQLiteConnector
+
+
+@pytest.fixture
+def uri(tmp_path):
+    path = tmp_path / "db.sqlite"
+    with sqlite3.connect(path) as con:
+        con.execute("CREATE TABLE ratings (user_id INTEGER, rating REAL)")
+        con.executemany(
+            "INSERT INTO ratings VALUES (?, ?)", [(u, u / 2) for u in range(10)]
+        )
+    yield f"sqlite:///{path}"
+    dispose_engines()
+
+
+def test_engine_reused_across_reads_and_connectors(uri, monkeypatch):
+    created = []
+    original = sql_module.create_engine
+
+    def counting(*args, **kwargs):
+        created.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(sql_module, "create_engine", counting)
+    SQLiteConnector().load(uri, table_name="ratings")
+    SQLiteConnector().load(uri, table_name="ratings", refresh=True)
+    list(SQLiteConnector().iter_chunks(uri, chunksize=3, table_name="ratings"))
+
+    assert len(created) == 1
+
+
+def test_pool_settings(uri):
+    engine = get_engine(uri, pool_size=2, max_overflow=0)
+    assert engine.pool.size() == 2
+    assert engine is get_engine(uri, pool_size=2, max_overflow=0)
+    assert engine is not get_engine(uri)
+
+
+def test_in_memory_sqlite():
+    engine = get_engine("sqlite://", pool_size=2)
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT 1").scalar() == 1
+    dispose_engines()
+
+
+def test_read_many(uri):
+    conn = SQLiteConnector(pool_size=3)
+    frames = conn.read_many(
+        uri,
+        [
+            "SELECT * FROM ratings WHERE user_id < 3",
+            {"table_name": "ratings", "columns": ["rating"]},
+            {"table_name": "ratings", "filters": [("user_id", ">=", 8)]},
+        ],
+    )
+
+    assert [len(df) for df in frames] == [3, 10, 2]
+    assert list(frames[1].columns) == ["rating"]
+    assert frames[2]["user_id"].tolist() == [8, 9]
+
+
+def test_read_many_empty(uri):
+    assert SQLiteConnector().read_many(uri, []) == []
+
+
+def test_invalid_pool_size():
+    with pytest.raises(ValueError):
+        SQLiteConnector(pool_size=0)
@@ -0,0 +1,104 @@
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from recommender_universal.data.transforms.encoding import IdEncoder, Vocabulary
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "user_id": ["b", "a", "b", "c"],
+            "item_id": [30, 10, 20, 10],
+            "rating": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+
+
+def test_fit_transform_codes_in_first_seen_order(df):
+    encoder = IdEncoder()
+    out = encoder.fit_transform(df)
+
+    assert out["user_id"].dtype == np.int32 and out["item_id"].dtype == np.int32
+    assert out["user_id"].tolist() == [0, 1, 0, 2]
+    assert out["item_id"].tolist() == [0, 1, 2, 1]
+    assert encoder.users.values.tolist() == ["b", "a", "c"]
+    pd.testing.assert_frame_equal(encoder.transform(df), out)
+    pd.testing.assert_frame_equal(encoder.inverse_transform(out), df, check_dtype=False)
+
+
+def test_unknown_ids(df):
+    new = pd.DataFrame({"user_id": ["a", "z"], "item_id": [10, 99], "rating": 1.0})
+    with pytest.raises(ValueError, match="z"):
+        IdEncoder().fit(df).transform(new)
+
+    ignored = IdEncoder(handle_unknown="ignore").fit(df).transform(new)
+    assert ignored["user_id"].tolist() == [1, -1]
+
+    encoder = IdEncoder(handle_unknown="append").fit(df)
+    appended = encoder.transform(new)
+    assert appended["user_id"].tolist() == [1, 3]
+    assert appended["item_id"].tolist() == [1, 3]
+    assert len(encoder.users) == 4 and len(encoder.items) == 4
+
+
+@pytest.mark.parametrize(
+    "run",
+    [
+        lambda enc, df: enc.fit_transform(df),
+        lambda enc, df: enc.fit(df.dropna()).transform(df),
+        lambda enc, df: enc.partial_fit(df),
+    ],
+)
+def test_null_ids_rejected(df, run):
+    df.loc[1, "item_id"] = None
+    with pytest.raises(ValueError, match="null IDs"):
+        run(IdEncoder(), df)
+
+
+def test_partial_fit_matches_fit(df):
+    chunked = IdEncoder().fit(df.iloc[:2]).partial_fit(df.iloc[2:])
+    full = IdEncoder().fit(df)
+    assert chunked.users.values.tolist() == full.users.values.tolist()
+    assert chunked.items.values.tolist() == full.items.values.tolist()
+
+
+def test_vocabulary_extend_keeps_codes():
+    vocab = Vocabulary(np.array([5, 7]))
+    assert vocab.extend([7, 9, 9, np.nan, 5]).tolist() == [1, 2, 2, -1, 0]
+    assert vocab.lookup([9, 4]).tolist() == [2, -1]
+    assert vocab.decode([2, 0]).tolist() == [9, 5]
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_save_load(tmp_path, df, mmap):
+    encoder = IdEncoder(handle_unknown="append").fit(df)
+    encoder.save(tmp_path / "encoder")
+    loaded = IdEncoder.load(tmp_path / "encoder", mmap=mmap)
+
+    assert loaded.config() == encoder.config()
+    pd.testing.assert_frame_equal(loaded.transform(df), encoder.transform(df))
+    extra = pd.DataFrame({"user_id": ["d"], "item_id": [40], "rating": 1.0})
+    assert loaded.transform(extra)["user_id"].tolist() == [3]
+
+
+def test_pickle_drops_hash_index(df):
+    encoder = IdEncoder().fit(df)
+    encoder.users.lookup(["a"])
+    restored = pickle.loads(pickle.dumps(encoder))
+    assert restored.users._index is None
+    assert restored.users.lookup(["a"]).tolist() == [1]
+
+
+def test_does_not_import_models():
+    code = (
+        "import sys, recommender_universal.data.transforms.encoding; "
+        "print(any(m.startswith('recommender_universal.models') for m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert out.stdout.strip() == "False"
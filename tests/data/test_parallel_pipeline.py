@@ -0,0 +1,145 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from recommender_universal.data.connectors.csv import CSVConnector
+from recommender_universal.data import parallel
+from recommender_universal.data.parallel import map_chunks, map_frame
+from recommender_universal.data.pipeline import DataPipeline
+from recommender_universal.data.schema import RatingSchema
+from recommender_universal.data.transforms.encoding import IdEncoder
+from recommender_universal.data.transforms.numerical import MinMaxScaler
+
+
+def _tag_pid(df):
+    return df.assign(pid=os.getpid(), y=df["x"] * 2)
+
+
+def _frame(n, start=0):
+    return pd.DataFrame(
+        {"x": np.arange(start, start + n, dtype=float), "s": ["a"] * n},
+        index=np.arange(start, start + n) * 10,
+    )
+
+
+def test_map_frame_matches_serial_and_keeps_index():
+    df = _frame(1000)
+    out = map_frame(df, _tag_pid, n_jobs=2, min_rows=100)
+
+    assert out["pid"].nunique() == 2 and os.getpid() not in set(out["pid"])
+    pd.testing.assert_frame_equal(out.drop(columns="pid"), df.assign(y=df["x"] * 2))
+
+
+def test_map_frame_small_input_runs_serially():
+    out = map_frame(_frame(10), _tag_pid, n_jobs=4, min_rows=100)
+    assert set(out["pid"]) == {os.getpid()}
+
+
+def test_map_frame_falls_back_for_non_arrow_frames():
+    df = pd.DataFrame({"x": np.arange(300.0), "s": [1, "a", None] * 100})
+    out = map_frame(df, _tag_pid, n_jobs=2, min_rows=100)
+    assert set(out["pid"]) == {os.getpid()}
+
+
+def test_map_chunks_in_order():
+    chunks = [_frame(50, start) for start in range(0, 500, 50)]
+    out = list(map_chunks(iter(chunks), _tag_pid, n_jobs=2, min_rows=10))
+
+    assert len(out) == len(chunks)
+    assert os.getpid() not in set(pd.concat(out)["pid"])
+    for got, chunk in zip(out, chunks):
+        pd.testing.assert_frame_equal(
+            got.drop(columns="pid"), chunk.assign(y=chunk["x"] * 2)
+        )
+
+
+def test_map_chunks_empty():
+    assert list(map_chunks(iter([]), _tag_pid, n_jobs=2)) == []
+
+
+def _build(path, n_jobs):
+    return DataPipeline(
+        connector=CSVConnector(),
+        schema=RatingSchema(user="u", item="i", rating="r"),
+        uri=str(path),
+        transforms=[MinMaxScaler(["r"]), MinMaxScaler(["r", "u"])],
+        n_jobs=n_jobs,
+        min_parallel_rows=50,
+    )
+
+
+@pytest.fixture
+def ratings_csv(tmp_path):
+    path = tmp_path / "ratings.csv"
+    n = 400
+    pd.DataFrame(
+        {"u": range(n), "i": np.arange(n) % 7, "r": np.arange(n) % 5 + 1.0}
+    ).to_csv(path, index=False)
+    return path
+
+
+def test_pipeline_n_jobs_matches_serial(ratings_csv):
+    def build(n_jobs):
+        return _build(ratings_csv, n_jobs)
+
+    serial = build(1)
+    parallel = build(2)
+    pd.testing.assert_frame_equal(parallel.run(), serial.run())
+    pd.testing.assert_frame_equal(
+        parallel.run(fused=True, fit=False), serial.run(fused=True, fit=False)
+    )
+    pd.testing.assert_frame_equal(
+        pd.concat(parallel.iter_chunks(chunksize=100)),
+        pd.concat(serial.iter_chunks(chunksize=100)),
+    )
+
+
+def test_fit_groups_share_pool_and_scratch_files(ratings_csv, monkeypatch):
+    pools, writes = [], []
+    pool_cls, write = parallel.ProcessPoolExecutor, parallel._write
+
+    def counting_pool(*args, **kwargs):
+        pools.append(kwargs)
+        return pool_cls(*args, **kwargs)
+
+    def counting_write(df, path):
+        writes.append(os.path.basename(path))
+        return write(df, path)
+
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", counting_pool)
+    monkeypatch.setattr(parallel, "_write", counting_write)
+    out = _build(ratings_csv, 2).run()
+
+    # Two fit passes (the second scaler reads the first one's output)
+    assert len(pools) == 1
+    assert [w for w in writes if w.startswith("input")] == ["input-0.arrow"]
+    pd.testing.assert_frame_equal(out, _build(ratings_csv, 1).run())
+
+
+def test_n_jobs_zero_rejected(ratings_csv):
+    with pytest.raises(ValueError):
+        map_frame(_frame(10), _tag_pid, n_jobs=0)
+    with pytest.raises(ValueError):
+        _build(ratings_csv, 0)
+
+
+def test_stateful_transforms_run_serially(ratings_csv):
+    encoder = IdEncoder("u", "i", handle_unknown="append")
+    encoder.fit(pd.DataFrame({"u": [0], "i": [0]}))
+    pipeline = DataPipeline(
+        connector=CSVConnector(),
+        schema=RatingSchema(user="u", item="i", rating="r"),
+        uri=str(ratings_csv),
+        transforms=[encoder],
+        n_jobs=2,
+        min_parallel_rows=10,
+    )
+
+    out = pd.concat(pipeline.iter_chunks(chunksize=100))
+
+    # Every user was appended to the parent's vocabulary, once
+    assert len(encoder.users) == 400
+    assert out["u"].tolist() == list(range(400))
+    assert not encoder.stateless() and IdEncoder().stateless()
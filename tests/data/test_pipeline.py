@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 from pathlib import Path  # noqa: F401
@@ -5,7 +6,12 @@ from pathlib import Path  # noqa: F401
 from recommender_universal.data.connectors.csv import CSVConnector
 from recommender_universal.data.schema import RatingSchema
 from recommender_universal.data.transforms.numerical import MinMaxScaler
-from recommender_universal.data.pipeline import DataPipeline
+from recommender_universal.data.pipeline import (
+    DataPipeline,
+    plan_fit_passes,
+    plan_fused,
+)
+from recommender_universal.data.transforms.base import BaseTransform
 
 
 def test_pipeline_minmax(tmp_path):
@@ -35,3 +41,196 @@ def test_pipeline_minmax(tmp_path):
     assert df_out.shape == df_in.shape
     assert df_out["r"].max() == pytest.approx(1.0)
     assert df_out["r"].min() == pytest.approx(0.0)
+
+
+def test_pipeline_iter_chunks(tmp_path):
+    path = tmp_path / "ratings.csv"
+    df_in = pd.DataFrame({"u": range(10), "i": range(10), "r": range(10)})
+    df_in.to_csv(path, index=False)
+    pipeline = DataPipeline(
+        connector=CSVConnector(),
+        schema=RatingSchema(user="u", item="i", rating="r"),
+        uri=str(path),
+        transforms=[MinMaxScaler(columns=["r"])],
+    )
+    full = pipeline.run()
+
+    chunks = list(pipeline.iter_chunks(chunksize=4))
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    pd.testing.assert_frame_equal(pd.concat(chunks), full)
+
+
+def test_pipeline_iter_chunks_validates(tmp_path):
+    path = tmp_path / "ratings.csv"
+    pd.DataFrame({"u": [1], "i": [2]}).to_csv(path, index=False)
+    pipeline = DataPipeline(
+        connector=CSVConnector(),
+        schema=RatingSchema(user="u", item="i", rating="r"),
+        uri=str(path),
+    )
+    with pytest.raises(ValueError):
+        next(pipeline.iter_chunks())
+
+
+def test_pipeline_projects_and_filters(tmp_path):
+    path = tmp_path / "events.csv"
+    pd.DataFrame(
+        {
+            "u": [1, 2, 3, 4],
+            "i": [10, 20, 10, 30],
+            "r": [1.0, 5.0, 4.0, 2.0],
+            "payload": ["a", "b", "c", "d"],
+        }
+    ).to_csv(path, index=False)
+    pipeline = DataPipeline(
+        connector=CSVConnector(),
+        schema=RatingSchema(user="u", item="i", rating="r"),
+        uri=str(path),
+        project=True,
+        filters=[("r", ">=", 2.0)],
+    )
+    df = pipeline.run()
+    assert list(df.columns) == ["u", "i", "r"]
+    assert df["u"].tolist() == [2, 3, 4]
+    assert df["i"].dtype == "category" and df["r"].dtype == "float32"
+    chunks = list(pipeline.iter_chunks(chunksize=2))
+    assert pd.concat(chunks)["u"].tolist() == [2, 3, 4]
+
+
+def test_pipeline_range_filter_on_projected_ids(tmp_path):
+    path = tmp_path / "events.csv"
+    pd.DataFrame({"u": [1, 2, 3, 4], "i": [10, 20, 10, 30], "r": 1.0}).to_csv(
+        path, index=False
+    )
+    pipeline = DataPipeline(
+        connector=CSVConnector(),
+        schema=RatingSchema(user="u", item="i", rating="r"),
+        uri=str(path),
+        project=True,
+        filters=[("u", ">=", 2)],
+    )
+    df = pipeline.run()
+    assert df["u"].tolist() == [2, 3, 4]
+    assert df["u"].dtype == "category" and list(df["u"].cat.categories) == [2, 3, 4]
+
+    # Streamed IDs stay numeric, so chunks concatenate without objects
+    chunks = pd.concat(pipeline.iter_chunks(chunksize=2))
+    assert chunks["u"].tolist() == [2, 3, 4]
+    assert chunks["u"].dtype.kind == "i" and chunks["i"].dtype.kind == "i"
+
+
+class _Negate(BaseTransform):
+    """A transform without fused support."""
+
+    def fit(self, df):
+        return self
+
+    def transform(self, df):
+        return df.assign(r=-df["r"])
+
+
+def test_plan_fused():
+    a, b, c = MinMaxScaler(["r"]), _Negate(), MinMaxScaler(["u"])
+    d = MinMaxScaler(["i"])
+    assert plan_fused([a, c, b, d]) == [[a, c], [b], [d]]
+
+
+def test_pipeline_fused_matches_unfused(tmp_path):
+    path = tmp_path / "ratings.csv"
+    pd.DataFrame(
+        {"u": [1, 2, 3, 4], "i": [10, 20, 10, 30], "r": [1.0, 5.0, 4.0, 2.0]}
+    ).to_csv(path, index=False)
+
+    def build():
+        return DataPipeline(
+            connector=CSVConnector(),
+            schema=RatingSchema(user="u", item="i", rating="r"),
+            uri=str(path),
+            transforms=[MinMaxScaler(["r"]), _Negate(), MinMaxScaler(["r", "u"])],
+        )
+
+    expected = build().run()
+    pipeline = build()
+    loaded = pipeline.connector.load(str(path)).copy()
+    fused = pipeline.run(fused=True)
+
+    assert fused["r"].dtype == np.float32 and fused["u"].dtype == np.float32
+    pd.testing.assert_frame_equal(
+        fused, expected.astype({"r": np.float32, "u": np.float32})
+    )
+    # The loaded (cached) frame is left untouched
+    pd.testing.assert_frame_equal(pipeline.connector.load(str(path)), loaded)
+    chunks = list(pipeline.iter_chunks(chunksize=3, fused=True))
+    pd.testing.assert_frame_equal(pd.concat(chunks), fused)
+
+
+def test_pipeline_memory_report(tmp_path):
+    path = tmp_path / "ratings.csv"
+    n = 50_000
+    pd.DataFrame(
+        {"u": range(n), "i": range(n), "r": [1.0, 2.0] * (n // 2), "x": 0.0}
+    ).to_csv(path, index=False)
+    pipeline = DataPipeline(
+        connector=CSVConnector(),
+        schema=RatingSchema(user="u", item="i", rating="r"),
+        uri=str(path),
+        transforms=[MinMaxScaler(["r"]) for _ in range(5)],
+    )
+
+    pipeline.run(measure_memory=True)
+    unfused = pipeline.memory_report
+    pipeline.run(fused=True, measure_memory=True)
+    fused = pipeline.memory_report
+
+    assert unfused is not None and fused is not None
+    assert fused["input_bytes"] == unfused["input_bytes"]
+    # One float32 column on top of the input, versus whole-frame copies
+    assert fused["peak_bytes"] < 1.25 * fused["input_bytes"]
+    assert fused["peak_bytes"] < unfused["peak_bytes"]
+
+
+def test_plan_fit_passes():
+    a, b, c = MinMaxScaler(["r"]), MinMaxScaler(["u"]), MinMaxScaler(["r"])
+    d, e = _Negate(), MinMaxScaler(["i"])
+    assert plan_fit_passes([a, b, c, d, e]) == [[a, b], [c], [d], [e]]
+
+
+def _streaming_pipeline(path, transforms):
+    pd.DataFrame(
+        {"u": range(10), "i": [3, 1, 4, 1, 5, 9, 2, 6, 5, 3], "r": range(10, 0, -1)}
+    ).to_csv(path, index=False)
+    return DataPipeline(
+        connector=CSVConnector(),
+        schema=RatingSchema(user="u", item="i", rating="r"),
+        uri=str(path),
+        transforms=transforms,
+    )
+
+
+def test_pipeline_run_streaming_matches_run(tmp_path):
+    def transforms():
+        return [MinMaxScaler(["r", "i"]), MinMaxScaler(["u"]), MinMaxScaler(["r"])]
+
+    expected = _streaming_pipeline(tmp_path / "a.csv", transforms()).run()
+    pipeline = _streaming_pipeline(tmp_path / "a.csv", transforms())
+    chunks = list(pipeline.run_streaming(chunksize=3))
+
+    assert [len(c) for c in chunks] == [3, 3, 3, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+
+def test_pipeline_run_to_parquet(tmp_path):
+    pipeline = _streaming_pipeline(tmp_path / "a.csv", [MinMaxScaler(["r"])])
+    out = tmp_path / "out.parquet"
+
+    assert pipeline.run_to_parquet(out, chunksize=4) == 10
+    written = pd.read_parquet(out)
+    assert written["r"].min() == pytest.approx(0.0)
+    assert written["r"].max() == pytest.approx(1.0)
+    assert len(written) == 10
+
+
+def test_fit_streaming_requires_partial_fit(tmp_path):
+    pipeline = _streaming_pipeline(tmp_path / "a.csv", [_Negate()])
+    with pytest.raises(NotImplementedError):
+        pipeline.fit_streaming()
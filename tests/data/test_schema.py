@@ -14,3 +14,9 @@ def test_rating_schema_raises():
     schema = RatingSchema(user="u", item="i", rating="r")
     with pytest.raises(ValueError):
         schema.validate(df)
+
+
+def test_rating_schema_compact_dtypes():
+    schema = RatingSchema(user="u", item="i", rating="r", timestamp="t")
+    assert schema.compact_dtypes() == {"u": "category", "i": "category", "r": "float32"}
+    assert schema.compact_dtypes(id_dtype="int32")["u"] == "int32"
@@ -0,0 +1,169 @@
+import pickle
+
+import pandas as pd
+import pytest
+
+from recommender_universal.data.connectors.cache import DiskCache
+from recommender_universal.data.connectors.csv import CSVConnector
+from recommender_universal.data.pipeline import DataPipeline
+from recommender_universal.data.schema import RatingSchema
+from recommender_universal.data.transforms.encoding import IdEncoder
+from recommender_universal.data.transforms.numerical import MinMaxScaler
+
+fits = []
+
+
+class CountingScaler(MinMaxScaler):
+    def fit(self, df):
+        fits.append(tuple(self.columns))
+        return super().fit(df)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "ratings.csv"
+    pd.DataFrame(
+        {"u": [1, 2, 3, 4], "i": [5, 6, 7, 9], "r": [1.0, 3.0, 2.0, 5.0]}
+    ).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    calls = []
+    original = CSVConnector._read
+
+    def counting(self, uri, **kwargs):
+        calls.append(uri)
+        return original(self, uri, **kwargs)
+
+    monkeypatch.setattr(CSVConnector, "_read", counting)
+    fits.clear()
+    return calls
+
+
+def _pipeline(path, cache, transforms=None):
+    return DataPipeline(
+        connector=CSVConnector(),
+        schema=RatingSchema(user="u", item="i", rating="r"),
+        uri=str(path),
+        transforms=transforms
+        or [CountingScaler(["r"]), CountingScaler(["u"]), CountingScaler(["i"])],
+        stage_cache=cache,
+    )
+
+
+def test_unchanged_pipeline_loads_from_cache(tmp_path, csv_path, reads):
+    cache = tmp_path / "stages"
+    expected = _pipeline(csv_path, cache).run()
+    assert len(reads) == 1 and len(fits) == 3
+
+    pipeline = _pipeline(csv_path, cache)
+    out = pipeline.run()
+
+    assert len(reads) == 1 and len(fits) == 3
+    pd.testing.assert_frame_equal(out, expected)
+    # Fitted state is restored, so the pipeline can transform more data
+    assert pipeline.transforms[0].maxs == {"r": 5.0}
+    chunks = pd.concat(pipeline.iter_chunks(chunksize=2))
+    pd.testing.assert_frame_equal(chunks, expected)
+
+
+def test_state_restored_without_pickle(tmp_path, csv_path, reads, monkeypatch, caplog):
+    cache = tmp_path / "stages"
+    expected = _pipeline(csv_path, cache, [IdEncoder("u", "i"), MinMaxScaler(["r"])])
+    expected.run()
+
+    def refuse(*args, **kwargs):
+        raise AssertionError("stage cache must not unpickle")
+
+    monkeypatch.setattr(pickle, "loads", refuse)
+    monkeypatch.setattr(pickle, "load", refuse)
+    pipeline = _pipeline(csv_path, cache, [IdEncoder("u", "i"), MinMaxScaler(["r"])])
+    pipeline.run()
+
+    assert len(reads) == 1
+    assert "reusing 2 of 2" in caplog.text
+    restored, fitted = pipeline.transforms[0], expected.transforms[0]
+    assert restored.items.values.tolist() == fitted.items.values.tolist()
+    assert restored.items.lookup([9]).tolist() == [3]
+    assert pipeline.transforms[1].mins == {"r": 1.0}
+
+
+def test_changed_step_reruns_only_downstream(tmp_path, csv_path, reads):
+    cache = tmp_path / "stages"
+    _pipeline(csv_path, cache).run()
+    fits.clear()
+
+    transforms = [
+        CountingScaler(["r"]),
+        CountingScaler(["u", "r"]),
+        CountingScaler(["i"]),
+    ]
+    out = _pipeline(csv_path, cache, transforms).run()
+
+    assert fits == [("u", "r"), ("i",)]
+    assert len(reads) == 1
+    assert out["r"].tolist() == pytest.approx([0.0, 0.5, 0.25, 1.0])
+
+
+def test_changed_source_invalidates(tmp_path, csv_path, reads):
+    cache = tmp_path / "stages"
+    _pipeline(csv_path, cache).run()
+    pd.DataFrame({"u": [1, 2], "i": [5, 6], "r": [2.0, 4.0]}).to_csv(
+        csv_path, index=False
+    )
+
+    out = _pipeline(csv_path, cache).run()
+
+    assert len(reads) == 2 and len(fits) == 6
+    assert len(out) == 2
+
+
+def test_refit_of_same_instance_hits_cache(tmp_path, csv_path, reads):
+    pipeline = _pipeline(csv_path, tmp_path / "stages")
+    expected = pipeline.run()
+    out = pipeline.run(fit=True)
+
+    assert len(reads) == 1 and len(fits) == 3
+    pd.testing.assert_frame_equal(out, expected)
+    assert pipeline.transforms[0].config() == {"columns": ["r"]}
+
+
+def test_fitted_state_is_part_of_key_without_fit(tmp_path, csv_path, reads):
+    cache = tmp_path / "stages"
+    pipeline = _pipeline(csv_path, cache, [MinMaxScaler(["r"])])
+    pipeline.run()
+    first = pipeline.run(fit=False)
+    pipeline.transforms[0].maxs["r"] = 9.0
+    second = pipeline.run(fit=False)
+
+    assert first["r"].max() == pytest.approx(1.0)
+    assert second["r"].max() == pytest.approx(4.0 / 8.0)
+
+
+def test_restored_state_keys_like_fitted_state(tmp_path, csv_path, reads, caplog):
+    cache = tmp_path / "stages"
+    first = _pipeline(csv_path, cache, [MinMaxScaler(["r"])])
+    first.run()
+    expected = first.run(fit=False)
+
+    # As in a new process: the state comes back from the cache
+    second = _pipeline(csv_path, cache, [MinMaxScaler(["r"])])
+    second.run()
+    caplog.clear()
+    out = second.run(fit=False)
+
+    assert "reusing 1 of 1" in caplog.text
+    assert len(reads) == 1
+    pd.testing.assert_frame_equal(out, expected)
+
+
+def test_evicted_entries_are_recomputed(tmp_path, csv_path, reads):
+    cache = DiskCache(tmp_path / "stages", max_bytes=0)
+    expected = _pipeline(csv_path, cache).run()
+    out = _pipeline(csv_path, cache).run()
+
+    assert cache.size_bytes == 0
+    assert len(reads) == 2
+    pd.testing.assert_frame_equal(out, expected)
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from recommender_universal.data.transforms.numerical import MinMaxScaler
 import pytest
@@ -12,3 +13,21 @@ def test_minmax_scaler():
     assert df_scaled["a"].max() == pytest.approx(1.0)
     assert df_scaled["b"].min() == pytest.approx(0.0)
     assert df_scaled["b"].max() == pytest.approx(1.0)
+
+
+def test_minmax_transform_inplace_matches_transform():
+    df = pd.DataFrame({"a": [0.0, 3.0, 7.0, 20.0]})
+    scaler = MinMaxScaler(columns=["a"]).fit(df)
+    buffers = {"a": df["a"].to_numpy(dtype=np.float32)}
+    scaler.transform_inplace(buffers)
+
+    assert buffers["a"].dtype == np.float32
+    np.testing.assert_allclose(buffers["a"], scaler.transform(df)["a"], rtol=1e-6)
+
+
+def test_minmax_partial_fit_merges_chunks():
+    df = pd.DataFrame({"a": [4.0, -2.0, 9.0, 1.0, 3.0]})
+    scaler = MinMaxScaler(columns=["a"]).fit(df.iloc[:2])
+    scaler.partial_fit(df.iloc[2:4]).partial_fit(df.iloc[4:])
+
+    assert scaler.mins == {"a": -2.0} and scaler.maxs == {"a": 9.0}
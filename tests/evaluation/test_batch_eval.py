@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recommender_universal.evaluation.batch_eval import (
+    evaluate_batch,
+    evaluate_metrics,
+    per_user_scores,
+)
+from recommender_universal.evaluation.metrics import (
+    average_precision_at_k,
+    hit_rate_at_k,
+    ndcg_at_k,
+    precision_at_k,
+    recall_at_k,
+)
+from recommender_universal.models.advanced.matrix_factorization import (
+    MatrixFactorization,
+)
+
+METRICS = {
+    "hit_rate": hit_rate_at_k,
+    "precision": precision_at_k,
+    "recall": recall_at_k,
+    "map": average_precision_at_k,
+    "ndcg": ndcg_at_k,
+}
+
+
+@pytest.fixture
+def interactions():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 40, 400),
+            "item_id": rng.integers(0, 25, 400),
+            "rating": rng.integers(1, 6, 400).astype(float),
+        }
+    )
+
+
+def _loop_reference(df, model, k, metric_fn):
+    scores = []
+    for user in df["user_id"].unique():
+        relevant = set(df[df["user_id"] == user]["item_id"])
+        scores.append(metric_fn(model.recommend(user, k), relevant, k))
+    return sum(scores) / len(scores)
+
+
+def test_evaluate_metrics_matches_per_user_loop(interactions):
+    model = MatrixFactorization(factors=4, epochs=2, shuffle_seed=0).fit(interactions)
+    results = evaluate_metrics(
+        interactions, model, 5, METRICS, "user_id", "item_id", batch_size=7
+    )
+    for name, metric_fn in METRICS.items():
+        expected = _loop_reference(interactions, model, 5, metric_fn)
+        assert results[name] == pytest.approx(expected, rel=1e-12)
+
+
+def test_kernel_path_matches_per_user_metric_calls(interactions):
+    model = MatrixFactorization(factors=4, epochs=2, shuffle_seed=0).fit(interactions)
+    # Wrapping the raw metrics hides them from the kernel
+    wrapped = {
+        name: (lambda fn: lambda rec, rel, k: fn(rec, rel, k))(fn)
+        for name, fn in METRICS.items()
+    }
+    args = (interactions, model, 8, "user_id", "item_id")
+    users, fast = per_user_scores(*args[:3], METRICS, *args[3:], batch_size=9)
+    _, slow = per_user_scores(*args[:3], wrapped, *args[3:], batch_size=9)
+    assert users.tolist() == interactions["user_id"].unique().tolist()
+    for name in METRICS:
+        np.testing.assert_array_equal(fast[name], slow[name])
+
+
+def test_recommend_batch_used_once_per_user(interactions):
+    class Counting:
+        def __init__(self):
+            self.batches = []
+
+        def recommend(self, user, k):
+            raise AssertionError("recommend_batch should be used")
+
+        def recommend_batch(self, users, k):
+            self.batches.append(list(users))
+            return [[0, 1, 2][:k] for _ in users]
+
+    model = Counting()
+    evaluate_metrics(
+        interactions, model, 3, METRICS, "user_id", "item_id", batch_size=16
+    )
+    called = [u for batch in model.batches for u in batch]
+    assert called == interactions["user_id"].unique().tolist()
+    assert max(len(batch) for batch in model.batches) == 16
+
+
+def test_evaluate_batch_empty_frame():
+    class Dummy:
+        def recommend(self, u, k):
+            return []
+
+    df = pd.DataFrame({"user_id": [], "item_id": []})
+    assert evaluate_batch(df, Dummy(), 3, hit_rate_at_k, "user_id", "item_id") == 0.0
+    assert evaluate_metrics(df, Dummy(), 3, METRICS, "user_id", "item_id") == {
+        name: 0.0 for name in METRICS
+    }
@@ -1,9 +1,13 @@
+import numpy as np
 import pandas as pd
 import math
 import pytest
 
 from recommender_universal.evaluation.metrics import (
+    batch_metrics_at_k,
     hit_rate_at_k,
+    precision_at_k,
+    recall_at_k,
     average_precision_at_k,
     ndcg_at_k,
 )
@@ -103,3 +107,39 @@ def test_evaluate_batch_average_precision():
     # For user 1: rec=[2,1], relevant={1,2}
     # AP = (1/1 + 2/2)/2 = (1 + 1)/2 = 1.0
     assert pytest.approx(ap, rel=1e-6) == 1.0
+
+
+# Vectorized kernel tests
+
+
+def test_batch_metrics_match_raw_metrics_exactly():
+    rng = np.random.default_rng(0)
+    n_users, n_items, k = 300, 15, 6
+    # Duplicates, -1 padding and users with no relevant items included
+    recommended = rng.integers(0, n_items, (n_users, k + 2))
+    recommended[np.arange(k + 2) >= rng.integers(0, k + 3, n_users)[:, None]] = -1
+    lengths = rng.integers(0, 8, n_users)
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+    indices = rng.integers(0, n_items, indptr[-1])
+
+    results = batch_metrics_at_k(recommended, indptr, indices, k)
+
+    raw = {
+        "hit_rate": hit_rate_at_k,
+        "precision": precision_at_k,
+        "recall": recall_at_k,
+        "map": average_precision_at_k,
+        "ndcg": ndcg_at_k,
+    }
+    for u in range(n_users):
+        rec = [i for i in recommended[u].tolist() if i >= 0]
+        relevant = set(indices[indptr[u] : indptr[u + 1]].tolist())
+        for name, metric_fn in raw.items():
+            assert results[name][u] == metric_fn(rec, relevant, k), (name, u)
+
+
+def test_batch_metrics_subset_and_validation():
+    results = batch_metrics_at_k(np.array([[0, 1]]), [0, 1], [1], 2, ["ndcg"])
+    assert list(results) == ["ndcg"]
+    with pytest.raises(ValueError):
+        batch_metrics_at_k(np.array([[0]]), [0, 1], [0], 1, ["mrr"])
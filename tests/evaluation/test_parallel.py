@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from recommender_universal.evaluation.batch_eval import evaluate_metrics
+from recommender_universal.evaluation.metrics import (
+    average_precision_at_k,
+    hit_rate_at_k,
+    ndcg_at_k,
+    recall_at_k,
+)
+from recommender_universal.evaluation.parallel import exact_partials, parallel_evaluate
+from recommender_universal.models.advanced.matrix_factorization import (
+    MatrixFactorization,
+)
+from recommender_universal.models.baseline.top_popular import TopPopularRecommender
+
+METRICS = {
+    "hit_rate": hit_rate_at_k,
+    "recall": recall_at_k,
+    "map": average_precision_at_k,
+    "ndcg": ndcg_at_k,
+}
+
+
+@pytest.fixture
+def interactions():
+    rng = np.random.default_rng(1)
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 60, 600),
+            "item_id": rng.integers(0, 30, 600),
+            "rating": rng.integers(1, 6, 600).astype(float),
+        }
+    )
+
+
+def test_exact_partials_reduce_independently_of_sharding():
+    rng = np.random.default_rng(0)
+    values = (rng.random(1000) * 10.0 ** rng.integers(-8, 8, 1000)).tolist()
+    expected = math.fsum(values)
+    for n_shards in (1, 3, 17):
+        partials = []
+        for shard in np.array_split(np.array(values), n_shards):
+            partials.extend(exact_partials(shard.tolist()))
+        assert math.fsum(partials) == expected
+    assert exact_partials([]) == []
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_parallel_matches_serial_evaluation(interactions, n_jobs):
+    model = MatrixFactorization(factors=4, epochs=2, shuffle_seed=0).fit(interactions)
+    results = parallel_evaluate(
+        interactions, model, [3, 10], METRICS, n_jobs=n_jobs, shard_size=7, batch_size=4
+    )
+    for k in (3, 10):
+        expected = evaluate_metrics(
+            interactions, model, k, METRICS, "user_id", "item_id"
+        )
+        assert results[k] == expected
+
+
+def test_parallel_falls_back_to_joblib_export(interactions):
+    # The window buckets are not array-artifact compatible
+    model = TopPopularRecommender(window=2).fit(interactions)
+    results = parallel_evaluate(interactions, model, [5], METRICS, n_jobs=2)
+    expected = evaluate_metrics(interactions, model, 5, METRICS, "user_id", "item_id")
+    assert results == {5: expected}
+
+
+def test_parallel_validates_arguments(interactions):
+    model = TopPopularRecommender().fit(interactions)
+    with pytest.raises(ValueError):
+        parallel_evaluate(interactions, model, [], METRICS)
+    with pytest.raises(ValueError):
+        parallel_evaluate(interactions, model, [0, 5], METRICS)
+    with pytest.raises(ValueError):
+        parallel_evaluate(interactions, model, [5], METRICS, n_jobs=0)
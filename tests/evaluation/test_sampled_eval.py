@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recommender_universal.evaluation.batch_eval import (
+    bootstrap_ci,
+    evaluate_metrics,
+    evaluate_with_ci,
+    per_user_scores,
+    sample_users,
+)
+from recommender_universal.evaluation.metrics import (
+    hit_rate_at_k,
+    ndcg_at_k,
+    recall_at_k,
+)
+from recommender_universal.models.advanced.matrix_factorization import (
+    MatrixFactorization,
+)
+
+METRICS = {"hit_rate": hit_rate_at_k, "recall": recall_at_k, "ndcg": ndcg_at_k}
+
+
+@pytest.fixture
+def interactions():
+    rng = np.random.default_rng(3)
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 400, 3000),
+            "item_id": rng.integers(0, 40, 3000),
+            "rating": rng.integers(1, 6, 3000).astype(float),
+        }
+    )
+
+
+@pytest.fixture
+def model(interactions):
+    return MatrixFactorization(factors=4, epochs=2, shuffle_seed=0).fit(interactions)
+
+
+def test_sample_users_is_deterministic_and_nested(interactions):
+    small = sample_users(interactions, "user_id", 0.2)
+    shuffled = sample_users(interactions.sample(frac=1, random_state=0), "user_id", 0.2)
+    large = sample_users(interactions, "user_id", 0.5)
+
+    small_users = set(small["user_id"])
+    assert small_users == set(shuffled["user_id"])
+    assert small_users < set(large["user_id"])
+    assert 0.1 < len(small_users) / interactions["user_id"].nunique() < 0.3
+    # Sampled users keep all of their rows
+    kept = interactions["user_id"].isin(small_users)
+    pd.testing.assert_frame_equal(small, interactions[kept])
+
+    other = sample_users(interactions, "user_id", 0.2, seed=1)
+    assert set(other["user_id"]) != small_users
+    assert len(sample_users(interactions, "user_id", 1.0)) == len(interactions)
+    with pytest.raises(ValueError):
+        sample_users(interactions, "user_id", 0.0)
+
+
+def test_sampled_negatives_cover_catalog_equals_full_ranking(interactions, model):
+    full = evaluate_metrics(interactions, model, 5, METRICS, "user_id", "item_id")
+    # With more negatives than items, every item is a candidate
+    sampled = evaluate_metrics(
+        interactions, model, 5, METRICS, "user_id", "item_id", n_negatives=1000
+    )
+    assert sampled == full
+
+
+def test_sampled_negatives_are_deterministic(interactions, model):
+    args = (interactions, model, 3, METRICS, "user_id", "item_id")
+    first = evaluate_metrics(*args, n_negatives=5, seed=7)
+    assert first == evaluate_metrics(*args, n_negatives=5, seed=7)
+    # Ranking among few negatives is easier than among the full catalog
+    assert first["hit_rate"] > evaluate_metrics(*args)["hit_rate"]
+
+
+def test_sampled_negatives_require_score(interactions):
+    class NoScore(MatrixFactorization):
+        def score(self, user_id, item_ids):
+            raise NotImplementedError
+
+    model = NoScore(factors=2, epochs=1).fit(interactions)
+    with pytest.raises(NotImplementedError):
+        per_user_scores(
+            interactions, model, 3, METRICS, "user_id", "item_id", n_negatives=5
+        )
+
+
+def test_bootstrap_ci():
+    values = np.random.default_rng(0).random(2000)
+    lower, upper = bootstrap_ci(values, n_resamples=300)
+    assert lower < values.mean() < upper
+    assert upper - lower < 0.05
+    assert bootstrap_ci(values, n_resamples=300) == (lower, upper)
+    assert bootstrap_ci(np.array([])) == (0.0, 0.0)
+    with pytest.raises(ValueError):
+        bootstrap_ci(values, confidence=1.0)
+
+
+def test_evaluate_with_ci_reuses_one_recommendation_run(interactions, model):
+    calls = []
+
+    class Counting:
+        item_ids = model.item_ids
+
+        def recommend_batch(self, users, k):
+            calls.extend(users)
+            return model.recommend_batch(users, k)
+
+    results = evaluate_with_ci(
+        interactions, Counting(), 5, METRICS, "user_id", "item_id", n_resamples=200
+    )
+    assert len(calls) == interactions["user_id"].nunique()
+    means = evaluate_metrics(interactions, model, 5, METRICS, "user_id", "item_id")
+    for name, result in results.items():
+        assert result["mean"] == means[name]
+        assert result["lower"] <= result["mean"] <= result["upper"]
@@ -1,8 +1,12 @@
+import numpy as np
 import pandas as pd
 import pytest
 
-from recommender_universal.evaluation.batch_eval import stratified_evaluation
-from recommender_universal.evaluation.metrics import hit_rate_at_k
+from recommender_universal.evaluation.batch_eval import (
+    evaluate_batch,
+    stratified_evaluation,
+)
+from recommender_universal.evaluation.metrics import hit_rate_at_k, ndcg_at_k
 
 
 class DummyModel:
@@ -65,3 +69,60 @@ def test_stratified_by_time_period():
     assert pytest.approx(results[months[0]], rel=1e-6) == 1.0
     assert pytest.approx(results[months[1]], rel=1e-6) == 0.0
     assert pytest.approx(results[months[2]], rel=1e-6) == 0.0
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    def recommend(self, user, k):
+        self.calls += 1
+        return [(user + i) % 7 for i in range(k)]
+
+
+def _per_group_reference(df, k, metric_fn, group_col):
+    return {
+        group: evaluate_batch(g, CountingModel(), k, metric_fn, "user_id", "item_id")
+        for group, g in df.groupby(group_col)
+    }
+
+
+@pytest.mark.parametrize("metric_fn", [hit_rate_at_k, ndcg_at_k, lambda r, s, k: 0.5])
+def test_stratified_recommends_once_per_user(metric_fn):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 30, 500),
+            "item_id": rng.integers(0, 7, 500),
+            "timestamp": pd.Timestamp("2025-01-01")
+            + pd.to_timedelta(rng.integers(0, 365, 500), unit="D"),
+        },
+        index=rng.integers(0, 5, 500),  # unsorted, duplicate labels
+    )
+    grouper = pd.Grouper(key="timestamp", freq="ME")
+    model = CountingModel()
+
+    results = stratified_evaluation(
+        df, model, 3, metric_fn, "user_id", "item_id", grouper, batch_size=8
+    )
+
+    assert model.calls == df["user_id"].nunique()
+    assert results == _per_group_reference(df, 3, metric_fn, grouper)
+    assert len(results) == 12
+
+
+def test_stratified_by_index_grouper_keeps_empty_bins():
+    df = pd.DataFrame(
+        {"user_id": [1, 2, 3], "item_id": [1, 2, 3]},
+        index=pd.to_datetime(["2025-01-05", "2025-03-01", "2025-01-20"]),
+    )
+    results = stratified_evaluation(
+        df,
+        CountingModel(),
+        2,
+        hit_rate_at_k,
+        "user_id",
+        "item_id",
+        pd.Grouper(freq="ME"),
+    )
+    assert list(results.values()) == [1.0, 0.0, 1.0]
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from recommender_universal.models.advanced.als import AlternatingLeastSquares
+from recommender_universal.models.registry import load_model
+
+
+@pytest.fixture
+def implicit_df():
+    # Two clusters of users with disjoint item tastes
+    return pd.DataFrame(
+        {
+            "user_id": [1, 1, 1, 2, 2, 3, 3, 4, 4, 4, 5, 5],
+            "item_id": ["A", "B", "C", "A", "B", "B", "C", "X", "Y", "Z", "X", "Y"],
+            "rating": [1, 2, 1, 1, 1, 3, 1, 1, 1, 2, 1, 1],
+        }
+    )
+
+
+def test_als_registered():
+    model = load_model("als", factors=4)
+    assert isinstance(model, AlternatingLeastSquares)
+
+
+def test_als_fit_and_recommend(implicit_df):
+    model = AlternatingLeastSquares(
+        factors=2, iterations=10, regularization=0.1, random_state=0
+    )
+    model.fit(implicit_df)
+
+    recs = model.recommend(user_id=2, k=3)
+    assert len(recs) == 3
+    assert set(recs) == {"A", "B", "C"}
+    assert set(model.recommend(user_id=5, k=3)) == {"X", "Y", "Z"}
+    assert model.recommend(user_id=999) == []
+
+
+def test_cg_matches_exact_solver(implicit_df):
+    kwargs = dict(factors=3, iterations=2, regularization=0.1, random_state=1)
+    exact = AlternatingLeastSquares(solver="cholesky", **kwargs).fit(implicit_df)
+    # Enough conjugate-gradient steps converge to the closed-form solution
+    cg = AlternatingLeastSquares(
+        solver="cg", cg_steps=10, block_size=2, n_threads=2, **kwargs
+    ).fit(implicit_df)
+
+    np.testing.assert_allclose(cg.user_factors, exact.user_factors, atol=1e-3)
+    np.testing.assert_allclose(cg.item_factors, exact.item_factors, atol=1e-3)
+
+
+def test_invalid_solver():
+    with pytest.raises(ValueError):
+        AlternatingLeastSquares(solver="lu")
@@ -0,0 +1,98 @@
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from recommender_universal.models.base import BaseRecommender
+from recommender_universal.models.advanced.matrix_factorization import (
+    MatrixFactorization,
+)
+from recommender_universal.models.baseline.top_popular import TopPopularRecommender
+from recommender_universal.models.retrieval import IVFIndex
+from recommender_universal.utils.artifacts import IdMap
+
+
+@pytest.fixture
+def ratings_df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 20, 200),
+            "item_id": [f"item{i}" for i in rng.integers(0, 40, 200)],
+            "rating": rng.integers(1, 6, 200).astype(float),
+        }
+    )
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_npy_artifact_round_trip(tmp_path, ratings_df, mmap):
+    model = MatrixFactorization(factors=3, epochs=2, shuffle_seed=0).fit(ratings_df)
+    model.build_index(IVFIndex(n_lists=4, nprobe=2, seed=0))
+    model.save(str(tmp_path), model_name="mf", use_npy=True)
+
+    version_dir = tmp_path / "mf" / "v1"
+    assert (version_dir / "manifest.json").exists()
+    assert not (version_dir / "model.joblib").exists()
+    assert json.loads((version_dir / "config.json").read_text())["format"] == "npy"
+    assert (version_dir / "arrays" / "user_factors.npy").exists()
+
+    loaded = BaseRecommender.load(str(tmp_path), model_name="mf", mmap=mmap)
+    assert isinstance(loaded, MatrixFactorization)
+    assert isinstance(loaded.user_factors, np.memmap) is mmap
+    assert isinstance(loaded.index.list_vectors, np.memmap) is mmap
+    assert loaded.user_map == model.user_map
+    assert loaded.item_map == model.item_map
+    assert loaded.epochs == 2 and loaded.engine == "vectorized"
+
+    users = list(model.user_map)
+    assert loaded.recommend_batch(users, k=5) == model.recommend_batch(users, k=5)
+    assert loaded.recommend(users[0], k=5, exact=True, exclude_seen=True) == (
+        model.recommend(users[0], k=5, exact=True, exclude_seen=True)
+    )
+
+
+def test_id_maps_load_lazily(tmp_path, ratings_df):
+    model = MatrixFactorization(factors=3, epochs=1).fit(ratings_df)
+    model.save(str(tmp_path), model_name="mf", use_npy=True)
+
+    loaded = BaseRecommender.load(str(tmp_path), model_name="mf", mmap=True)
+    assert isinstance(loaded.user_map, IdMap)
+    assert isinstance(loaded.user_map.keys_array, np.memmap)
+    assert len(loaded.user_map) == len(model.user_map)
+    assert not loaded.user_map.built
+
+    # Saving again copies the key array without building the dict
+    loaded.save(str(tmp_path), model_name="mf", use_npy=True)
+    assert not loaded.user_map.built
+
+    user = next(iter(model.user_map))
+    assert loaded.recommend(user, k=5) == model.recommend(user, k=5)
+    assert loaded.user_map.built
+    assert pickle.loads(pickle.dumps(loaded.user_map)) == model.user_map
+
+
+def test_npy_artifact_plain_attributes(tmp_path):
+    df = pd.DataFrame({"item_id": [10, 10, 20, 30, 20, 10]})
+    model = TopPopularRecommender().fit(df)
+    model.save(str(tmp_path), model_name="tp", use_npy=True)
+
+    loaded = BaseRecommender.load(str(tmp_path), model_name="tp")
+    assert loaded.recommend(1, k=2) == model.recommend(1, k=2)
+
+
+def test_npy_artifact_rejects_unsupported_state(tmp_path):
+    df = pd.DataFrame({"item_id": [10, 20]})
+    model = TopPopularRecommender().fit(df)
+    model.callback = lambda: None
+    with pytest.raises(TypeError):
+        model.save(str(tmp_path), model_name="tp", use_npy=True)
+    # The half-written version is removed
+    assert list((tmp_path / "tp").iterdir()) == []
+
+
+def test_npy_artifact_rejects_lossy_ids(tmp_path):
+    df = pd.DataFrame({"user_id": [1, 2], "item_id": [1, "one"], "rating": [1.0, 2.0]})
+    model = MatrixFactorization(factors=2, epochs=1).fit(df)
+    with pytest.raises(TypeError):
+        model.save(str(tmp_path), model_name="mf", use_npy=True)
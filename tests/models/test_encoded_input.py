@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recommender_universal.data.transforms.encoding import IdEncoder
+from recommender_universal.models.advanced.als import AlternatingLeastSquares
+from recommender_universal.models.advanced.matrix_factorization import (
+    MatrixFactorization,
+)
+from recommender_universal.models.base import BaseRecommender
+
+
+@pytest.fixture
+def ratings_df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "user_id": rng.choice(["u%d" % i for i in range(20)], 300),
+            "item_id": rng.integers(100, 130, 300),
+            "rating": rng.integers(1, 6, 300).astype(float),
+        }
+    )
+
+
+def _fit_pair(model_cls, df, **params):
+    np.random.seed(0)
+    plain = model_cls(factors=4, **params).fit(df)
+    encoder = IdEncoder()
+    encoded = encoder.fit_transform(df)
+    np.random.seed(0)
+    model = model_cls(factors=4, **params).use_encoder(encoder).fit(encoded)
+    return plain, model
+
+
+@pytest.mark.parametrize(
+    "model_cls, params",
+    [
+        (MatrixFactorization, {"epochs": 3, "shuffle_seed": 0}),
+        (AlternatingLeastSquares, {"iterations": 2, "random_state": 0}),
+    ],
+)
+def test_encoded_fit_matches_raw_fit(ratings_df, model_cls, params):
+    plain, model = _fit_pair(model_cls, ratings_df, **params)
+
+    assert model.user_map == plain.user_map
+    np.testing.assert_array_equal(model.user_factors, plain.user_factors)
+    users = ["u3", "u7", "nobody"]
+    assert model.recommend_batch(users, k=5) == plain.recommend_batch(users, k=5)
+    np.testing.assert_array_equal(
+        model.score("u3", [100, 999]), plain.score("u3", [100, 999])
+    )
+
+
+def test_partial_fit_with_appended_ids(ratings_df):
+    encoder = IdEncoder(handle_unknown="append")
+    model = MatrixFactorization(factors=4, epochs=2).use_encoder(encoder)
+    model.fit(encoder.fit_transform(ratings_df))
+
+    new = pd.DataFrame({"user_id": ["new"], "item_id": [999], "rating": [5.0]})
+    model.partial_fit(encoder.transform(new))
+
+    assert model.user_map["new"] == len(model.user_map) - 1
+    assert model.item_ids[-1] == 999
+    assert len(model.user_factors) == len(encoder.users)
+    # IDs the encoder learns after fitting are unknown to the model
+    encoder.transform(pd.DataFrame({"user_id": ["later"], "item_id": [1000]}))
+    assert model.recommend_batch(["later"], k=3) == [[]]
+
+
+def test_fold_in_appends_user_to_encoder(ratings_df):
+    encoder = IdEncoder(handle_unknown="append")
+    model = MatrixFactorization(factors=4, epochs=2).use_encoder(encoder)
+    model.fit(encoder.fit_transform(ratings_df))
+
+    model.fold_in("folded", [100, 101])
+    assert encoder.users.lookup(["folded"])[0] == model.user_map["folded"]
+    assert model.recommend_batch(["folded"], k=5) == [model.recommend("folded", k=5)]
+
+    # A user appended later gets a fresh code, not the folded-in user's row
+    encoder.transform(pd.DataFrame({"user_id": ["later"], "item_id": [100]}))
+    assert encoder.users.lookup(["later"])[0] == len(model.user_map)
+    assert model.recommend_batch(["later"], k=5) == [[]]
+
+
+def test_fold_in_rejects_encoder_ahead_of_model(ratings_df):
+    encoder = IdEncoder(handle_unknown="append")
+    model = MatrixFactorization(factors=4, epochs=2).use_encoder(encoder)
+    model.fit(encoder.fit_transform(ratings_df))
+    encoder.transform(pd.DataFrame({"user_id": ["pending"], "item_id": [100]}))
+
+    with pytest.raises(ValueError, match="partial_fit"):
+        model.fold_in("folded", [100])
+    assert "folded" not in model.user_map
+
+
+def test_encoder_saved_with_model(tmp_path, ratings_df):
+    _, model = _fit_pair(MatrixFactorization, ratings_df, epochs=1)
+    model.save(str(tmp_path), model_name="mf", use_npy=True)
+    loaded = BaseRecommender.load(str(tmp_path), "mf", mmap=True)
+
+    assert loaded.encoder.users.values.tolist() == model.encoder.users.values.tolist()
+    assert loaded.recommend_batch(["u1"], k=3) == model.recommend_batch(["u1"], k=3)
+
+
+def test_rejects_unknown_codes(ratings_df):
+    encoder = IdEncoder(handle_unknown="ignore").fit(ratings_df.iloc[:10])
+    model = MatrixFactorization(factors=4).use_encoder(encoder)
+    with pytest.raises(ValueError):
+        model.fit(encoder.transform(ratings_df))
+
+
+def test_reference_engine_rejects_encoder():
+    with pytest.raises(NotImplementedError):
+        MatrixFactorization(engine="reference").use_encoder(IdEncoder())
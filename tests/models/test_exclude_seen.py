@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+from recommender_universal.models.advanced.matrix_factorization import (
+    MatrixFactorization,
+)
+from recommender_universal.models.advanced.als import AlternatingLeastSquares
+from recommender_universal.models.retrieval import IVFIndex
+
+
+@pytest.fixture
+def ratings_df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 20, 300),
+            "item_id": rng.integers(0, 30, 300),
+            "rating": rng.integers(1, 6, 300).astype(float),
+        }
+    )
+
+
+def test_history_csr_matches_interactions(ratings_df):
+    model = MatrixFactorization(factors=3, epochs=1).fit(ratings_df)
+    assert model.seen_indptr.dtype == np.int32
+    assert model.seen_indices.dtype == np.int32
+
+    for user, group in ratings_df.groupby("user_id"):
+        u = model.user_map[user]
+        seen = model.seen_indices[model.seen_indptr[u] : model.seen_indptr[u + 1]]
+        assert set(model.item_ids[seen]) == set(group["item_id"])
+
+
+@pytest.mark.parametrize("model_cls", [MatrixFactorization, AlternatingLeastSquares])
+def test_exclude_seen_filters_history(ratings_df, model_cls):
+    model = model_cls(factors=3).fit(ratings_df)
+    n_items = ratings_df["item_id"].nunique()
+
+    for user, group in ratings_df.groupby("user_id"):
+        recs = model.recommend(user, k=n_items, exclude_seen=True)
+        unseen = set(ratings_df["item_id"]) - set(group["item_id"])
+        assert set(recs) == unseen
+        # Unfiltered ranking minus the history keeps the same order
+        full = model.recommend(user, k=n_items)
+        assert recs == [i for i in full if i in unseen]
+
+
+def test_exclude_seen_batch_and_index(ratings_df):
+    model = MatrixFactorization(factors=3, epochs=2).fit(ratings_df)
+    users = sorted(ratings_df["user_id"].unique())
+    expected = [model.recommend(u, k=5, exclude_seen=True) for u in users]
+
+    assert model.recommend_batch(users, k=5, exclude_seen=True) == expected
+
+    model.build_index(IVFIndex(n_lists=3, nprobe=3, seed=0))
+    assert model.recommend_batch(users, k=5, exclude_seen=True) == expected
+
+
+def test_history_saved_and_memory_mapped(tmp_path, ratings_df):
+    model = MatrixFactorization(factors=3, epochs=1).fit(ratings_df)
+    model.save(str(tmp_path), model_name="mf")
+
+    loaded = MatrixFactorization.load(str(tmp_path), model_name="mf", mmap=True)
+    assert isinstance(loaded.seen_indices, np.memmap)
+    np.testing.assert_array_equal(loaded.seen_indices, model.seen_indices)
+    assert loaded.recommend(0, k=5, exclude_seen=True) == model.recommend(
+        0, k=5, exclude_seen=True
+    )
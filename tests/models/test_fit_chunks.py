@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recommender_universal.models.advanced.als import AlternatingLeastSquares
+from recommender_universal.models.advanced.matrix_factorization import (
+    MatrixFactorization,
+)
+from recommender_universal.models.baseline.top_popular import TopPopularRecommender
+
+
+@pytest.fixture
+def interactions():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 30, 500),
+            "item_id": rng.integers(0, 40, 500),
+            "rating": rng.integers(1, 6, 500).astype(float),
+        }
+    )
+
+
+def _chunks(df, size):
+    return (df.iloc[start : start + size] for start in range(0, len(df), size))
+
+
+def test_top_popular_fit_chunks_matches_fit(interactions):
+    streamed = TopPopularRecommender().fit_chunks(_chunks(interactions, 64))
+    full = TopPopularRecommender().fit(interactions)
+    assert streamed.recommend(0, k=40) == full.recommend(0, k=40)
+
+
+def test_mf_fit_chunks_covers_every_id(interactions):
+    model = MatrixFactorization(factors=3, epochs=1).fit_chunks(
+        _chunks(interactions, 100)
+    )
+    assert set(model.user_map) == set(interactions["user_id"])
+    assert set(model.item_map) == set(interactions["item_id"])
+
+
+def test_fit_chunks_requires_partial_fit(interactions):
+    with pytest.raises(NotImplementedError):
+        AlternatingLeastSquares().fit_chunks(_chunks(interactions, 100))
+    with pytest.raises(ValueError):
+        TopPopularRecommender().fit_chunks([])
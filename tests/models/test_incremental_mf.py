@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+import pytest
+from recommender_universal.models.advanced.matrix_factorization import (
+    MatrixFactorization,
+)
+from recommender_universal.models.advanced.als import AlternatingLeastSquares
+from recommender_universal.models.retrieval import IVFIndex
+
+
+@pytest.fixture
+def base_df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 20, 300),
+            "item_id": rng.integers(0, 30, 300),
+            "rating": rng.integers(1, 6, 300).astype(float),
+        }
+    )
+
+
+@pytest.fixture
+def new_df():
+    return pd.DataFrame(
+        {
+            "user_id": [0, 100, 100, 101],
+            "item_id": [5, 5, 500, 501],
+            "rating": [5.0, 4.0, 3.0, 2.0],
+        }
+    )
+
+
+def test_partial_fit_extends_maps_and_factors(base_df, new_df):
+    model = MatrixFactorization(factors=3, epochs=2, shuffle_seed=0).fit(base_df)
+    user_map, item_map = dict(model.user_map), dict(model.item_map)
+    untouched = model.user_map[1]
+    before = model.user_factors.copy()
+
+    model.partial_fit(new_df, epochs=1)
+
+    # Existing rows keep their index; new ids are appended
+    assert all(model.user_map[u] == i for u, i in user_map.items())
+    assert all(model.item_map[i] == j for i, j in item_map.items())
+    assert model.user_map[100] == len(user_map)
+    assert model.item_ids[model.item_map[501]] == 501
+    assert model.user_factors.shape == (len(user_map) + 2, 3)
+    assert model.item_factors.shape == (len(item_map) + 2, 3)
+    # Only users present in the update moved
+    np.testing.assert_array_equal(model.user_factors[untouched], before[untouched])
+    touched = model.user_map[0]
+    assert not np.array_equal(model.user_factors[touched], before[touched])
+
+    assert model.recommend(101, k=50, exclude_seen=True).count(501) == 0
+    assert 500 in model.recommend(100, k=100)
+
+
+def test_warm_start_fit_keeps_factors(base_df, new_df):
+    model = MatrixFactorization(factors=3, epochs=1, warm_start=True).fit(base_df)
+    n_users = len(model.user_map)
+    model.fit(new_df)
+    assert len(model.user_map) == n_users + 2
+
+    cold = MatrixFactorization(factors=3, epochs=1).fit(base_df)
+    cold.fit(new_df)
+    assert len(cold.user_map) == 3
+
+
+def test_partial_fit_rebuilds_index(base_df, new_df):
+    model = MatrixFactorization(factors=3, epochs=1).fit(base_df)
+    model.build_index(IVFIndex(n_lists=2, nprobe=2, seed=0))
+    model.partial_fit(new_df)
+    assert model.index.list_offsets[-1] == len(model.item_map)
+    assert model.recommend(100, k=5) == model.recommend(100, k=5, exact=True)
+
+
+def test_partial_fit_on_memory_mapped_model(tmp_path, base_df, new_df):
+    model = MatrixFactorization(factors=3, epochs=1).fit(base_df)
+    model.save(str(tmp_path), model_name="mf", use_npy=True)
+    loaded = MatrixFactorization.load(str(tmp_path), model_name="mf", mmap=True)
+    loaded.partial_fit(new_df.iloc[:1])
+    assert loaded.user_factors.flags.writeable
+
+
+def test_fold_in_matches_ridge_solution(base_df):
+    model = MatrixFactorization(factors=3).fit(base_df)
+    items, ratings = [1, 2, 3, 999], [5.0, 1.0, 3.0, 4.0]
+
+    vector = model.fold_in("new-user", items, ratings, regularization=0.5)
+
+    q = model.item_factors[[model.item_map[i] for i in items[:3]]].astype(float)
+    expected = np.linalg.solve(q.T @ q + 0.5 * np.eye(3), q.T @ np.array(ratings[:3]))
+    np.testing.assert_allclose(vector, expected, rtol=1e-6)
+    np.testing.assert_allclose(
+        model.user_factors[model.user_map["new-user"]], expected, rtol=1e-5
+    )
+
+    recs = model.recommend("new-user", k=30, exclude_seen=True)
+    assert len(recs) == len(model.item_map) - 3
+    assert not {1, 2, 3} & set(recs)
+
+
+def test_als_fold_in_matches_implicit_solve(base_df):
+    model = AlternatingLeastSquares(factors=3, alpha=2.0, regularization=0.3)
+    model.fit(base_df)
+    items, ratings = [1, 2, 1, 3, 999], [5.0, 1.0, 2.0, 0.0, 4.0]
+
+    vector = model.fold_in("new-user", items, ratings)
+
+    # Item 1 appears twice: its confidences add up; item 3 (rating 0) and
+    # unknown item 999 only enter through the all-items Gram term
+    y = model.item_factors.astype(float)
+    y_obs = y[[model.item_map[1], model.item_map[2]]]
+    conf = np.array([(1 + 2.0 * 5.0) + (1 + 2.0 * 2.0), 1 + 2.0 * 1.0])
+    a = y.T @ y + (y_obs.T * (conf - 1)) @ y_obs + 0.3 * np.eye(3)
+    expected = np.linalg.solve(a, y_obs.T @ conf)
+    np.testing.assert_allclose(vector, expected, rtol=1e-6)
+    assert model.recommend("new-user", k=30, exclude_seen=True)
+
+
+def test_als_fold_in_reproduces_trained_users(base_df):
+    model = AlternatingLeastSquares(
+        factors=3, solver="cholesky", iterations=20, random_state=0
+    ).fit(base_df)
+    # One more user half-step against the final item factors
+    user = base_df["user_id"].iloc[0]
+    history = base_df[base_df["user_id"] == user]
+    trained = model.user_factors[model.user_map[user]].copy()
+
+    vector = model.fold_in(user, history["item_id"].tolist(), history["rating"])
+
+    np.testing.assert_allclose(vector, trained, rtol=0.05, atol=1e-3)
+
+
+def test_fold_in_requires_known_items(base_df):
+    model = MatrixFactorization(factors=3, epochs=1).fit(base_df)
+    with pytest.raises(ValueError):
+        model.fold_in("new-user", [999])
@@ -1,4 +1,9 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
+import pytest
 from recommender_universal.models.advanced.matrix_factorization import (
     MatrixFactorization,
 )
@@ -27,3 +32,120 @@ def test_matrix_factorization_fit_and_recommend():
     assert isinstance(recs, list)
     assert len(recs) == 2
     assert all(isinstance(item, str) for item in recs)
+
+
+def _rmse(model, df):
+    u = df["user_id"].map(model.user_map).to_numpy()
+    i = df["item_id"].map(model.item_map).to_numpy()
+    preds = np.einsum("ij,ij->i", model.user_factors[u], model.item_factors[i])
+    return float(np.sqrt(np.mean((df["rating"].to_numpy() - preds) ** 2)))
+
+
+def test_vectorized_engine_matches_reference_training_error():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 30, 600),
+            "item_id": rng.integers(0, 20, 600),
+            "rating": rng.integers(1, 6, 600).astype(float),
+        }
+    )
+
+    np.random.seed(1)
+    reference = MatrixFactorization(factors=4, lr=0.02, epochs=20, engine="reference")
+    reference.fit(df)
+
+    np.random.seed(1)
+    vectorized = MatrixFactorization(
+        factors=4, lr=0.02, epochs=20, batch_size=1, shuffle_seed=7
+    )
+    vectorized.fit(df)
+
+    assert vectorized.user_map == reference.user_map
+    assert vectorized.item_map == reference.item_map
+    assert vectorized.user_factors.dtype == np.float32
+    assert _rmse(vectorized, df) == pytest.approx(_rmse(reference, df), rel=0.05)
+
+
+def test_vectorized_engine_is_deterministic_with_shuffle_seed():
+    df = pd.DataFrame(
+        {
+            "user_id": [1, 1, 2, 2, 3, 3],
+            "item_id": ["A", "B", "A", "C", "B", "D"],
+            "rating": [5, 4, 3, 2, 4, 5],
+        }
+    )
+    runs = []
+    for _ in range(2):
+        np.random.seed(3)
+        model = MatrixFactorization(factors=3, epochs=5, batch_size=4, shuffle_seed=11)
+        runs.append(model.fit(df).item_factors)
+    np.testing.assert_array_equal(runs[0], runs[1])
+
+
+def test_invalid_engine():
+    with pytest.raises(ValueError):
+        MatrixFactorization(engine="gpu")
+
+
+def test_item_ids_cached_and_rebuilt_for_old_pickles():
+    df = pd.DataFrame(
+        {"user_id": [1, 1, 2], "item_id": ["A", "B", "C"], "rating": [5, 4, 3]}
+    )
+    model = MatrixFactorization(factors=2, epochs=2).fit(df)
+    assert model.item_ids.tolist() == ["A", "B", "C"]
+
+    # A model pickled before item_ids existed rebuilds it on unpickling
+    state = model.__dict__.copy()
+    del state["item_ids"], state["verbose"]
+    restored = MatrixFactorization.__new__(MatrixFactorization)
+    restored.__setstate__(state)
+    assert restored.item_ids.tolist() == ["A", "B", "C"]
+    assert restored.recommend(1, k=3) == model.recommend(1, k=3)
+
+
+def test_old_pickle_can_be_refit():
+    df = pd.DataFrame(
+        {"user_id": [1, 1, 2], "item_id": ["A", "B", "C"], "rating": [5, 4, 3]}
+    )
+    model = MatrixFactorization(factors=2, epochs=2).fit(df)
+    state = model.__dict__.copy()
+    for attr in ("batch_size", "shuffle_seed", "engine", "warm_start"):
+        del state[attr]
+    restored = MatrixFactorization.__new__(MatrixFactorization)
+    restored.__setstate__(state)
+
+    restored.fit(df)
+    assert restored.engine == "vectorized" and not restored.warm_start
+    assert restored.recommend(1, k=3)
+
+
+def test_repo_pickle_can_be_refit():
+    path = Path(__file__).resolve().parents[2] / "mf_model.pkl"
+    if not path.exists():
+        pytest.skip("mf_model.pkl not available")
+    with open(path, "rb") as f:
+        model = pickle.load(f)
+    user = next(iter(model.user_map))
+    assert model.recommend(user, k=3)
+
+    df = pd.DataFrame(
+        {"user_id": [1, 1, 2], "item_id": ["A", "B", "C"], "rating": [5, 4, 3]}
+    )
+    model.epochs = 1
+    assert model.fit(df).recommend(1, k=3)
+
+
+def test_recommend_logging_is_opt_in(caplog):
+    df = pd.DataFrame(
+        {"user_id": [1, 1, 2], "item_id": ["A", "B", "C"], "rating": [5, 4, 3]}
+    )
+    quiet = MatrixFactorization(factors=2, epochs=1).fit(df)
+    with caplog.at_level("INFO"):
+        quiet.recommend(1, k=2)
+    assert "Generating recommendations" not in caplog.text
+
+    chatty = MatrixFactorization(factors=2, epochs=1, verbose=True).fit(df)
+    with caplog.at_level("INFO"):
+        chatty.recommend(1, k=2)
+    assert "Generating recommendations for user_id=1" in caplog.text
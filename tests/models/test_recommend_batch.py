@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from recommender_universal.models.base import BaseRecommender
+from recommender_universal.utils.topk import top_k_indices
+from recommender_universal.models.advanced.matrix_factorization import (
+    MatrixFactorization,
+)
+from recommender_universal.models.baseline.top_popular import TopPopularRecommender
+
+
+@pytest.fixture
+def ratings_df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 40, 400),
+            "item_id": rng.integers(100, 160, 400),
+            "rating": rng.integers(1, 6, 400).astype(float),
+        }
+    )
+
+
+def test_default_recommend_batch_loops_over_recommend():
+    class Echo(BaseRecommender):
+        def fit(self, df):
+            return self
+
+        def recommend(self, user_id, k=5):
+            return [user_id] * k
+
+    assert Echo().recommend_batch([1, 2], k=2) == [[1, 1], [2, 2]]
+
+
+def test_top_k_indices_orders_best_first():
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [4.0, 3.0, 2.0, 1.0]])
+    np.testing.assert_array_equal(top_k_indices(scores, 2), [[1, 3], [0, 1]])
+    assert top_k_indices(scores, 10).shape == (2, 4)
+    assert top_k_indices(scores, 0).shape == (2, 0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+def test_mf_recommend_batch_matches_recommend(ratings_df, chunk_size):
+    model = MatrixFactorization(factors=4, epochs=3, shuffle_seed=0).fit(ratings_df)
+    users = [3, 999, 0, 17, 3]
+
+    batch = model.recommend_batch(users, k=5, chunk_size=chunk_size)
+
+    assert batch[1] == []
+    for user, recs in zip(users, batch):
+        assert recs == model.recommend(user, k=5)
+
+
+def test_top_popular_recommend_batch(ratings_df):
+    model = TopPopularRecommender().fit(ratings_df)
+    batch = model.recommend_batch([1, 2, 3], k=3)
+    assert batch == [model.recommend(1, k=3)] * 3
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from recommender_universal.models.advanced.matrix_factorization import (
+    MatrixFactorization,
+)
+from recommender_universal.models.retrieval import IVFIndex
+from recommender_universal.utils.topk import top_k_indices
+
+
+@pytest.fixture
+def item_factors():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(8, 6))
+    return (centers[rng.integers(0, 8, 500)] + 0.1 * rng.normal(size=(500, 6))).astype(
+        np.float32
+    )
+
+
+def test_ivf_full_probe_is_exact(item_factors):
+    index = IVFIndex(n_lists=8, nprobe=8, seed=0).build(item_factors)
+    queries = np.random.default_rng(1).normal(size=(20, 6)).astype(np.float32)
+
+    expected = top_k_indices(queries @ item_factors.T, 10)
+    np.testing.assert_array_equal(index.search(queries, 10), expected)
+
+
+@pytest.mark.parametrize("k", [0, -3])
+def test_ivf_non_positive_k_returns_empty_rows(item_factors, k):
+    index = IVFIndex(n_lists=8, seed=0).build(item_factors)
+    queries = np.ones((4, 6), dtype=np.float32)
+    result = index.search(queries, k)
+    assert result.shape == (4, 0)
+    assert result.shape == top_k_indices(queries @ item_factors.T, k).shape
+
+
+def test_ivf_partitions_every_item_once(item_factors):
+    index = IVFIndex(n_lists=16, seed=0).build(item_factors)
+    assert index.list_offsets[-1] == len(item_factors)
+    assert sorted(index.list_items.tolist()) == list(range(len(item_factors)))
+    np.testing.assert_array_equal(index.list_vectors, item_factors[index.list_items])
+
+
+def test_ivf_pads_short_results():
+    index = IVFIndex(n_lists=2, nprobe=1, seed=0).build(
+        np.array([[1.0, 0.0], [0.9, 0.1], [-1.0, 0.0]], dtype=np.float32)
+    )
+    result = index.search(np.array([[-1.0, 0.0]]), 3)
+    assert result[0, 0] == 2
+    assert (result[0, 1:] == -1).all()
+
+
+def test_model_recommend_with_index(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 30, 500),
+            "item_id": rng.integers(0, 80, 500),
+            "rating": rng.integers(1, 6, 500).astype(float),
+        }
+    )
+    model = MatrixFactorization(factors=4, epochs=2, shuffle_seed=0).fit(df)
+    exact = model.recommend(3, k=5)
+
+    model.build_index(IVFIndex(n_lists=4, nprobe=4, seed=0))
+    assert model.recommend(3, k=5) == exact
+    assert model.recommend_batch([3], k=5) == [exact]
+
+    model.index.nprobe = 1
+    assert model.recommend(3, k=5, exact=True) == exact
+    assert len(model.recommend(3, k=5)) <= 5
+
+    model.save(str(tmp_path), model_name="mf")
+    loaded = MatrixFactorization.load(str(tmp_path), model_name="mf")
+    assert isinstance(loaded.index, IVFIndex)
+    assert loaded.recommend(3, k=5) == model.recommend(3, k=5)
+
+
+def test_build_index_requires_fit():
+    with pytest.raises(RuntimeError):
+        MatrixFactorization().build_index()
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from recommender_universal.models.advanced.als import AlternatingLeastSquares
+from recommender_universal.models.advanced.matrix_factorization import (
+    MatrixFactorization,
+)
+from recommender_universal.models.base import BaseRecommender
+from recommender_universal.models.baseline.top_popular import TopPopularRecommender
+
+df = pd.DataFrame(
+    {
+        "user_id": [1, 1, 2, 2, 3],
+        "item_id": [10, 20, 10, 30, 20],
+        "rating": [5.0, 3.0, 4.0, 2.0, 1.0],
+    }
+)
+
+
+@pytest.mark.parametrize("model_cls", [MatrixFactorization, AlternatingLeastSquares])
+def test_factor_model_score(model_cls):
+    model = model_cls(factors=2).fit(df)
+    scores = model.score(1, [30, 99, 10])
+    user = model.user_factors[model.user_map[1]]
+    expected = model.item_factors[[model.item_map[30], model.item_map[10]]] @ user
+    np.testing.assert_allclose(scores[[0, 2]], expected)
+    assert scores[1] == -np.inf
+    assert np.all(model.score("unknown", [10, 20]) == -np.inf)
+
+
+def test_top_popular_score():
+    model = TopPopularRecommender().fit(df)
+    np.testing.assert_array_equal(model.score(1, [20, 30, 99]), [2.0, 1.0, -np.inf])
+
+
+def test_base_score_not_implemented():
+    class Minimal(BaseRecommender):
+        def fit(self, df):
+            return self
+
+        def recommend(self, user_id, k=5):
+            return []
+
+    with pytest.raises(NotImplementedError):
+        Minimal().score(1, [1])
@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+import pytest
 from recommender_universal.models.baseline.top_popular import TopPopularRecommender
 
 
@@ -17,3 +19,169 @@ def test_top_popular():
         10,
         20,
     ], "TopPopularRecommender did not return expected recommendations"
+
+
+def test_top_popular_ties_keep_first_seen_order():
+    df = pd.DataFrame({"item_id": ["b", "a", "c", "a", "b", "d"]})
+    model = TopPopularRecommender().fit(df)
+    assert model.top_items == ["b", "a", "c", "d"]
+
+
+def test_top_popular_time_decay():
+    df = pd.DataFrame(
+        {
+            "item_id": [1, 1, 1, 2, 2],
+            "ts": pd.to_datetime(
+                [
+                    "2025-01-01",
+                    "2025-01-01",
+                    "2025-01-01",
+                    "2025-01-10",
+                    "2025-01-10",
+                ]
+            ),
+        }
+    )
+    # Without decay item 1 wins on raw counts
+    assert TopPopularRecommender().fit(df).top_items == [1, 2]
+
+    model = TopPopularRecommender(time_column="ts", half_life="1D").fit(df)
+    assert model.top_items == [2, 1]
+    scores = dict(zip(model.item_ids.tolist(), model.item_scores))
+    assert scores[2] == pytest.approx(2.0)
+    assert scores[1] == pytest.approx(3 / 2**9)
+
+
+def test_top_popular_numeric_half_life():
+    df = pd.DataFrame({"item_id": [1, 1, 2], "t": [0.0, 0.0, 10.0]})
+    model = TopPopularRecommender(time_column="t", half_life=1.0).fit(df)
+    assert model.recommend(user_id=0, k=1) == [2]
+
+
+def test_top_popular_segments():
+    df = pd.DataFrame(
+        {
+            "item_id": [1, 1, 2, 2, 2, 3, 3],
+            "country": ["US", "US", "UK", "UK", "UK", "US", "UK"],
+        }
+    )
+    model = TopPopularRecommender(segment_column="country").fit(df)
+
+    assert model.recommend(user_id=0, k=3) == [2, 1, 3]
+    assert model.recommend(user_id=0, k=3, segment="US") == [1, 3]
+    assert model.recommend(user_id=0, k=1, segment="UK") == [2]
+    # Unknown segment falls back to the global ranking
+    assert model.recommend(user_id=0, k=2, segment="FR") == [2, 1]
+    assert model.recommend_batch([1, 2], k=1, segment="US") == [[1], [1]]
+
+
+def test_half_life_requires_time_column():
+    with pytest.raises(ValueError):
+        TopPopularRecommender(half_life="1h")
+
+
+def _chunks(n_chunks=6, size=200, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2025-01-01")
+    return [
+        pd.DataFrame(
+            {
+                "item_id": rng.zipf(1.5, size) % 50 + 100 * (c % 2),
+                "ts": start + pd.to_timedelta(rng.uniform(c, c + 1, size), unit="h"),
+            }
+        )
+        for c in range(n_chunks)
+    ]
+
+
+@pytest.mark.parametrize("top_n", [None, 5])
+def test_partial_fit_matches_full_fit(top_n):
+    chunks = _chunks()
+    incremental = TopPopularRecommender(top_n=top_n).fit(chunks[0])
+    for chunk in chunks[1:]:
+        incremental.partial_fit(chunk)
+
+    full = TopPopularRecommender(top_n=top_n).fit(pd.concat(chunks))
+    assert incremental.top_items == full.top_items
+    assert incremental.recommend(user_id=1, k=5) == full.recommend(user_id=1, k=5)
+
+
+def test_default_ranks_every_item():
+    df = pd.DataFrame({"item_id": np.arange(3000)})
+    model = TopPopularRecommender().fit(df)
+    assert len(model.recommend(user_id=1, k=2000)) == 2000
+    model.partial_fit(pd.DataFrame({"item_id": [3000]}))
+    assert len(model.top_items) == 3001
+
+
+def test_partial_fit_from_scratch():
+    model = TopPopularRecommender()
+    model.partial_fit(pd.DataFrame({"item_id": ["a", "b", "b"]}))
+    model.partial_fit(pd.DataFrame({"item_id": ["c", "c", "c", "a"]}))
+    assert model.top_items == ["c", "a", "b"]
+
+
+def test_partial_fit_with_time_decay_matches_full_fit():
+    chunks = _chunks()
+    incremental = TopPopularRecommender(time_column="ts", half_life="2h", top_n=10)
+    incremental.fit(chunks[0])
+    for chunk in chunks[1:]:
+        incremental.partial_fit(chunk)
+
+    full = TopPopularRecommender(time_column="ts", half_life="2h", top_n=10)
+    full.fit(pd.concat(chunks))
+    assert incremental.top_items == full.top_items
+
+
+def test_sliding_window_drops_expired_batches():
+    chunks = _chunks()
+    model = TopPopularRecommender(top_n=8, window=2).fit(chunks[0])
+    for chunk in chunks[1:]:
+        model.partial_fit(chunk)
+
+    recent = TopPopularRecommender(top_n=8).fit(pd.concat(chunks[-2:]))
+    assert model.top_items == recent.top_items
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sliding_window_bounded_rank_matches_full_rank(seed):
+    # Many ties and alternating item sets, so leaders often drop out
+    chunks = _chunks(n_chunks=12, size=60, seed=seed)
+    bounded = TopPopularRecommender(top_n=4, window=3).fit(chunks[0])
+    full = TopPopularRecommender(top_n=None, window=3).fit(chunks[0])
+    for chunk in chunks[1:]:
+        bounded.partial_fit(chunk)
+        full.partial_fit(chunk)
+        assert bounded.top_items == full.top_items[:4]
+
+
+def test_expiry_promotes_item_left_out_earlier():
+    model = TopPopularRecommender(top_n=2, window=2)
+    model.fit(pd.DataFrame({"item_id": ["a"] * 3}))
+    model.partial_fit(pd.DataFrame({"item_id": ["b", "b", "x"]}))
+    assert model.top_items == ["a", "b"]
+
+    # "a" expires; "x" was left out earlier and ties "y" but was seen first
+    model.partial_fit(pd.DataFrame({"item_id": ["y"]}))
+    assert model.top_items == ["b", "x"]
+
+
+def test_partial_fit_ranks_only_leaders_without_expiry(monkeypatch):
+    chunks = _chunks()
+    model = TopPopularRecommender(top_n=5).fit(chunks[0])
+    ranked = []
+    original = TopPopularRecommender._rank
+
+    def spy(self, candidates):
+        ranked.append(len(candidates))
+        return original(self, candidates)
+
+    monkeypatch.setattr(TopPopularRecommender, "_rank", spy)
+    model.partial_fit(pd.DataFrame({"item_id": [1, 2, 2]}))
+    assert ranked and max(ranked) <= 5 + 2
+
+
+def test_partial_fit_rejects_segments():
+    model = TopPopularRecommender(segment_column="country")
+    with pytest.raises(NotImplementedError):
+        model.partial_fit(pd.DataFrame({"item_id": [1], "country": ["US"]}))